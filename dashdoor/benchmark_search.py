@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark vectorized dish search (MenuColumns) against a pure-Python scan.
+
+Builds a synthetic catalog (1M menu items by default) from the cuisine templates in
+constants.py, checks that both implementations return identical ranked results,
+and prints the median latency of each for a few representative scout queries.
+
+Usage (from the dashdoor directory):
+    python benchmark_search.py [--items 1000000] [--items-per-restaurant 20] [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from columns import MenuColumns
+from constants import CUISINES
+
+ADDITIONAL_TAGS = ["Fast Delivery", "Late Night", "Outdoor Seating", "Free Delivery",
+                   "Locally Sourced", "Award Winning", "Chef's Specials", "Catering Available"]
+
+QUERIES: Dict[str, Dict[str, Any]] = {
+    "budget + calories": {"max_price": 15, "min_calories": 300, "max_calories": 700},
+    "vegan, nut-free, rated": {"required_dietary_tags": ["Vegan"], "excluded_dietary_tags": ["Contains-Nuts"],
+                               "min_rating": 4.5},
+    "cuisine + tag + delivery": {"cuisine": "Thai", "tags": ["Late Night"], "max_delivery_time": 30},
+    "fitness (high protein)": {"required_dietary_tags": ["High-Protein"], "max_calories": 600, "max_price": 20,
+                               "excluded_dietary_tags": ["Contains-Fish"]},
+}
+
+
+def generate_catalog(n_items: int, items_per_restaurant: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    cuisines = list(CUISINES)
+    restaurants: List[Dict[str, Any]] = []
+    for r_index in range((n_items + items_per_restaurant - 1) // items_per_restaurant):
+        cuisine = rng.choice(cuisines)
+        template = CUISINES[cuisine]
+        restaurant_id = f"r_{r_index:06d}"
+        n_menu = min(items_per_restaurant, n_items - r_index * items_per_restaurant)
+        menu = []
+        for m_index in range(n_menu):
+            name, _, dietary_tags = rng.choice(template["dishes"])
+            menu.append({
+                "id": f"{restaurant_id}_m_{m_index:03d}",
+                "name": name,
+                "price": round(rng.uniform(5, 40), 2),
+                "calories": rng.randint(150, 1400),
+                "dietary_tags": list(dietary_tags),
+            })
+        restaurants.append({
+            "id": restaurant_id,
+            "name": f"{cuisine} Place {r_index}",
+            "cuisine": cuisine,
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "delivery_time_min": rng.choice([15, 20, 25, 30, 35, 40, 45, 50, 60]),
+            "tags": rng.sample(template["tags"], k=2) + rng.sample(ADDITIONAL_TAGS, k=2),
+            "menu": menu,
+        })
+    return restaurants
+
+
+def search_python(restaurants: List[Dict[str, Any]], cuisine=None, tags=(), required_dietary_tags=(),
+                  excluded_dietary_tags=(), min_rating=None, max_price=None, min_calories=None,
+                  max_calories=None, max_delivery_time=None) -> List[str]:
+    """Straightforward per-item scan with the same semantics and ranking as MenuColumns.search."""
+    excluded = set(excluded_dietary_tags)
+    matches = []
+    position = 0
+    for r in restaurants:
+        restaurant_ok = (
+            (not cuisine or r["cuisine"].lower() == cuisine.lower())
+            and all(tag in r["tags"] for tag in tags)
+            and (min_rating is None or r["rating"] >= min_rating)
+            and (max_delivery_time is None or r["delivery_time_min"] <= max_delivery_time)
+        )
+        for item in r["menu"]:
+            if (restaurant_ok
+                    and all(tag in item["dietary_tags"] for tag in required_dietary_tags)
+                    and excluded.isdisjoint(item["dietary_tags"])
+                    and (max_price is None or item["price"] <= max_price)
+                    and (min_calories is None or item["calories"] >= min_calories)
+                    and (max_calories is None or item["calories"] <= max_calories)):
+                matches.append((-r["rating"], r["delivery_time_min"], item["price"], position, item["id"]))
+            position += 1
+    matches.sort()
+    return [m[-1] for m in matches]
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--items-per-restaurant", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    restaurants = generate_catalog(args.items, args.items_per_restaurant)
+    menu_items = [item for r in restaurants for item in r["menu"]]
+    item_restaurants = [p for p, r in enumerate(restaurants) for _ in r["menu"]]
+    print(f"Generated {len(restaurants):,} restaurants / {len(menu_items):,} menu items "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    columns = MenuColumns(restaurants, menu_items, item_restaurants)
+    print(f"Built NumPy columns in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<28}{'matches':>10}{'python ms':>12}{'numpy ms':>11}{'speedup':>10}")
+    for label, query in QUERIES.items():
+        expected = search_python(restaurants, **query)
+        actual = [menu_items[i]["id"] for i in columns.search(**query)]
+        assert actual == expected, f"Result mismatch for query '{label}'"
+
+        python_ms = median_ms(lambda: search_python(restaurants, **query), args.repeat)
+        numpy_ms = median_ms(lambda: columns.search(**query), args.repeat)
+        print(f"{label:<28}{len(expected):>10,}{python_ms:>12.1f}{numpy_ms:>11.1f}{python_ms / numpy_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
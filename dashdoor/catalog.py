@@ -0,0 +1,166 @@
+import hashlib
+import json
+import time
+from collections import Counter
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from columns import MenuColumns
+from encoding import EncodedResponseCache, dumps
+
+
+class Catalog:
+    """
+    Immutable, indexed view over the restaurant list.
+
+    Everything is built once at load time so each lookup costs time proportional
+    to the size of its result rather than to the size of the catalog:
+    - restaurants by id
+    - restaurant positions by lowercase cuisine and by tag
+    - flattened menu items (with restaurant_id / restaurant_name), per restaurant
+      and by dietary tag
+    - facet lists (cuisines, tags, dietary tags) with counts, pre-serialized to
+      response bytes
+    - NumPy columns of prices, calories, ratings and tag bitmaps for dish search
+
+    Index values are positions in catalog order, so filtered results come back in
+    the same order as a full scan of restaurants.json would return them.
+
+    `version` is a content hash used as the HTTP validator (ETag) for every
+    catalog response; it changes only when the underlying data changes.
+    """
+
+    def __init__(self, restaurants: List[Dict[str, Any]], version: Optional[str] = None,
+                 modified_at: Optional[float] = None):
+        self.restaurants: List[Dict[str, Any]] = restaurants
+        if version is None:
+            version = _content_hash(json.dumps(restaurants, sort_keys=True).encode("utf-8"))
+        self.version = version
+        self.etag = f'W/"{version}"'
+        self.last_modified = formatdate(modified_at if modified_at is not None else time.time(), usegmt=True)
+        self.restaurants_by_id: Dict[str, Dict[str, Any]] = {}
+        self.restaurant_positions_by_cuisine: Dict[str, List[int]] = {}
+        self.restaurant_positions_by_tag: Dict[str, List[int]] = {}
+
+        self.menu_items: List[Dict[str, Any]] = []
+        self.menu_items_by_restaurant: Dict[str, List[Dict[str, Any]]] = {}
+        self.menu_item_positions_by_dietary_tag: Dict[str, List[int]] = {}
+        # menu item position -> owning restaurant position
+        self.menu_item_restaurant_positions: List[int] = []
+
+        for position, r in enumerate(restaurants):
+            self.restaurants_by_id[r["id"]] = r
+
+            cuisine = r.get("cuisine")
+            if cuisine:
+                self.restaurant_positions_by_cuisine.setdefault(cuisine.lower(), []).append(position)
+
+            for tag in set(r.get("tags") or []):
+                self.restaurant_positions_by_tag.setdefault(tag, []).append(position)
+
+            restaurant_items: List[Dict[str, Any]] = []
+            for item in r.get("menu", []):
+                flat_item = {**item, "restaurant_id": r["id"], "restaurant_name": r["name"]}
+                item_position = len(self.menu_items)
+                self.menu_items.append(flat_item)
+                self.menu_item_restaurant_positions.append(position)
+                restaurant_items.append(flat_item)
+                for dietary_tag in set(item.get("dietary_tags") or []):
+                    self.menu_item_positions_by_dietary_tag.setdefault(dietary_tag, []).append(item_position)
+            self.menu_items_by_restaurant[r["id"]] = restaurant_items
+
+        self.columns = MenuColumns(restaurants, self.menu_items, self.menu_item_restaurant_positions)
+
+        # Facet bodies only change with the catalog, so they are encoded exactly once
+        self.facet_counts: Dict[str, Dict[str, int]] = {
+            "cuisines": dict(Counter(r["cuisine"] for r in restaurants if r.get("cuisine"))),
+            "tags": {tag: len(positions) for tag, positions in self.restaurant_positions_by_tag.items()},
+            "dietary_tags": {tag: len(positions) for tag, positions in self.menu_item_positions_by_dietary_tag.items()},
+        }
+        self.facets: Dict[str, bytes] = {
+            name: self._encode_facet(name, counts) for name, counts in self.facet_counts.items()
+        }
+        # Serialized/compressed response bodies for this catalog version; a reload starts empty
+        self.responses = EncodedResponseCache()
+
+    def __len__(self) -> int:
+        return len(self.restaurants)
+
+    @staticmethod
+    def _encode_facet(name: str, counts: Dict[str, int]) -> bytes:
+        """Serializes a facet as {name: [sorted values], "counts": {value: count}}."""
+        values = sorted(counts)
+        return dumps({name: values, "counts": {v: counts[v] for v in values}})
+
+    @staticmethod
+    def _union_positions(index: Dict[str, List[int]], keys: Iterable[str]) -> List[int]:
+        """Merges the position lists of every key, deduplicated and in catalog order."""
+        positions: set[int] = set()
+        for key in keys:
+            positions.update(index.get(key, ()))
+        return sorted(positions)
+
+    def get_restaurant(self, restaurant_id: str) -> Optional[Dict[str, Any]]:
+        return self.restaurants_by_id.get(restaurant_id)
+
+    def restaurants_by_cuisine(self, cuisine: str) -> List[Dict[str, Any]]:
+        positions = self.restaurant_positions_by_cuisine.get(cuisine.lower(), [])
+        return [self.restaurants[p] for p in positions]
+
+    def restaurants_by_tags(self, tags: Iterable[str]) -> List[Dict[str, Any]]:
+        """Restaurants carrying any of the given tags."""
+        positions = self._union_positions(self.restaurant_positions_by_tag, tags)
+        return [self.restaurants[p] for p in positions]
+
+    def menu_items_for_restaurant(self, restaurant_id: str) -> List[Dict[str, Any]]:
+        return self.menu_items_by_restaurant.get(restaurant_id, [])
+
+    def menu_items_by_dietary_tags(self, tags: Iterable[str]) -> List[Dict[str, Any]]:
+        """Menu items carrying any of the given dietary tags."""
+        positions = self._union_positions(self.menu_item_positions_by_dietary_tag, tags)
+        return [self.menu_items[p] for p in positions]
+
+    def search_dishes(self, cuisine: Optional[str] = None, tags: Iterable[str] = (),
+                      required_dietary_tags: Iterable[str] = (), excluded_dietary_tags: Iterable[str] = (),
+                      min_rating: Optional[float] = None, max_price: Optional[float] = None,
+                      min_calories: Optional[int] = None, max_calories: Optional[int] = None,
+                      max_delivery_time: Optional[int] = None,
+                      limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Finds dishes matching every given constraint and ranks them.
+
+        Restaurants must match the cuisine and carry ALL of `tags`; dishes must carry ALL of
+        `required_dietary_tags` and none of `excluded_dietary_tags`. Filters run as vectorized
+        masks over the NumPy columns built at load time (see `MenuColumns`).
+        Results are ranked by restaurant rating (desc), delivery time, then price, and
+        enriched with the restaurant's cuisine, rating and delivery_time_min.
+
+        Returns (top `limit` dishes, total number of matches).
+        """
+        ranked = self.columns.search(
+            cuisine=cuisine, tags=tags,
+            required_dietary_tags=required_dietary_tags, excluded_dietary_tags=excluded_dietary_tags,
+            min_rating=min_rating, max_price=max_price, min_calories=min_calories, max_calories=max_calories,
+            max_delivery_time=max_delivery_time)
+        top = ranked if limit is None else ranked[:limit]
+        return [self._dish_result(int(i)) for i in top], len(ranked)
+
+    def _dish_result(self, item_position: int) -> Dict[str, Any]:
+        r = self.restaurants[self.menu_item_restaurant_positions[item_position]]
+        return {
+            **self.menu_items[item_position],
+            "cuisine": r.get("cuisine"),
+            "rating": r.get("rating"),
+            "delivery_time_min": r.get("delivery_time_min"),
+        }
+
+
+def _content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def load_catalog(path: Path) -> Catalog:
+    """Reads restaurants.json and builds its Catalog, versioned by the file's content hash."""
+    raw = path.read_bytes()
+    return Catalog(json.loads(raw), version=_content_hash(raw), modified_at=path.stat().st_mtime)
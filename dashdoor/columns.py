@@ -0,0 +1,122 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+BITS_PER_WORD = 64
+
+
+class TagBitmap:
+    """
+    Fixed vocabulary of tags packed into uint64 words, one row per record.
+
+    `rows` has shape (n_records, n_words); bit `k` of a row is set when the record
+    carries vocabulary tag `k`. Membership tests become a handful of vectorized
+    AND/compare ops regardless of how many tags a query names.
+    """
+
+    def __init__(self, tag_sets: Sequence[Iterable[str]]):
+        vocabulary = sorted({tag for tags in tag_sets for tag in tags})
+        self.bit_by_tag: Dict[str, int] = {tag: bit for bit, tag in enumerate(vocabulary)}
+        self.n_words = max(1, -(-len(vocabulary) // BITS_PER_WORD))
+        self.rows = np.zeros((len(tag_sets), self.n_words), dtype=np.uint64)
+        for row, tags in enumerate(tag_sets):
+            for tag in tags:
+                bit = self.bit_by_tag[tag]
+                self.rows[row, bit // BITS_PER_WORD] |= np.uint64(1 << (bit % BITS_PER_WORD))
+
+    def query_mask(self, tags: Iterable[str]) -> Optional[np.ndarray]:
+        """Packs query tags into one row of words; None if a tag is not in the vocabulary."""
+        mask = np.zeros(self.n_words, dtype=np.uint64)
+        for tag in tags:
+            bit = self.bit_by_tag.get(tag)
+            if bit is None:
+                return None
+            mask[bit // BITS_PER_WORD] |= np.uint64(1 << (bit % BITS_PER_WORD))
+        return mask
+
+    def has_all(self, tags: Iterable[str]) -> np.ndarray:
+        """Boolean array: record carries every one of `tags`."""
+        mask = self.query_mask(tags)
+        if mask is None:
+            return np.zeros(len(self.rows), dtype=bool)
+        return np.all((self.rows & mask) == mask, axis=1)
+
+    def has_none(self, tags: Iterable[str]) -> np.ndarray:
+        """Boolean array: record carries none of `tags` (unknown tags match nothing)."""
+        mask = self.query_mask(t for t in tags if t in self.bit_by_tag)
+        return np.all((self.rows & mask) == 0, axis=1)
+
+
+class MenuColumns:
+    """
+    Column-oriented copy of the numeric and tag attributes used for dish search.
+
+    Restaurant-level attributes (cuisine, tags, rating, delivery time) are kept per
+    restaurant and broadcast to menu items through `item_restaurant`, so restaurant
+    predicates cost O(restaurants) and item predicates O(items), all vectorized.
+    Missing prices/calories are NaN and never satisfy a range filter.
+    """
+
+    def __init__(self, restaurants: List[Dict[str, Any]], menu_items: List[Dict[str, Any]],
+                 item_restaurant_positions: List[int]):
+        cuisines = sorted({(r.get("cuisine") or "").lower() for r in restaurants})
+        self.cuisine_codes: Dict[str, int] = {c: code for code, c in enumerate(cuisines)}
+        self.restaurant_cuisine = np.array(
+            [self.cuisine_codes[(r.get("cuisine") or "").lower()] for r in restaurants], dtype=np.int32)
+        self.restaurant_rating = np.array([r.get("rating", 0) for r in restaurants], dtype=np.float64)
+        self.restaurant_delivery = np.array([r.get("delivery_time_min", 0) for r in restaurants], dtype=np.float64)
+        self.restaurant_tags = TagBitmap([r.get("tags") or [] for r in restaurants])
+
+        self.item_restaurant = np.array(item_restaurant_positions, dtype=np.int64)
+        self.item_price = np.array(
+            [np.nan if item.get("price") is None else item["price"] for item in menu_items], dtype=np.float64)
+        self.item_calories = np.array(
+            [np.nan if item.get("calories") is None else item["calories"] for item in menu_items], dtype=np.float64)
+        self.item_dietary_tags = TagBitmap([item.get("dietary_tags") or [] for item in menu_items])
+
+    def __len__(self) -> int:
+        return len(self.item_restaurant)
+
+    def search(self, cuisine: Optional[str] = None, tags: Iterable[str] = (),
+               required_dietary_tags: Iterable[str] = (), excluded_dietary_tags: Iterable[str] = (),
+               min_rating: Optional[float] = None, max_price: Optional[float] = None,
+               min_calories: Optional[int] = None, max_calories: Optional[int] = None,
+               max_delivery_time: Optional[int] = None) -> np.ndarray:
+        """
+        Returns positions of all matching menu items, ranked by restaurant rating (desc),
+        delivery time, price, then catalog position.
+        """
+        restaurant_ok = np.ones(len(self.restaurant_rating), dtype=bool)
+        if cuisine:
+            code = self.cuisine_codes.get(cuisine.lower())
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            restaurant_ok &= self.restaurant_cuisine == code
+        tags = list(tags)
+        if tags:
+            restaurant_ok &= self.restaurant_tags.has_all(tags)
+        if min_rating is not None:
+            restaurant_ok &= self.restaurant_rating >= min_rating
+        if max_delivery_time is not None:
+            restaurant_ok &= self.restaurant_delivery <= max_delivery_time
+
+        item_ok = restaurant_ok[self.item_restaurant]
+        required = list(required_dietary_tags)
+        if required:
+            item_ok &= self.item_dietary_tags.has_all(required)
+        excluded = list(excluded_dietary_tags)
+        if excluded:
+            item_ok &= self.item_dietary_tags.has_none(excluded)
+        if max_price is not None:
+            item_ok &= self.item_price <= max_price
+        if min_calories is not None:
+            item_ok &= self.item_calories >= min_calories
+        if max_calories is not None:
+            item_ok &= self.item_calories <= max_calories
+
+        positions = np.flatnonzero(item_ok)
+        owners = self.item_restaurant[positions]
+        # lexsort: last key is primary; NaN prices sort last
+        order = np.lexsort((positions, self.item_price[positions],
+                            self.restaurant_delivery[owners], -self.restaurant_rating[owners]))
+        return positions[order]
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional compressor
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Upper bound on encoded response bytes kept per catalog version (all variants combined)
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("DASHDOOR_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def dumps(payload: Any) -> bytes:
+    """Serializes a payload to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Picks the best supported content-coding from an Accept-Encoding header (br > gzip)."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class EncodedResponseCache:
+    """
+    Per-catalog-version cache of serialized (and compressed) response bodies.
+
+    Entries are keyed by request path + query and hold one bytes object per
+    content-coding, filled in lazily on first request. A catalog reload creates a
+    new cache, so bodies are never served for a stale catalog. LRU-bounded by bytes.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_body(self, key: str, coding: str, build: Callable[[], bytes]) -> bytes:
+        """Returns the body for `key` in `coding` ("identity", "gzip" or "br"), encoding it at most once."""
+        with self._lock:
+            variants = self._entries.get(key)
+            if variants is not None:
+                self._entries.move_to_end(key)
+                if coding in variants:
+                    self.hits += 1
+                    return variants[coding]
+            self.misses += 1
+
+        identity = variants.get("identity") if variants else None
+        if identity is None:
+            identity = build()
+        body = identity if coding == "identity" else compress(identity, coding)
+
+        with self._lock:
+            variants = self._entries.setdefault(key, {})
+            for name, data in (("identity", identity), (coding, body)):
+                if name not in variants:
+                    variants[name] = data
+                    self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sum(len(data) for data in evicted.values())
+        return body
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+def cache_key(request: Request) -> str:
+    return f"{request.url.path}?{'&'.join(sorted(request.url.query.split('&')))}"
+
+
+def encoded_json_response(request: Request, cache: EncodedResponseCache,
+                          payload: Callable[[], Any], vary: Tuple[str, ...] = ()) -> Response:
+    """
+    Serves a JSON payload from the encoded-response cache, compressed when the client
+    accepts it. `payload` is only called (and serialized) on a cache miss.
+    """
+    return encoded_bytes_response(request, cache, lambda: dumps(payload()), vary)
+
+
+def encoded_bytes_response(request: Request, cache: EncodedResponseCache,
+                           body: Callable[[], bytes], vary: Tuple[str, ...] = ()) -> Response:
+    """Like `encoded_json_response`, for bodies that are already serialized JSON bytes."""
+    key = cache_key(request)
+    identity = cache.get_body(key, "identity", body)
+    coding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    headers = {"Vary": ", ".join(vary + ("Accept-Encoding",))}
+    if coding is None or len(identity) < MIN_COMPRESS_BYTES:
+        return Response(content=identity, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = coding
+    return Response(content=cache.get_body(key, coding, lambda: identity), media_type="application/json",
+                    headers=headers)
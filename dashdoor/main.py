@@ -1,172 +1,459 @@
-import json
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import asyncio
+import os
+import time
+from itertools import islice
 from pathlib import Path
+from pydantic import BaseModel, Field
 from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
 
 # Import shared logger
 from utils.logger import ServiceLogger
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, gauge, histogram, render_prometheus, timed
+
+from catalog import Catalog, load_catalog
+from encoding import dumps, encoded_bytes_response, encoded_json_response
+from projection import FieldSpec, parse_fields, project, project_page
+from watcher import CatalogWatcher
 
 DATA_PATH = Path(__file__).parent / "data/restaurants.json"
-RESTAURANTS: List[Dict[str, Any]] = []
+# Indexed catalog; replaced as a whole on load, so handlers take a local reference first
+CATALOG: Catalog = Catalog([])
+
+# Reload the catalog automatically when restaurants.json changes (needs watchdog)
+WATCH_CATALOG = os.environ.get("DASHDOOR_WATCH_CATALOG", "false").lower() == "true"
+# Shared secret for POST /admin/reload; the endpoint is open when unset
+ADMIN_TOKEN = os.environ.get("DASHDOOR_ADMIN_TOKEN")
+
+# Serializes rebuilds so a burst of reload triggers never builds two catalogs at once
+_reload_lock = asyncio.Lock()
+
+HTTP_REQUEST_SECONDS = histogram("dashdoor_http_request_duration_seconds",
+                                 "DashDoor handler latency until response headers are sent",
+                                 ["method", "route", "status"])
+SEARCH_SECONDS = histogram("dashdoor_search_duration_seconds", "Vectorized dish search time (index work only)")
+CATALOG_BUILD_SECONDS = histogram("dashdoor_catalog_build_duration_seconds",
+                                  "Time to load restaurants.json and build the catalog indexes")
+gauge("dashdoor_catalog_restaurants", "Restaurants in the current catalog", callback=lambda: len(CATALOG))
+gauge("dashdoor_catalog_menu_items", "Menu items in the current catalog", callback=lambda: len(CATALOG.menu_items))
+gauge("dashdoor_response_cache_bytes", "Encoded response bytes cached for the current catalog",
+      callback=lambda: CATALOG.responses.stats()["bytes"])
+
+
+async def reload_catalog(reason: str) -> Dict[str, Any]:
+    """
+    Rebuilds the catalog from DATA_PATH in a worker thread and swaps it in by reference.
+
+    Requests keep using the old catalog (and its response cache) until the new one is
+    fully indexed; a file that fails to load leaves the current catalog in place.
+    """
+    global CATALOG
+    async with _reload_lock:
+        previous = CATALOG
+        try:
+            catalog = await asyncio.to_thread(timed(CATALOG_BUILD_SECONDS)(load_catalog), DATA_PATH)
+        except Exception as e:
+            ServiceLogger.log_error(f"Catalog reload ({reason}) failed, keeping version {previous.version}: {e}", "RELOAD")
+            raise
+        if catalog.version == previous.version:
+            ServiceLogger.log_info(f"Catalog reload ({reason}): version {catalog.version} unchanged", "RELOAD")
+            return {"reloaded": False, "version": catalog.version}
+        CATALOG = catalog
+        ServiceLogger.log_success(
+            f"Catalog reloaded ({reason}): {len(catalog)} restaurants ({len(catalog.menu_items)} menu items), "
+            f"version {previous.version} -> {catalog.version}", "RELOAD")
+        return {"reloaded": True, "version": catalog.version, "previous_version": previous.version,
+                "restaurant_count": len(catalog), "menu_item_count": len(catalog.menu_items)}
+
+
+async def _reload_from_watcher(reason: str) -> None:
+    try:
+        await reload_catalog(reason)
+    except Exception:
+        # already logged; the watcher keeps running with the current catalog
+        pass
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global RESTAURANTS
+    global CATALOG
     if DATA_PATH.exists():
-        with open(DATA_PATH, "r") as f:
-            data = json.load(f)
-            RESTAURANTS.clear()
-            RESTAURANTS.extend(data)
+        with timed(CATALOG_BUILD_SECONDS):
+            CATALOG = load_catalog(DATA_PATH)
         ServiceLogger.log_success(
-            f"DashDoor loaded {len(RESTAURANTS)} restaurants", "STARTUP")
+            f"DashDoor loaded {len(CATALOG)} restaurants ({len(CATALOG.menu_items)} menu items), version {CATALOG.version}", "STARTUP")
     else:
         ServiceLogger.log_warning(
             "No data found in restaurants.json", "STARTUP")
 
+    watcher: Optional[CatalogWatcher] = None
+    if WATCH_CATALOG:
+        try:
+            watcher = CatalogWatcher(DATA_PATH, _reload_from_watcher, asyncio.get_running_loop())
+            watcher.start()
+        except ImportError:
+            watcher = None
+            ServiceLogger.log_warning(
+                "DASHDOOR_WATCH_CATALOG is set but the 'watchdog' package is not installed", "STARTUP")
+
     ServiceLogger.startup_message("DashDoor API", port=8001)
     yield
+    if watcher is not None:
+        watcher.stop()
     ServiceLogger.shutdown_message("DashDoor API")
 
 app = FastAPI(title="DashDoor API 🍔", lifespan=lifespan)
 
+# Shared query params for record-returning endpoints
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return; dotted paths select nested fields (e.g. menu.price)")
+LIMIT_QUERY = Query(None, ge=1, description="Maximum number of records to return")
+# Upper bound on ids per batch lookup
+BATCH_MAX_IDS = 100
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Records encoded per streamed chunk: large enough to amortize per-write overhead,
+# small enough that memory stays flat regardless of catalog size
+NDJSON_CHUNK_RECORDS = 256
+
+
+def _wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _ndjson_response(records: List[Dict[str, Any]], spec: Optional[FieldSpec], limit: Optional[int]) -> StreamingResponse:
+    """
+    Streams catalog records as NDJSON, one object per line, encoding (and projecting)
+    lazily chunk by chunk instead of materializing the whole response.
+    """
+    def generate():
+        selected = iter(records) if limit is None else islice(records, limit)
+        while True:
+            chunk = list(islice(selected, NDJSON_CHUNK_RECORDS))
+            if not chunk:
+                break
+            yield b"".join(dumps(project(record, spec)) + b"\n" for record in chunk)
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE, headers={"Vary": "Accept"})
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against the catalog ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+@app.middleware("http")
+async def catalog_validators(request: Request, call_next):
+    """
+    Catalog responses only change when the catalog does, so every successful /api/v1 GET
+    carries the catalog version as ETag / Last-Modified, and a matching If-None-Match turns
+    it into a 304. Errors (404, 422) are never masked; handlers serve bodies from the
+    encoded-response cache, so running them for a revalidation is cheap.
+    """
+    if request.method != "GET" or not request.url.path.startswith("/api/v1/"):
+        return await call_next(request)
+
+    catalog = CATALOG
+    validators = {"ETag": catalog.etag, "Last-Modified": catalog.last_modified}
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, catalog.etag):
+        # a 304 must carry the same Vary as the 200 it stands in for
+        if "vary" in response.headers:
+            validators["Vary"] = response.headers["vary"]
+        return Response(status_code=304, headers=validators)
+    response.headers.update(validators)
+    return response
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Times every request into HTTP_REQUEST_SECONDS. Registered last so it wraps catalog_validators
+    and records its 304s; requests that match no route are labelled "(unrouted)".
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                     route=route.path if route is not None else "(unrouted)", status=str(status))
+
 
 @app.get("/")
 def read_root() -> Dict[str, Any]:
     ServiceLogger.api_called_panel("GET", "/")
     ServiceLogger.health_check()
-    return {"status": "DashDoor is open for business!", "restaurant_count": len(RESTAURANTS)}
+    return {"status": "DashDoor is open for business!", "restaurant_count": len(CATALOG)}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """Prometheus metrics for DashDoor handlers, search and catalog builds"""
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.post("/admin/reload")
+async def reload(x_admin_token: Optional[str] = Header(None)) -> Dict[str, Any]:
+    """Reloads restaurants.json without a restart; in-flight requests finish on the old catalog"""
+    ServiceLogger.api_called_panel("POST", "/admin/reload")
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        ServiceLogger.log_error("Rejected catalog reload: bad admin token", "API")
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    try:
+        return await reload_catalog("admin request")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Catalog reload failed: {e}")
 
 
 @app.get("/api/v1/restaurants")
-def get_restaurants():
-    """Returns all restaurants (mocking a search feed)"""
-    ServiceLogger.api_called_panel("GET", "/api/v1/restaurants")
-    ServiceLogger.log_info(f"Returning {len(RESTAURANTS)} restaurants", "API")
-    return RESTAURANTS
+def get_restaurants(request: Request, fields: Optional[str] = FIELDS_QUERY,
+                    limit: Optional[int] = LIMIT_QUERY) -> Response:
+    """Returns all restaurants (mocking a search feed); streams NDJSON when Accept asks for it"""
+    ServiceLogger.api_called_panel("GET", "/api/v1/restaurants",
+                                   params={"fields": fields, "limit": limit} if fields or limit else None)
+    catalog = CATALOG
+    if _wants_ndjson(request):
+        ServiceLogger.log_info(f"Streaming up to {len(catalog.restaurants)} restaurants as NDJSON", "API")
+        return _ndjson_response(catalog.restaurants, parse_fields(fields), limit)
+    spec = parse_fields(fields)
+
+    def build() -> List[Dict[str, Any]]:
+        restaurants = project_page(catalog.restaurants, spec, limit)
+        ServiceLogger.log_info(f"Encoding {len(restaurants)} restaurants", "API")
+        return restaurants
+
+    return encoded_json_response(request, catalog.responses, build, vary=("Accept",))
 
 
 @app.get("/api/v1/cuisines")
-def get_cuisines() -> Dict[str, List[str]]:
-    """Returns list of unique cuisines available"""
+def get_cuisines(request: Request) -> Response:
+    """Returns list of unique cuisines available, with restaurant counts"""
     ServiceLogger.api_called_panel("GET", "/api/v1/cuisines")
-    cuisines: set[str] = set()
-    for r in RESTAURANTS:
-        if "cuisine" in r and r["cuisine"]:
-            cuisines.add(r["cuisine"])
-    result = sorted(list(cuisines))
-    ServiceLogger.log_info(f"Found {len(result)} unique cuisines", "API")
-    return {"cuisines": result}
+    catalog = CATALOG
+    ServiceLogger.log_info(f"Found {len(catalog.facet_counts['cuisines'])} unique cuisines", "API")
+    return encoded_bytes_response(request, catalog.responses, lambda: catalog.facets["cuisines"])
 
 
 @app.get("/api/v1/restaurants/by-cuisine")
-def get_restaurants_by_cuisine(cuisine: str) -> Dict[str, Any]:
+def get_restaurants_by_cuisine(request: Request, cuisine: str, fields: Optional[str] = FIELDS_QUERY,
+                               limit: Optional[int] = LIMIT_QUERY) -> Response:
     """Returns restaurants filtered by cuisine type"""
     ServiceLogger.api_called_panel("GET", "/api/v1/restaurants/by-cuisine",
-                                   params={"cuisine": cuisine})
-    filtered: List[Dict[str, Any]] = [r for r in RESTAURANTS if r.get(
-        "cuisine", "").lower() == cuisine.lower()]
-    ServiceLogger.log_info(
-        f"Found {len(filtered)} restaurants for cuisine: {cuisine}", "API")
-    return {"cuisine": cuisine, "count": len(filtered), "restaurants": filtered}
+                                   params={"cuisine": cuisine, "fields": fields, "limit": limit})
+    catalog = CATALOG
+    spec = parse_fields(fields)
+
+    def build() -> Dict[str, Any]:
+        filtered: List[Dict[str, Any]] = catalog.restaurants_by_cuisine(cuisine)
+        restaurants = project_page(filtered, spec, limit)
+        ServiceLogger.log_info(
+            f"Found {len(filtered)} restaurants for cuisine: {cuisine}", "API")
+        return {"cuisine": cuisine, "count": len(restaurants), "total": len(filtered), "restaurants": restaurants}
+
+    return encoded_json_response(request, catalog.responses, build)
 
 @app.get("/api/v1/tags")
-def get_tags() -> Dict[str, List[str]]:
-    """Returns list of unique restaurant tags"""
+def get_tags(request: Request) -> Response:
+    """Returns list of unique restaurant tags, with restaurant counts"""
     ServiceLogger.api_called_panel("GET", "/api/v1/tags")
-    tags: set[str] = set()
-    for r in RESTAURANTS:
-        if "tags" in r and r["tags"]:
-            tags.update(r["tags"])
-    result = sorted(list(tags))
-    ServiceLogger.log_info(f"Found {len(result)} unique tags", "API")
-    return {"tags": result}
+    catalog = CATALOG
+    ServiceLogger.log_info(f"Found {len(catalog.facet_counts['tags'])} unique tags", "API")
+    return encoded_bytes_response(request, catalog.responses, lambda: catalog.facets["tags"])
 
 
 @app.get("/api/v1/restaurants/by-tags")
-def get_restaurants_by_tags(tags: str) -> Dict[str, Any]:
+def get_restaurants_by_tags(request: Request, tags: str, fields: Optional[str] = FIELDS_QUERY,
+                            limit: Optional[int] = LIMIT_QUERY) -> Response:
     """Returns restaurants filtered by tags (comma-separated)"""
     tag_list = [t.strip() for t in tags.split(",")]
     ServiceLogger.api_called_panel("GET", "/api/v1/restaurants/by-tags",
-                                   params={"tags": tags})
-    filtered: List[Dict[str, Any]] = []
-    for r in RESTAURANTS:
-        restaurant_tags = r.get("tags", [])
-        if any(tag in restaurant_tags for tag in tag_list):
-            filtered.append(r)
-    ServiceLogger.log_info(
-        f"Found {len(filtered)} restaurants matching tags: {tag_list}", "API")
-    return {"tags": tag_list, "count": len(filtered), "restaurants": filtered}
+                                   params={"tags": tags, "fields": fields, "limit": limit})
+    catalog = CATALOG
+    spec = parse_fields(fields)
+
+    def build() -> Dict[str, Any]:
+        filtered: List[Dict[str, Any]] = catalog.restaurants_by_tags(tag_list)
+        restaurants = project_page(filtered, spec, limit)
+        ServiceLogger.log_info(
+            f"Found {len(filtered)} restaurants matching tags: {tag_list}", "API")
+        return {"tags": tag_list, "count": len(restaurants), "total": len(filtered), "restaurants": restaurants}
+
+    return encoded_json_response(request, catalog.responses, build)
 
 
 @app.get("/api/v1/restaurants/{restaurant_id}")
-def get_restaurant_detail(restaurant_id: str):
+def get_restaurant_detail(request: Request, restaurant_id: str, fields: Optional[str] = FIELDS_QUERY) -> Response:
     """Returns details for a specific restaurant"""
     ServiceLogger.api_called_panel("GET", f"/api/v1/restaurants/{restaurant_id}",
-                                   params={"restaurant_id": restaurant_id})
-    for r in RESTAURANTS:
-        if r["id"] == restaurant_id:
-            ServiceLogger.log_success(
-                f"Found restaurant: {r.get('name', 'Unknown')}", "API")
-            return r
+                                   params={"restaurant_id": restaurant_id, "fields": fields})
+    catalog = CATALOG
+    r = catalog.get_restaurant(restaurant_id)
+    if r is not None:
+        ServiceLogger.log_success(
+            f"Found restaurant: {r.get('name', 'Unknown')}", "API")
+        spec = parse_fields(fields)
+        return encoded_json_response(request, catalog.responses, lambda: project(r, spec))
     ServiceLogger.log_error(f"Restaurant not found: {restaurant_id}", "API")
     raise HTTPException(status_code=404, detail="Restaurant not found")
 
 
 @app.get("/api/v1/menu-items")
-def get_menu_items(restaurant_id: Optional[str] = None) -> Dict[str, Any]:
-    """Returns menu items, optionally filtered by restaurant_id"""
-    ServiceLogger.api_called_panel("GET", "/api/v1/menu-items",
-                                   params={"restaurant_id": restaurant_id} if restaurant_id else None)
-    menu_items: List[Dict[str, Any]] = []
-
+def get_menu_items(request: Request, restaurant_id: Optional[str] = None,
+                   fields: Optional[str] = FIELDS_QUERY, limit: Optional[int] = LIMIT_QUERY) -> Response:
+    """Returns menu items, optionally filtered by restaurant_id; streams NDJSON when Accept asks for it"""
+    params = {k: v for k, v in {"restaurant_id": restaurant_id, "fields": fields, "limit": limit}.items() if v}
+    ServiceLogger.api_called_panel("GET", "/api/v1/menu-items", params=params or None)
+    catalog = CATALOG
     if restaurant_id:
-        for r in RESTAURANTS:
-            if r["id"] == restaurant_id:
-                for item in r.get("menu", []):
-                    menu_items.append(
-                        {**item, "restaurant_id": r["id"], "restaurant_name": r["name"]})
-                break
+        matched = catalog.menu_items_for_restaurant(restaurant_id)
     else:
-        for r in RESTAURANTS:
-            for item in r.get("menu", []):
-                menu_items.append(
-                    {**item, "restaurant_id": r["id"], "restaurant_name": r["name"]})
+        matched = catalog.menu_items
+    if _wants_ndjson(request):
+        ServiceLogger.log_info(f"Streaming up to {len(matched)} menu items as NDJSON", "API")
+        return _ndjson_response(matched, parse_fields(fields), limit)
+    spec = parse_fields(fields)
+
+    def build() -> Dict[str, Any]:
+        menu_items = project_page(matched, spec, limit)
+        ServiceLogger.log_info(f"Encoding {len(menu_items)} menu items", "API")
+        return {"count": len(menu_items), "total": len(matched), "menu_items": menu_items}
 
-    ServiceLogger.log_info(f"Returning {len(menu_items)} menu items", "API")
-    return {"count": len(menu_items), "menu_items": menu_items}
+    return encoded_json_response(request, catalog.responses, build, vary=("Accept",))
 
 
 @app.get("/api/v1/dietary-tags")
-def get_dietary_tags() -> Dict[str, List[str]]:
-    """Returns list of unique dietary tags from all menu items"""
+def get_dietary_tags(request: Request) -> Response:
+    """Returns list of unique dietary tags from all menu items, with menu item counts"""
     ServiceLogger.api_called_panel("GET", "/api/v1/dietary-tags")
-    dietary_tags: set[str] = set()
-    for r in RESTAURANTS:
-        for item in r.get("menu", []):
-            if "dietary_tags" in item and item["dietary_tags"]:
-                dietary_tags.update(item["dietary_tags"])
-    result = sorted(list(dietary_tags))
-    ServiceLogger.log_info(f"Found {len(result)} unique dietary tags", "API")
-    return {"dietary_tags": result}
+    catalog = CATALOG
+    ServiceLogger.log_info(f"Found {len(catalog.facet_counts['dietary_tags'])} unique dietary tags", "API")
+    return encoded_bytes_response(request, catalog.responses, lambda: catalog.facets["dietary_tags"])
 
 
 @app.get("/api/v1/menu-items/by-dietary-tags")
-def get_menu_items_by_dietary_tags(tags: str) -> Dict[str, Any]:
+def get_menu_items_by_dietary_tags(request: Request, tags: str, fields: Optional[str] = FIELDS_QUERY,
+                                   limit: Optional[int] = LIMIT_QUERY) -> Response:
     """Returns menu items filtered by dietary tags (comma-separated)"""
     tag_list = [t.strip() for t in tags.split(",")]
     ServiceLogger.api_called_panel("GET", "/api/v1/menu-items/by-dietary-tags",
-                                   params={"tags": tags})
-    menu_items: List[Dict[str, Any]] = []
+                                   params={"tags": tags, "fields": fields, "limit": limit})
+    catalog = CATALOG
+    spec = parse_fields(fields)
 
-    for r in RESTAURANTS:
-        for item in r.get("menu", []):
-            item_tags = item.get("dietary_tags", [])
-            if any(tag in item_tags for tag in tag_list):
-                menu_items.append(
-                    {**item, "restaurant_id": r["id"], "restaurant_name": r["name"]})
+    def build() -> Dict[str, Any]:
+        matched: List[Dict[str, Any]] = catalog.menu_items_by_dietary_tags(tag_list)
+        menu_items = project_page(matched, spec, limit)
+        ServiceLogger.log_info(
+            f"Found {len(matched)} menu items matching dietary tags: {tag_list}", "API")
+        return {"dietary_tags": tag_list, "count": len(menu_items), "total": len(matched), "menu_items": menu_items}
 
-    ServiceLogger.log_info(
-        f"Found {len(menu_items)} menu items matching dietary tags: {tag_list}", "API")
-    return {"dietary_tags": tag_list, "count": len(menu_items), "menu_items": menu_items}
+    return encoded_json_response(request, catalog.responses, build)
+
+
+def _split_csv(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+@app.get("/api/v1/search")
+def search_dishes(request: Request,
+                  cuisine: Optional[str] = None,
+                  tags: Optional[str] = Query(None, description="Comma-separated restaurant tags; ALL must match"),
+                  dietary_tags: Optional[str] = Query(None, description="Comma-separated dietary tags every dish must have"),
+                  exclude_dietary_tags: Optional[str] = Query(None, description="Comma-separated dietary tags no dish may have"),
+                  min_rating: Optional[float] = Query(None, ge=0),
+                  max_price: Optional[float] = Query(None, ge=0),
+                  min_calories: Optional[int] = Query(None, ge=0),
+                  max_calories: Optional[int] = Query(None, ge=0),
+                  max_delivery_time: Optional[int] = Query(None, ge=0),
+                  fields: Optional[str] = FIELDS_QUERY,
+                  limit: Optional[int] = LIMIT_QUERY) -> Response:
+    """Returns ranked dishes matching all restaurant and dish constraints in one call"""
+    filters = {
+        "cuisine": cuisine,
+        "tags": _split_csv(tags),
+        "dietary_tags": _split_csv(dietary_tags),
+        "exclude_dietary_tags": _split_csv(exclude_dietary_tags),
+        "min_rating": min_rating,
+        "max_price": max_price,
+        "min_calories": min_calories,
+        "max_calories": max_calories,
+        "max_delivery_time": max_delivery_time,
+    }
+    filters = {k: v for k, v in filters.items() if v not in (None, [])}
+    ServiceLogger.api_called_panel("GET", "/api/v1/search", params={**filters, "fields": fields, "limit": limit})
+
+    catalog = CATALOG
+    spec = parse_fields(fields)
+
+    def build() -> Dict[str, Any]:
+        with timed(SEARCH_SECONDS):
+            dishes, total = catalog.search_dishes(
+                cuisine=cuisine,
+                tags=filters.get("tags", []),
+                required_dietary_tags=filters.get("dietary_tags", []),
+                excluded_dietary_tags=filters.get("exclude_dietary_tags", []),
+                min_rating=min_rating,
+                max_price=max_price,
+                min_calories=min_calories,
+                max_calories=max_calories,
+                max_delivery_time=max_delivery_time,
+                limit=limit,
+            )
+        dishes = project(dishes, spec)
+        ServiceLogger.log_info(f"Found {total} dishes matching {filters}", "API")
+        return {"filters": filters, "count": len(dishes), "total": total, "dishes": dishes}
+
+    return encoded_json_response(request, catalog.responses, build)
+
+
+class BatchRequest(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=BATCH_MAX_IDS, description="Restaurant ids to look up")
+
+
+@app.post("/api/v1/restaurants:batch")
+def get_restaurants_batch(request: BatchRequest, fields: Optional[str] = FIELDS_QUERY) -> Dict[str, Any]:
+    """Returns several restaurants in one call, in request order; unknown ids are listed in `missing`"""
+    ServiceLogger.api_called_panel("POST", "/api/v1/restaurants:batch",
+                                   params={"ids": request.ids, "fields": fields})
+    catalog = CATALOG
+    spec = parse_fields(fields)
+    restaurants: List[Dict[str, Any]] = []
+    missing: List[str] = []
+    for restaurant_id in dict.fromkeys(request.ids):
+        r = catalog.get_restaurant(restaurant_id)
+        if r is None:
+            missing.append(restaurant_id)
+        else:
+            restaurants.append(project(r, spec))
+    ServiceLogger.log_info(f"Returning {len(restaurants)} restaurants ({len(missing)} missing)", "API")
+    return {"count": len(restaurants), "restaurants": restaurants, "missing": missing}
+
+
+@app.post("/api/v1/menu-items:batch")
+def get_menu_items_batch(request: BatchRequest, fields: Optional[str] = FIELDS_QUERY) -> Dict[str, Any]:
+    """Returns the menus of several restaurants in one call as a flat list tagged with restaurant_id"""
+    ServiceLogger.api_called_panel("POST", "/api/v1/menu-items:batch",
+                                   params={"ids": request.ids, "fields": fields})
+    catalog = CATALOG
+    menu_items: List[Dict[str, Any]] = []
+    missing: List[str] = []
+    for restaurant_id in dict.fromkeys(request.ids):
+        if catalog.get_restaurant(restaurant_id) is None:
+            missing.append(restaurant_id)
+        else:
+            menu_items.extend(catalog.menu_items_for_restaurant(restaurant_id))
+    menu_items = project_page(menu_items, parse_fields(fields), None)
+    ServiceLogger.log_info(f"Returning {len(menu_items)} menu items ({len(missing)} restaurants missing)", "API")
+    return {"restaurant_ids": request.ids, "count": len(menu_items), "menu_items": menu_items, "missing": missing}
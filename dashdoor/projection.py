@@ -0,0 +1,50 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+# A parsed `fields=` spec: field name -> nested spec for dotted children (empty = whole value)
+FieldSpec = Dict[str, "FieldSpec"]
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FieldSpec]:
+    """
+    Parses a `fields=` query value such as "id,name,menu.name,menu.price" into a FieldSpec.
+
+    Dotted paths select keys inside nested objects, and inside every element of nested
+    lists (e.g. `menu.price` keeps only the price of each menu item). Returns None
+    when no projection was requested.
+    """
+    if fields is None or not fields.strip():
+        return None
+    spec: FieldSpec = {}
+    for path in fields.split(","):
+        parts = [p.strip() for p in path.split(".")]
+        if not all(parts):
+            raise HTTPException(status_code=400, detail=f"Invalid field: '{path.strip()}'")
+        node = spec
+        for part in parts[:-1]:
+            if part in node and not node[part]:
+                # the whole value is already selected by a shorter path
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = {}
+    return spec
+
+
+def project(value: Any, spec: Optional[FieldSpec]) -> Any:
+    """Returns a copy of `value` keeping only the fields in `spec`; unknown fields are skipped."""
+    if not spec:
+        return value
+    if isinstance(value, list):
+        return [project(v, spec) for v in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: project(value[key], sub_spec) for key, sub_spec in spec.items() if key in value}
+
+
+def project_page(items: List[Dict[str, Any]], spec: Optional[FieldSpec], limit: Optional[int]) -> List[Dict[str, Any]]:
+    """Applies `limit` and then the projection to a list of catalog records."""
+    if limit is not None:
+        items = items[:limit]
+    return project(items, spec) if spec else items
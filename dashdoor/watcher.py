@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from utils.logger import ServiceLogger
+
+# watchdog event types that mean the file's content may have changed
+WRITE_EVENTS = {"created", "modified", "moved", "closed"}
+
+
+class CatalogWatcher:
+    """
+    Watches restaurants.json with watchdog and triggers a reload when it changes.
+
+    Generators and editors usually write a file in several events (truncate, write,
+    rename), so events are debounced: the reload runs once the file has been quiet
+    for `debounce_seconds`. The reload coroutine is scheduled on the server's event loop.
+    """
+
+    def __init__(self, path: Path, reload: Callable[[str], Awaitable[object]],
+                 loop: asyncio.AbstractEventLoop, debounce_seconds: float = 1.0):
+        self.path = path.resolve()
+        self.reload = reload
+        self.loop = loop
+        self.debounce_seconds = debounce_seconds
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self._observer = None
+
+    def start(self) -> None:
+        # Imported here so DashDoor still runs without watchdog when watching is disabled
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # ignore opened / closed-without-write, including the reload's own read
+                if event.event_type not in WRITE_EVENTS:
+                    return
+                paths = [getattr(event, "src_path", None), getattr(event, "dest_path", None)]
+                if any(p and Path(p).resolve() == watcher.path for p in paths):
+                    watcher._schedule()
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), str(self.path.parent), recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        ServiceLogger.log_info(f"Watching {self.path.name} for changes", "RELOAD")
+
+    def stop(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+
+    def _schedule(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_seconds, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.reload("file change"), self.loop)
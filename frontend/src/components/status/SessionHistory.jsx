@@ -197,7 +197,7 @@ SessionHistoryItem.propTypes = {
   onChatClick: PropTypes.func.isRequired
 };
 
-const SessionHistory = ({ sessions, currentSessionId, onChatClick }) => {
+const SessionHistory = ({ sessions, currentSessionId, onChatClick, hasMore = false, isLoadingMore = false, onLoadMore }) => {
   const [currentPage, setCurrentPage] = useState(1);
   const itemsPerPage = 5;
 
@@ -235,7 +235,7 @@ const SessionHistory = ({ sessions, currentSessionId, onChatClick }) => {
       <div className="flex items-center justify-between mb-3">
         <h3 className="text-lg font-semibold text-white">Session History</h3>
         <span className="text-sm text-gray-400">
-          {sessionsList.length} session{sessionsList.length !== 1 ? 's' : ''}
+          {sessionsList.length}{hasMore ? '+' : ''} session{sessionsList.length !== 1 || hasMore ? 's' : ''}
         </span>
       </div>
 
@@ -284,6 +284,21 @@ const SessionHistory = ({ sessions, currentSessionId, onChatClick }) => {
           </button>
         </div>
       )}
+
+      {/* Older sessions are fetched from the server one page at a time */}
+      {hasMore && onLoadMore && currentPage >= totalPages && (
+        <button
+          onClick={onLoadMore}
+          disabled={isLoadingMore}
+          className={`w-full px-4 py-2 rounded-lg text-sm transition-colors ${
+            isLoadingMore
+              ? 'text-gray-600 cursor-not-allowed'
+              : 'text-blue-400 hover:bg-blue-500/10'
+          }`}
+        >
+          {isLoadingMore ? 'Loading...' : 'Load older sessions'}
+        </button>
+      )}
     </div>
   );
 };
@@ -291,7 +306,10 @@ const SessionHistory = ({ sessions, currentSessionId, onChatClick }) => {
 SessionHistory.propTypes = {
   sessions: PropTypes.array.isRequired,
   currentSessionId: PropTypes.string,
-  onChatClick: PropTypes.func.isRequired
+  onChatClick: PropTypes.func.isRequired,
+  hasMore: PropTypes.bool,
+  isLoadingMore: PropTypes.bool,
+  onLoadMore: PropTypes.func
 };
 
 export default SessionHistory;
@@ -41,6 +41,8 @@ const StatusTab = () => {
     showCelebration,
     celebrationMessage,
     sessionHistory,
+    sessionHistoryCursor,
+    isLoadingMoreHistory,
     selectedSessionForChat,
     currentSessionState,
     currentWorkflowStatus,
@@ -124,6 +126,9 @@ const StatusTab = () => {
         sessions={sessionHistory}
         currentSessionId={activeSessionId}
         onChatClick={handleChatClick}
+        hasMore={Boolean(sessionHistoryCursor)}
+        isLoadingMore={isLoadingMoreHistory}
+        onLoadMore={sessionContext?.loadMoreSessionHistory}
       />
 
       {/* Selection Modal */}
@@ -1,4 +1,4 @@
-import { createContext, useEffect, useRef } from 'react';
+import { createContext, useCallback, useEffect, useRef } from 'react';
 import { useUser } from '../hooks/useUser';
 import { useAutoNom } from '../hooks/useAutoNom';
 import { useStatusStore } from '../stores/statusStore';
@@ -8,21 +8,32 @@ import {
   getWorkflowStatus,
   getMealChoiceVerificationMessage,
   getMealChoices,
-  getOrderConfirmationData
+  getOrderConfirmationData,
+  applySessionStateDelta
 } from '../utils/sessionAccessors';
 
 const logger = createLogger('SessionProvider');
 
 const SessionContext = createContext(null);
 
+// Merges fetched sessions into the loaded history: fetched entries win, the rest (older
+// pages, the live state of the active session) are kept. Newest first.
+const mergeSessionHistory = (loaded, fetched) => {
+  const fetchedIds = new Set(fetched.map(session => session.session_id));
+  return [...fetched, ...loaded.filter(session => !fetchedIds.has(session.session_id))]
+    .sort((a, b) => new Date(b.create_time) - new Date(a.create_time));
+};
+
 export const SessionProvider = ({ children }) => {
   const { getCurrentUserId, activeSessionId, setActiveSessionId } = useUser();
-  const { fetchSessionState, fetchUserSessions } = useAutoNom();
+  const { fetchSessionState, fetchUserSessions, fetchActiveSessionsForUser } = useAutoNom();
   
   const {
     showModal,
     celebrationShownForSession,
     setSessionHistory,
+    setSessionHistoryCursor,
+    setIsLoadingMoreHistory,
     setStatusTitle,
     setStatusSubtitle,
     setIsActive,
@@ -37,32 +48,52 @@ export const SessionProvider = ({ children }) => {
   } = useStatusStore();
 
   const pollIntervalRef = useRef(null);
+  const eventSourceRef = useRef(null);
+  const startSessionUpdatesRef = useRef(null);
+  const statusUpdateCallbackRef = useRef(null);
   const historyPollIntervalRef = useRef(null);
+  const activeSessionIdRef = useRef(activeSessionId);
   const previousWorkflowStatusRef = useRef(null);
   const sessionHistoryRef = useRef([]);
+  // true once "load more" fetched pages beyond the first; refreshes then keep its cursor
+  const olderPagesLoadedRef = useRef(false);
+
+  // Keep the latest activeSessionId readable from the history stream without reopening it
+  useEffect(() => {
+    activeSessionIdRef.current = activeSessionId;
+  }, [activeSessionId]);
 
-  // Fetch session history - only poll when there's no active session
+  // Fetch session history, then refresh it whenever the server pushes a change to the
+  // user's session list (polling only as a fallback if that stream is closed for good)
   useEffect(() => {
     const userId = getCurrentUserId();
     if (!userId) return;
 
+    // A new user starts from an empty history
+    sessionHistoryRef.current = [];
+    olderPagesLoadedRef.current = false;
+    setSessionHistory([]);
+    setSessionHistoryCursor(null);
+
+    // (Re)fetches the first page and merges it into the pages already loaded
     const loadSessionHistory = async () => {
       try {
         logger.log('Loading session history for user:', userId);
         const data = await fetchUserSessions(userId);
         if (data && data.sessions) {
-          // Sort sessions by create_time, newest first
-          const sortedSessions = [...data.sessions].sort((a, b) => 
-            new Date(b.create_time) - new Date(a.create_time)
-          );
-          setSessionHistory(sortedSessions);
+          const mergedSessions = mergeSessionHistory(sessionHistoryRef.current, data.sessions);
+          setSessionHistory(mergedSessions);
           // Sync ref with store
-          sessionHistoryRef.current = sortedSessions;
+          sessionHistoryRef.current = mergedSessions;
+          // once older pages are loaded, their cursor (not the first page's) marks what is left
+          if (!olderPagesLoadedRef.current) {
+            setSessionHistoryCursor(data.next_cursor || null);
+          }
           
           // Auto-set active session if none is currently set
-          if (!activeSessionId) {
+          if (!activeSessionIdRef.current) {
             // Find the latest session that's not in a terminal state (ORDER_CONFIRMED or NO_PLANNING_NEEDED)
-            const latestActiveSession = sortedSessions.find(
+            const latestActiveSession = mergedSessions.find(
               session => {
                 const status = getWorkflowStatus(session);
                 return status !== WORKFLOW_STATUS.ORDER_CONFIRMED && 
@@ -73,6 +104,13 @@ export const SessionProvider = ({ children }) => {
             if (latestActiveSession) {
               logger.log('Auto-setting active session from history:', latestActiveSession.session_id);
               setActiveSessionId(latestActiveSession.session_id);
+            } else if (data.has_more) {
+              // an active session may sit on a page that is not loaded; ask the server directly
+              const active = await fetchActiveSessionsForUser(userId);
+              if (active && active.session_ids && active.session_ids.length > 0 && !activeSessionIdRef.current) {
+                logger.log('Auto-setting active session from active sessions:', active.session_ids[0]);
+                setActiveSessionId(active.session_ids[0]);
+              }
             }
           }
         }
@@ -81,42 +119,74 @@ export const SessionProvider = ({ children }) => {
       }
     };
 
-    // Clear any existing history polling interval
-    if (historyPollIntervalRef.current) {
-      clearInterval(historyPollIntervalRef.current);
-      historyPollIntervalRef.current = null;
-    }
-
     // Load history immediately
     loadSessionHistory();
-    
-    // Only poll session history if there's NO active session
-    if (!activeSessionId) {
-      logger.log('No active session, starting history polling');
+
+    logger.log('Opening user session-list event stream');
+    const eventSource = new EventSource(`/api/users/${userId}/events`);
+    // a session was created or changed workflow_status, or we fell behind and must re-sync
+    eventSource.addEventListener('session', loadSessionHistory);
+    eventSource.addEventListener('resync', loadSessionHistory);
+    eventSource.onerror = () => {
+      // The browser reconnects on its own unless the stream was closed for good
+      if (eventSource.readyState !== EventSource.CLOSED || historyPollIntervalRef.current) return;
+      logger.log('User event stream closed, falling back to history polling');
       historyPollIntervalRef.current = setInterval(loadSessionHistory, POLLING_INTERVALS.SESSION_HISTORY);
-    } else {
-      logger.log('Active session exists, skipping history polling');
-    }
+    };
     
     return () => {
+      eventSource.close();
       if (historyPollIntervalRef.current) {
         clearInterval(historyPollIntervalRef.current);
         historyPollIntervalRef.current = null;
       }
     };
-  }, [getCurrentUserId, fetchUserSessions, activeSessionId, setSessionHistory, setActiveSessionId]);
+  }, [
+    getCurrentUserId,
+    fetchUserSessions,
+    fetchActiveSessionsForUser,
+    setSessionHistory,
+    setSessionHistoryCursor,
+    setActiveSessionId
+  ]);
 
-  // Poll for session state when activeSessionId changes
+  // Fetches the next (older) page of session history and appends it
+  const loadMoreSessionHistory = useCallback(async () => {
+    const userId = getCurrentUserId();
+    const { sessionHistoryCursor, isLoadingMoreHistory } = useStatusStore.getState();
+    if (!userId || !sessionHistoryCursor || isLoadingMoreHistory) return;
+
+    setIsLoadingMoreHistory(true);
+    try {
+      logger.log('Loading older session history for user:', userId);
+      const data = await fetchUserSessions(userId, sessionHistoryCursor);
+      if (data && data.sessions) {
+        const mergedSessions = mergeSessionHistory(sessionHistoryRef.current, data.sessions);
+        sessionHistoryRef.current = mergedSessions;
+        olderPagesLoadedRef.current = true;
+        setSessionHistory(mergedSessions);
+        setSessionHistoryCursor(data.next_cursor || null);
+      }
+    } finally {
+      setIsLoadingMoreHistory(false);
+    }
+  }, [getCurrentUserId, fetchUserSessions, setSessionHistory, setSessionHistoryCursor, setIsLoadingMoreHistory]);
+
+  // Stream session state (polling as fallback) when activeSessionId changes
   useEffect(() => {
     const userId = getCurrentUserId();
     
     logger.log('Session polling effect triggered:', { activeSessionId, userId });
     
-    // Clear any existing session state polling interval
+    // Clear any existing session state stream or polling interval
     if (pollIntervalRef.current) {
       clearInterval(pollIntervalRef.current);
       pollIntervalRef.current = null;
     }
+    if (eventSourceRef.current) {
+      eventSourceRef.current.close();
+      eventSourceRef.current = null;
+    }
     
     // If no valid session or no user, stop polling
     if (!activeSessionId || !userId) {
@@ -130,127 +200,162 @@ export const SessionProvider = ({ children }) => {
     resetForNewSession();
     previousWorkflowStatusRef.current = null;
     
-    // Stop history polling when we start session state polling
-    if (historyPollIntervalRef.current) {
-      logger.log('Stopping history polling to start session state polling');
-      clearInterval(historyPollIntervalRef.current);
-      historyPollIntervalRef.current = null;
-    }
+    // Stop both the server-push stream and the polling fallback
+    const stopSessionUpdates = () => {
+      if (pollIntervalRef.current) {
+        clearInterval(pollIntervalRef.current);
+        pollIntervalRef.current = null;
+      }
+      if (eventSourceRef.current) {
+        eventSourceRef.current.close();
+        eventSourceRef.current = null;
+      }
+    };
 
-    // Function to poll session state
-    const pollSessionState = async () => {
-      try {
-        logger.log('Polling session state for:', { userId, activeSessionId });
-        const sessionState = await fetchSessionState(userId, activeSessionId);
-        logger.log('Session state response:', sessionState);
+    // Function to apply the latest session state (from the stream or a poll)
+    const handleSessionState = (sessionState) => {
+      if (sessionState && sessionState.state) {
+        const workflowStatus = getWorkflowStatus(sessionState);
+        const previousStatus = previousWorkflowStatusRef.current;
+        logger.log('Workflow status:', workflowStatus, 'Previous:', previousStatus);
         
-        if (sessionState && sessionState.state) {
-          const workflowStatus = getWorkflowStatus(sessionState);
-          const previousStatus = previousWorkflowStatusRef.current;
-          logger.log('Workflow status:', workflowStatus, 'Previous:', previousStatus);
-          
-          // Update Zustand store with session state
-          setCurrentSessionState(sessionState);
-          
-          // Update session history with latest session state using ref to avoid re-render loop
-          sessionHistoryRef.current = sessionHistoryRef.current || [];
-          const sessionIndex = sessionHistoryRef.current.findIndex(s => s.session_id === activeSessionId);
+        // Update Zustand store with session state
+        setCurrentSessionState(sessionState);
+        
+        // Update session history with latest session state using ref to avoid re-render loop
+        sessionHistoryRef.current = sessionHistoryRef.current || [];
+        const sessionIndex = sessionHistoryRef.current.findIndex(s => s.session_id === activeSessionId);
+        
+        if (sessionIndex >= 0) {
+          // Update existing session
+          sessionHistoryRef.current[sessionIndex] = sessionState;
+        } else {
+          // Add new session to history
+          sessionHistoryRef.current = [sessionState, ...sessionHistoryRef.current];
+        }
+        
+        // Update Zustand store with the updated history
+        setSessionHistory([...sessionHistoryRef.current]);
+        
+        // Get display info from helper function
+        const statusDisplay = getStatusDisplay(workflowStatus);
+        setStatusTitle(statusDisplay.title);
+        setStatusSubtitle(statusDisplay.subtitle);
+        setIsActive(statusDisplay.isActive);
+        
+        // Notify the caller that resumed updates after feedback, if any
+        if (statusUpdateCallbackRef.current) {
+          statusUpdateCallbackRef.current(workflowStatus, sessionState);
+        }
+        
+        // Check for state transition from MEAL_PLANNING_COMPLETE to AWAITING_USER_APPROVAL
+        const isTransitionToApproval = 
+          previousStatus === WORKFLOW_STATUS.MEAL_PLANNING_COMPLETE && 
+          workflowStatus === WORKFLOW_STATUS.AWAITING_USER_APPROVAL;
+        
+        // Show modal ONLY on edge trigger (state transition)
+        if (workflowStatus === WORKFLOW_STATUS.AWAITING_USER_APPROVAL) {
+          const message = getMealChoiceVerificationMessage(sessionState);
+          const mealChoices = getMealChoices(sessionState);
           
-          if (sessionIndex >= 0) {
-            // Update existing session
-            sessionHistoryRef.current[sessionIndex] = sessionState;
-          } else {
-            // Add new session to history
-            sessionHistoryRef.current = [sessionState, ...sessionHistoryRef.current];
+          if (message && isTransitionToApproval && !showModal) {
+            logger.log('Edge trigger detected: MEAL_PLANNING_COMPLETE -> AWAITING_USER_APPROVAL');
+            logger.log('Showing approval modal with message and meal choices');
+            setModalMessage(message);
+            setModalMealChoices(mealChoices);
+            setShowModal(true);
+            
+            // Stop updates while modal is open
+            logger.log('Pausing session updates while modal is open');
+            stopSessionUpdates();
+          }
+        } else if (workflowStatus === WORKFLOW_STATUS.ORDER_CONFIRMED) {
+          // Show celebration popup with order confirmation data (only once per session)
+          const orderData = getOrderConfirmationData(sessionState);
+          if (celebrationShownForSession !== activeSessionId) {
+            logger.log('Showing celebration popup for session:', activeSessionId);
+            setCelebrationMessage(orderData);
+            setShowCelebration(true);
+            setCelebrationShownForSession(activeSessionId);
+            setTimeout(() => setShowCelebration(false), POLLING_INTERVALS.CELEBRATION_DISPLAY);
           }
           
-          // Update Zustand store with the updated history
-          setSessionHistory([...sessionHistoryRef.current]);
-          
-          // Get display info from helper function
-          const statusDisplay = getStatusDisplay(workflowStatus);
-          setStatusTitle(statusDisplay.title);
-          setStatusSubtitle(statusDisplay.subtitle);
-          setIsActive(statusDisplay.isActive);
-          
-          // Check for state transition from MEAL_PLANNING_COMPLETE to AWAITING_USER_APPROVAL
-          const isTransitionToApproval = 
-            previousStatus === WORKFLOW_STATUS.MEAL_PLANNING_COMPLETE && 
-            workflowStatus === WORKFLOW_STATUS.AWAITING_USER_APPROVAL;
+          // Stop session state updates once order is confirmed
+          logger.log('Order confirmed, stopping session state updates');
+          stopSessionUpdates();
           
-          // Show modal ONLY on edge trigger (state transition)
-          if (workflowStatus === WORKFLOW_STATUS.AWAITING_USER_APPROVAL) {
-            const message = getMealChoiceVerificationMessage(sessionState);
-            const mealChoices = getMealChoices(sessionState);
-            
-            if (message && isTransitionToApproval && !showModal) {
-              logger.log('Edge trigger detected: MEAL_PLANNING_COMPLETE -> AWAITING_USER_APPROVAL');
-              logger.log('Showing approval modal with message and meal choices');
-              setModalMessage(message);
-              setModalMealChoices(mealChoices);
-              setShowModal(true);
-              
-              // Stop polling while modal is open
-              if (pollIntervalRef.current) {
-                logger.log('Pausing polling while modal is open');
-                clearInterval(pollIntervalRef.current);
-                pollIntervalRef.current = null;
-              }
-            }
-          } else if (workflowStatus === WORKFLOW_STATUS.ORDER_CONFIRMED) {
-            // Show celebration popup with order confirmation data (only once per session)
-            const orderData = getOrderConfirmationData(sessionState);
-            if (celebrationShownForSession !== activeSessionId) {
-              logger.log('Showing celebration popup for session:', activeSessionId);
-              setCelebrationMessage(orderData);
-              setShowCelebration(true);
-              setCelebrationShownForSession(activeSessionId);
-              setTimeout(() => setShowCelebration(false), POLLING_INTERVALS.CELEBRATION_DISPLAY);
-            }
-            
-            // Stop session state polling once order is confirmed
-            logger.log('Order confirmed, stopping session state polling');
-            if (pollIntervalRef.current) {
-              clearInterval(pollIntervalRef.current);
-              pollIntervalRef.current = null;
-            }
-            
-            // Clear active session so history polling can resume
-            setActiveSessionId(null);
-          } else if (workflowStatus === WORKFLOW_STATUS.NO_PLANNING_NEEDED) {
-            // Stop session state polling - no planning needed is a terminal state
-            logger.log('No planning needed, stopping session state polling');
-            if (pollIntervalRef.current) {
-              clearInterval(pollIntervalRef.current);
-              pollIntervalRef.current = null;
-            }
-            
-            // Clear active session so history polling can resume
-            setActiveSessionId(null);
-          }
+          // Clear active session so history polling can resume
+          setActiveSessionId(null);
+        } else if (workflowStatus === WORKFLOW_STATUS.NO_PLANNING_NEEDED) {
+          // Stop session state updates - no planning needed is a terminal state
+          logger.log('No planning needed, stopping session state updates');
+          stopSessionUpdates();
           
-          // Update previous workflow status for next poll (edge trigger detection)
-          previousWorkflowStatusRef.current = workflowStatus;
+          // Clear active session so history polling can resume
+          setActiveSessionId(null);
         }
+        
+        // Update previous workflow status for next update (edge trigger detection)
+        previousWorkflowStatusRef.current = workflowStatus;
+      }
+    };
+
+    // Function to poll session state (fallback when the event stream is unavailable)
+    const pollSessionState = async () => {
+      try {
+        logger.log('Polling session state for:', { userId, activeSessionId });
+        const sessionState = await fetchSessionState(userId, activeSessionId);
+        logger.log('Session state response:', sessionState);
+        handleSessionState(sessionState);
       } catch (error) {
         logger.error('Error polling session state:', error);
       }
     };
 
-    // Poll immediately
-    logger.log('Starting immediate poll and setting up interval');
-    pollSessionState();
-    
-    // Set up polling interval
-    pollIntervalRef.current = setInterval(pollSessionState, POLLING_INTERVALS.SESSION_STATE);
+    // Subscribe to server-pushed session state: a full snapshot first, then deltas.
+    // Polling only takes over if the stream is closed for good.
+    const startSessionUpdates = () => {
+      if (eventSourceRef.current || pollIntervalRef.current) return;
+
+      logger.log('Opening session event stream');
+      let streamedState = null;
+      const eventSource = new EventSource(`/api/users/${userId}/sessions/${activeSessionId}/events`);
+      eventSourceRef.current = eventSource;
+
+      eventSource.addEventListener('snapshot', (event) => {
+        streamedState = JSON.parse(event.data);
+        handleSessionState(streamedState);
+      });
+
+      eventSource.addEventListener('delta', (event) => {
+        if (!streamedState) return;
+        const delta = JSON.parse(event.data);
+        streamedState = {
+          ...streamedState,
+          state: applySessionStateDelta(streamedState.state, delta.state)
+        };
+        handleSessionState(streamedState);
+      });
+
+      eventSource.onerror = () => {
+        // The browser reconnects on its own unless the stream was closed for good
+        if (eventSource.readyState !== EventSource.CLOSED || eventSourceRef.current !== eventSource) return;
+        logger.log('Session event stream closed, falling back to polling');
+        eventSourceRef.current = null;
+        pollSessionState();
+        pollIntervalRef.current = setInterval(pollSessionState, POLLING_INTERVALS.SESSION_STATE);
+      };
+    };
+
+    startSessionUpdates();
+    // Lets resumePollingAfterFeedback reopen the stream once the approval modal closes
+    startSessionUpdatesRef.current = startSessionUpdates;
 
     // Cleanup on unmount or when dependencies change
     return () => {
-      logger.log('Cleaning up session state polling interval');
-      if (pollIntervalRef.current) {
-        clearInterval(pollIntervalRef.current);
-        pollIntervalRef.current = null;
-      }
+      logger.log('Cleaning up session state stream');
+      startSessionUpdatesRef.current = null;
+      stopSessionUpdates();
     };
   }, [
     activeSessionId,
@@ -273,67 +378,31 @@ export const SessionProvider = ({ children }) => {
     setSessionHistory
   ]);
 
-  // Method to resume polling after feedback submission
+  // Method to resume session updates after feedback submission
   const resumePollingAfterFeedback = (sessionId, onStatusUpdate) => {
     const userId = getCurrentUserId();
     
     if (!userId || !sessionId) return;
     
-    // Resume polling after a delay to give backend time to process
+    statusUpdateCallbackRef.current = onStatusUpdate || null;
+    
+    // Resume after a delay to give backend time to process
     setTimeout(() => {
-      if (!pollIntervalRef.current && activeSessionId) {
-        logger.log('Resuming polling after feedback submission');
-        
-        const resumedPollSessionState = async () => {
-          try {
-            const sessionState = await fetchSessionState(userId, sessionId);
-            if (sessionState && sessionState.state) {
-              const workflowStatus = getWorkflowStatus(sessionState);
-              logger.log('Resumed polling - workflow status:', workflowStatus);
-              
-              // Update store with new session state
-              setCurrentSessionState(sessionState);
-              
-              // Get display info and update store
-              const statusDisplay = getStatusDisplay(workflowStatus);
-              setStatusTitle(statusDisplay.title);
-              setStatusSubtitle(statusDisplay.subtitle);
-              setIsActive(statusDisplay.isActive);
-              
-              // Notify callback if provided
-              if (onStatusUpdate) {
-                onStatusUpdate(workflowStatus, sessionState);
-              }
-              
-              if (workflowStatus === WORKFLOW_STATUS.ORDER_CONFIRMED) {
-                const orderData = getOrderConfirmationData(sessionState);
-                if (celebrationShownForSession !== sessionId) {
-                  setCelebrationMessage(orderData);
-                  setShowCelebration(true);
-                  setCelebrationShownForSession(sessionId);
-                  setTimeout(() => setShowCelebration(false), POLLING_INTERVALS.CELEBRATION_DISPLAY);
-                }
-                
-                if (pollIntervalRef.current) {
-                  clearInterval(pollIntervalRef.current);
-                  pollIntervalRef.current = null;
-                }
-                setActiveSessionId(null);
-              }
-            }
-          } catch (error) {
-            logger.error('Error in resumed polling:', error);
-          }
-        };
-        
-        resumedPollSessionState();
-        pollIntervalRef.current = setInterval(resumedPollSessionState, POLLING_INTERVALS.SESSION_STATE);
+      if (sessionId !== activeSessionId) {
+        // Feedback for a session picked from history: make it active, which opens its event stream
+        logger.log('Switching session updates to the session that received feedback:', sessionId);
+        setActiveSessionId(sessionId);
+      } else if (startSessionUpdatesRef.current) {
+        // Reopen the event stream (no-op while it or the polling fallback is still running)
+        logger.log('Resuming session event stream after feedback submission');
+        startSessionUpdatesRef.current();
       }
     }, POLLING_INTERVALS.RESUME_AFTER_FEEDBACK);
   };
 
   const value = {
-    resumePollingAfterFeedback
+    resumePollingAfterFeedback,
+    loadMoreSessionHistory
   };
 
   return <SessionContext.Provider value={value}>{children}</SessionContext.Provider>;
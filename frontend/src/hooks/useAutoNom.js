@@ -6,6 +6,9 @@ import { useLoadingState } from './useLoadingState';
 
 const logger = createLogger('useAutoNom');
 
+// Number of sessions shown in the history list
+const SESSION_HISTORY_PAGE_SIZE = 20;
+
 export const useAutoNom = () => {
   const { isLoading: isProcessing, setIsLoading: setIsProcessing } = useLoadingState();
   const [eventLog, setEventLog] = useState([]);
@@ -38,10 +41,13 @@ export const useAutoNom = () => {
     }
   }, []);
 
-  // Fetch all sessions for a user
-  const fetchUserSessions = useCallback(async (userId) => {
+  // Fetch one page of a user's sessions, most recently updated first (summary fields only).
+  // Pass the previous page's `next_cursor` to get the page after it.
+  const fetchUserSessions = useCallback(async (userId, cursor = null) => {
     try {
-      const response = await axios.get(`/api/users/${userId}/sessions`);
+      const params = { fields: 'summary', limit: SESSION_HISTORY_PAGE_SIZE };
+      if (cursor) params.cursor = cursor;
+      const response = await axios.get(`/api/users/${userId}/sessions`, { params });
       return response.data;
     } catch (error) {
       logger.error('Error fetching user sessions:', error);
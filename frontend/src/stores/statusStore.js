@@ -23,6 +23,9 @@ export const useStatusStore = create((set, get) => ({
   
   // Session history
   sessionHistory: [],
+  // Cursor of the next (older) history page; null when every page is loaded
+  sessionHistoryCursor: null,
+  isLoadingMoreHistory: false,
   selectedSessionForChat: null,
   
   // User feedback tracking
@@ -47,6 +50,8 @@ export const useStatusStore = create((set, get) => ({
   setCelebrationShownForSession: (sessionId) => set({ celebrationShownForSession: sessionId }),
   
   setSessionHistory: (history) => set({ sessionHistory: history }),
+  setSessionHistoryCursor: (cursor) => set({ sessionHistoryCursor: cursor }),
+  setIsLoadingMoreHistory: (loading) => set({ isLoadingMoreHistory: loading }),
   setSelectedSessionForChat: (session) => set({ selectedSessionForChat: session }),
   
   setUserFeedbackReceived: (received) => set({ userFeedbackReceived: received }),
@@ -155,3 +155,22 @@ export const getFormattedCreateTime = (session) => {
     minute: '2-digit'
   });
 };
+
+/**
+ * Apply a streamed state delta to a session state object.
+ * Nested objects are merged key by key; arrays and scalars are replaced.
+ * @param {Object} state - The current session state
+ * @param {Object} delta - The changed keys (client format)
+ * @returns {Object} New state object with the delta applied
+ */
+export const applySessionStateDelta = (state, delta) => {
+  const isPlainObject = (value) => value !== null && typeof value === 'object' && !Array.isArray(value);
+  if (!isPlainObject(state) || !isPlainObject(delta)) return delta;
+  const merged = { ...state };
+  Object.entries(delta).forEach(([key, value]) => {
+    merged[key] = isPlainObject(value) && isPlainObject(state[key])
+      ? applySessionStateDelta(state[key], value)
+      : value;
+  });
+  return merged;
+};
@@ -1,39 +1,33 @@
 
 import uuid
 import json
-from pathlib import Path
+import time
 
-from google.adk.runners import Runner
-from google.adk.sessions import DatabaseSessionService
 from google.adk.events import Event
 from google.genai import types
 from typing import Any
 from pydantic import BaseModel, Field
 from src.auto_nom_agent.agents import root_agent
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.syntax import Syntax
-from rich import box
 
-
-from src.db import db_manager
+from src.agentic_workflows.runtime import AgentRuntime
+from src.db import async_db_manager
 from src.schema.users import UserProfile
+from src.utils.llm_usage import usage_scope
+from src.utils.session_events import session_event_hub, user_channel
+from src.utils.tracing import SESSION_ID_ATTRIBUTE, tracer
 from utils.logger import ServiceLogger
-console = Console()
-
-# 1. Get the directory of the current file (inside src/agentic_workflows)
-CURRENT_FILE_DIR = Path(__file__).resolve().parent
+from utils.metrics import counter, histogram
 
-# 2. Go up one level to 'src'
-#    .parent of 'agentic_workflows' is 'src'
-SRC_ROOT = CURRENT_FILE_DIR.parent
-
-# 3. Construct the path to the DB folder
-#    Target: src/db
-DB_DIR = SRC_ROOT / "db" / "data"
-DB_FILE = DB_DIR / "autonom.db"
+WORKFLOW_RUN_SECONDS = histogram("autonom_workflow_run_duration_seconds",
+                                 "Duration of one AutoNom.run (a full ADK runner loop)", ["workflow_status"])
+RUNNER_FIRST_EVENT_SECONDS = histogram("autonom_runner_first_event_seconds",
+                                       "Time from starting the runner to its first event")
+# the gap before an event is the model / tool latency that produced it
+RUNNER_EVENT_INTERVAL_SECONDS = histogram("autonom_runner_event_interval_seconds",
+                                          "Time between consecutive runner events, by the event's author and type",
+                                          ["agent", "type"])
+RUNNER_EVENTS = counter("autonom_runner_events_total", "Events yielded by the ADK runner", ["agent", "type"])
 
 
 class SessionState(BaseModel):
@@ -64,7 +58,7 @@ class SessionState(BaseModel):
 
 
 class AutoNom():
-    def __init__(self, user: UserProfile, meal_type: str = "", session_id: str = "", mock_day: str | None = None):
+    def __init__(self, user: UserProfile, runtime: AgentRuntime, meal_type: str = "", session_id: str = "", mock_day: str | None = None):
         self._app_name = "auto_nom_agent"
         self.user = user
         self.meal_type = meal_type
@@ -90,12 +84,14 @@ class AutoNom():
 
         ServiceLogger.log_info(
             f"Initialized AutoNom for user {self.user.id}, with session : {self.session_id}")
-        # private properties # database url
-        self.__db_url = f"sqlite+aiosqlite:///{DB_FILE}"
-        print(f"📍 Database path resolved to: {DB_FILE}")
-        print(f"🔌 Async URL: {self.__db_url}")
-        # setting db session service for persistent storage
-        self.__session_service = DatabaseSessionService(db_url=self.__db_url)
+        # shared session service and runner cache, created once in the app lifespan
+        self.__runtime = runtime
+        self.__session_service = runtime.session_service
+
+        # workflow_status is tracked from event state deltas instead of re-reading the DB per event
+        self.workflow_status: str | None = None
+        # number of DB reads issued by the current run
+        self.db_reads = 0
 
     def __print_function_calls(self, agent_name: str, event: Event):
         """Helper function to print function call events
@@ -114,13 +110,14 @@ class AutoNom():
             for call in calls:
                 tool_name = call.name
                 arguments = call.args  # This is usually a dictionary
-                console.print(Panel(
-                    f"[bold yellow]Function:[/bold yellow] {tool_name}\n\n"
-                    f"[bold yellow]Arguments:[/bold yellow]\n{arguments}",
-                    title=f"[bold yellow]🔧 {agent_name} - Tool Call[/bold yellow]",
-                    border_style="yellow",
-                    box=box.ROUNDED
-                ))
+                # arguments are rendered (and truncated) on the log writer thread, and only if the site is not rate limited
+                ServiceLogger.log_panel(
+                    f"[bold yellow]🔧 {agent_name} - Tool Call[/bold yellow]",
+                    f"[bold yellow]Function:[/bold yellow] {tool_name}",
+                    "yellow",
+                    site="auto_nom.tool_call",
+                    Arguments=arguments
+                )
                 response["calls"].append({
                     "name": tool_name,
                     "arguments": arguments
@@ -144,13 +141,13 @@ class AutoNom():
             for resp in responses:
                 tool_name = resp.name
                 result_dict = resp.response
-                console.print(Panel(
-                    f"[bold magenta]Function:[/bold magenta] {tool_name}\n\n"
-                    f"[bold magenta]Response:[/bold magenta]\n{result_dict}",
-                    title=f"[bold magenta]✅ Tool Response[/bold magenta]",
-                    border_style="magenta",
-                    box=box.ROUNDED
-                ))
+                ServiceLogger.log_panel(
+                    f"[bold magenta]✅ Tool Response[/bold magenta]",
+                    f"[bold magenta]Function:[/bold magenta] {tool_name}",
+                    "magenta",
+                    site="auto_nom.tool_response",
+                    Response=result_dict
+                )
                 response["responses"].append({
                     "name": tool_name,
                     "response": result_dict
@@ -168,42 +165,77 @@ class AutoNom():
         if event.content and event.content.parts:
             if event.content.parts[0].text:
                 text = event.content.parts[0].text
-                if event.partial:
-                    print("  Type: Streaming Text Chunk")
-                else:
-                    print("  Type: Complete Text Message")
+                ServiceLogger.log_debug(
+                    "Type: Streaming Text Chunk" if event.partial else "Type: Complete Text Message")
                 if event.is_final_response():
-                    console.print(Panel(
-                        Markdown(text),
-                        title=f"[bold green]🤖 {agent_name}[/bold green]",
-                        border_style="green",
-                        box=box.ROUNDED
-                    ))
+                    ServiceLogger.log_panel(
+                        f"[bold green]🤖 {agent_name}[/bold green]",
+                        text,
+                        "green",
+                        markdown=True
+                    )
                     response["text"] = text
                     response["isFinalResponse"] = True
                 else:
                     # Intermediate thinking
-                    console.print(Panel(
+                    ServiceLogger.log_panel(
+                        f"[bold cyan]💭 {agent_name} (thinking)[/bold cyan]",
                         text,
-                        title=f"[bold cyan]💭 {agent_name} (thinking)[/bold cyan]",
-                        border_style="cyan",
-                        box=box.ROUNDED
-                    ))
+                        "cyan",
+                        level="DEBUG"
+                    )
                     response["text"] = text
                     response["isFinalResponse"] = False
 
             return response
 
+    @staticmethod
+    def __event_type(event: Event) -> str:
+        if event.get_function_calls():
+            return "tool_call"
+        if event.get_function_responses():
+            return "tool_response"
+        if event.content and event.content.parts and event.content.parts[0].text:
+            return "text"
+        return "other"
+
+    async def __get_workflow_status(self) -> str | None:
+        """Reads workflow_status from the DB. Only used when it cannot be derived from events."""
+        self.db_reads += 1
+        return await async_db_manager.get_session_state_val(
+            self.session_id, "workflow_status")
+
+    def __track_state_delta(self, event: Event) -> None:
+        """Updates the tracked workflow_status from the event's own state delta and
+        publishes the delta to session subscribers"""
+        if event.actions and event.actions.state_delta:
+            workflow_status = event.actions.state_delta.get("workflow_status")
+            if workflow_status is not None:
+                self.workflow_status = workflow_status
+                self.__publish_session_change()
+            # includes changes made by agent callbacks and tools (they reach the runner as event deltas)
+            session_event_hub.publish(self.session_id, event.actions.state_delta)
+
+    def __publish_session_change(self) -> None:
+        """Tells the user's session-list subscribers that this session was created or changed status"""
+        session_event_hub.publish(user_channel(self.user.id), {
+            "session_id": self.session_id, "workflow_status": self.workflow_status})
+
     async def __get_or_create_session(self):
-        existing_sessions = db_manager.get_session_by_id(
-            session_id=self.session_id)
+        self.db_reads += 1
+        # projection query: only workflow_status is read, not the whole state blob
+        existing_state = await async_db_manager.get_session_state_values(
+            self.session_id, ["workflow_status"])
         # existing_sessions = await self.__session_service.list_sessions(app_name=self._app_name, user_id=self.user.id)
-        if existing_sessions:
+        if existing_state is not None:
             # session_id = existing_sessions.sessions[0].id
             # self.__session = existing_sessions.sessions[0]
+            # seed the tracked status from the state we just loaded
+            self.workflow_status = existing_state.get("workflow_status")
             ServiceLogger.log_info(
                 f"Loaded existing session:{self.session_id[:8]}...")
         else:
+            self.workflow_status = self.initial_state["workflow_status"]
             ServiceLogger.log_info(
                 f"Creating new session:{self.session_id[:8]}...")
 
@@ -213,50 +245,77 @@ class AutoNom():
                 session_id=self.session_id,
                 state=self.initial_state
             )
+            self.__publish_session_change()
 
     async def run(self, user_input: str):
-        # Step 1 : Create a new session
-        await self.__get_or_create_session()
-
-        # Step 2 : Create a new Runner instance
-        self.runner = Runner(
-            agent=root_agent,
-            app_name=self._app_name,
-            session_service=self.__session_service,
-        )
-
-        # TODO: Update this prompt to a improve the performance
-        ServiceLogger.log_info(f"Starting session : {self.session_id}")
-
-        # Step 3: Create a user query
-        # user_input = f"Plan a {self.meal_type} for {self.user.name}"
-        query = types.Content(role="user", parts=[
-            types.Part(text=user_input)])
-        
-        
-        async for event in self.runner.run_async(
-            user_id=self.user.id, session_id=self.session_id, new_message=query
-        ):
-            agent_name = event.author if hasattr(event, "author") else "System"
-            
-            agent_name = event.author if hasattr(event, "author") else "System"
-            response = self.__print_function_calls(
-                agent_name=agent_name, event=event)
-
-            if not response:
-                response = self.__print_function_responses(
-                    agent_name=agent_name, event=event)
-
-            if not response:
-                response = self.__print_conversation(
-                    agent_name=agent_name, event=event)
-
-            if response:
-                workflow_status = db_manager.get_session_state_val(
-                    self.session_id, "workflow_status")
-                response["workflow_status"] = workflow_status
-
-            yield (response)
+        self.db_reads = 0
+
+        # root span of this run; ADK's agent/LLM/tool spans and our HTTP/DB spans nest under it
+        with tracer.start_as_current_span("autonom.run", attributes={
+                SESSION_ID_ATTRIBUTE: self.session_id,
+                "autonom.user_id": self.user.id,
+                "autonom.meal_type": self.meal_type}) as run_span:
+            # model usage of this run is billed to the session and written in one batch when it ends
+            usage = usage_scope(self.session_id, self.user.id)
+            try:
+                # Step 1 : Create a new session
+                await self.__get_or_create_session()
+
+                # Step 2 : Get the shared Runner instance
+                self.runner = self.__runtime.get_runner(
+                    agent=root_agent, app_name=self._app_name)
+
+                # TODO: Update this prompt to a improve the performance
+                ServiceLogger.log_info(f"Starting session : {self.session_id}")
+
+                # Step 3: Create a user query
+                # user_input = f"Plan a {self.meal_type} for {self.user.name}"
+                query = types.Content(role="user", parts=[
+                    types.Part(text=user_input)])
+
+                run_started = previous_event_at = time.perf_counter()
+                first_event = True
+                async for event in self.runner.run_async(
+                    user_id=self.user.id, session_id=self.session_id, new_message=query
+                ):
+                    agent_name = event.author if hasattr(event, "author") else "System"
+                    now = time.perf_counter()
+                    if first_event:
+                        RUNNER_FIRST_EVENT_SECONDS.observe(now - run_started)
+                        first_event = False
+                    event_type = self.__event_type(event)
+                    RUNNER_EVENT_INTERVAL_SECONDS.observe(now - previous_event_at, agent=agent_name, type=event_type)
+                    RUNNER_EVENTS.inc(agent=agent_name, type=event_type)
+                    self.__track_state_delta(event)
+
+                    response = self.__print_function_calls(
+                        agent_name=agent_name, event=event)
+
+                    if not response:
+                        response = self.__print_function_responses(
+                            agent_name=agent_name, event=event)
+
+                    if not response:
+                        response = self.__print_conversation(
+                            agent_name=agent_name, event=event)
+
+                    if response:
+                        if self.workflow_status is None:
+                            self.workflow_status = await self.__get_workflow_status()
+                        response["workflow_status"] = self.workflow_status
+
+                    yield (response)
+                    # the consumer's time handling the yielded response is not runner latency
+                    previous_event_at = time.perf_counter()
+
+                WORKFLOW_RUN_SECONDS.observe(time.perf_counter() - run_started, workflow_status=self.workflow_status or "UNKNOWN")
+                run_span.set_attribute("autonom.workflow_status", self.workflow_status or "UNKNOWN")
+                run_span.set_attribute("autonom.db_reads", self.db_reads)
+                ServiceLogger.log_info(
+                    f"Finished session : {self.session_id}", "WORKFLOW",
+                    workflow_status=self.workflow_status, db_reads=self.db_reads)
+            finally:
+                await usage.flush()
 
     async def get_sse_event_stream(self, user_input: str):
         """Generate Server-Sent Events stream for real-time communication with client.
@@ -281,5 +340,5 @@ class AutoNom():
                     {"data": str(item), "session_id": self.session_id})
             # SSE format: each message prefixed with "data: " and separated by a blank line
             yield f"data: {data}\n\n"
-        # final keep-alive/termination event (optional)
-        yield "event: done\ndata: {}\n\n"
+        # final keep-alive/termination event (optional), with the run's DB read count
+        yield f"event: done\ndata: {json.dumps({'workflow_status': self.workflow_status, 'db_reads': self.db_reads})}\n\n"
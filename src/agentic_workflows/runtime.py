@@ -0,0 +1,103 @@
+import os
+from pathlib import Path
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionService
+
+from src.utils.llm_usage import LlmUsagePlugin
+from src.utils.tracing import tracer
+from utils.logger import ServiceLogger
+
+# 1. Get the directory of the current file (inside src/agentic_workflows)
+CURRENT_FILE_DIR = Path(__file__).resolve().parent
+
+# 2. Go up one level to 'src'
+#    .parent of 'agentic_workflows' is 'src'
+SRC_ROOT = CURRENT_FILE_DIR.parent
+
+# 3. Construct the path to the DB folder
+#    Target: src/db
+DB_DIR = SRC_ROOT / "db" / "data"
+DB_FILE = DB_DIR / "autonom.db"
+DB_URL = f"sqlite+aiosqlite:///{DB_FILE}"
+
+# Upper bound on SQLAlchemy connections held by the shared session service
+SESSION_DB_POOL_SIZE = int(os.environ.get("AUTONOM_SESSION_DB_POOL_SIZE", "5"))
+SESSION_DB_MAX_OVERFLOW = int(os.environ.get("AUTONOM_SESSION_DB_MAX_OVERFLOW", "5"))
+
+
+class TracedDatabaseSessionService(DatabaseSessionService):
+    """DatabaseSessionService whose session reads and writes show up as `db session.<operation>` spans."""
+
+    async def _traced(self, operation: str, call, **kwargs):
+        with tracer.start_as_current_span(f"db session.{operation}", attributes={
+                "db.system": "sqlite", "db.operation": operation}):
+            return await call(**kwargs)
+
+    async def create_session(self, **kwargs):
+        return await self._traced("create_session", super().create_session, **kwargs)
+
+    async def get_session(self, **kwargs):
+        return await self._traced("get_session", super().get_session, **kwargs)
+
+    async def list_sessions(self, **kwargs):
+        return await self._traced("list_sessions", super().list_sessions, **kwargs)
+
+    async def delete_session(self, app_name, user_id, session_id):
+        return await self._traced("delete_session", super().delete_session,
+                                  app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session, event):
+        return await self._traced("append_event", super().append_event, session=session, event=event)
+
+
+class AgentRuntime():
+    """
+    Process-wide ADK runtime shared by every AutoNom request.
+
+    Owns a single DatabaseSessionService (one SQLAlchemy engine and connection pool)
+    and caches one Runner per (app_name, agent) so neither is rebuilt per request.
+    Every Runner carries the LLM usage plugin, so all model calls are accounted for.
+    Create it once in the FastAPI lifespan and call `close()` on shutdown.
+    """
+
+    def __init__(self, db_url: str = DB_URL):
+        self.db_url = db_url
+        self.session_service = TracedDatabaseSessionService(
+            db_url=db_url,
+            pool_size=SESSION_DB_POOL_SIZE,
+            max_overflow=SESSION_DB_MAX_OVERFLOW,
+        )
+        self._runners: dict[tuple[str, str], Runner] = {}
+        # records token usage of every model call; agents run as tools inherit the runner's plugins
+        self.llm_usage_plugin = LlmUsagePlugin()
+        ServiceLogger.log_info(
+            "Initialized shared agent runtime", "RUNTIME",
+            db_url=db_url, pool_size=SESSION_DB_POOL_SIZE, max_overflow=SESSION_DB_MAX_OVERFLOW)
+
+    def get_runner(self, agent: BaseAgent, app_name: str) -> Runner:
+        """Returns the cached Runner for the agent, creating it on first use."""
+        key = (app_name, agent.name)
+        runner = self._runners.get(key)
+        if runner is None:
+            runner = Runner(
+                agent=agent,
+                app_name=app_name,
+                session_service=self.session_service,
+                plugins=[self.llm_usage_plugin],
+            )
+            self._runners[key] = runner
+            ServiceLogger.log_info(f"Created runner for agent '{agent.name}'", "RUNTIME", app_name=app_name)
+        return runner
+
+    async def close(self) -> None:
+        """Closes cached runners and disposes the session service engine."""
+        for (app_name, agent_name), runner in self._runners.items():
+            try:
+                await runner.close()
+            except Exception as e:
+                ServiceLogger.log_error(f"Error closing runner for agent '{agent_name}'", "RUNTIME", error=e, app_name=app_name)
+        self._runners.clear()
+        await self.session_service.db_engine.dispose()
+        ServiceLogger.log_info("Agent runtime closed", "RUNTIME")
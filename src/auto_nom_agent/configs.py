@@ -1,3 +1,5 @@
+import os
+
 from google.genai import types
 
 
@@ -10,4 +12,18 @@ retry_options = types.HttpRetryOptions(
 
 model =  "gemini-2.5-pro" # "gemini-2.5-pro"
 gemini_flash = "gemini-2.5-flash"
-gemini_pro = "gemini-2.5-pro"
\ No newline at end of file
+gemini_pro = "gemini-2.5-pro"
+
+# Upper bound (estimated tokens) on what a single scout tool returns into the model context
+tool_output_token_budget = int(os.environ.get("AUTONOM_TOOL_OUTPUT_TOKEN_BUDGET", "4000"))
+# Maximum records a scout tool asks DashDoor for in one list call
+tool_result_limit = int(os.environ.get("AUTONOM_TOOL_RESULT_LIMIT", "25"))
+
+# USD per 1M tokens (standard paid tier, prompts up to 200k tokens), used for LLM cost accounting.
+# Thinking tokens are billed as output; cached prompt tokens at the cached input rate.
+# Models are matched by longest prefix, so versioned names ("gemini-2.5-flash-001") resolve too.
+llm_pricing = {
+    "gemini-2.5-pro": {"input": 1.25, "cached_input": 0.125, "output": 10.00},
+    "gemini-2.5-flash": {"input": 0.30, "cached_input": 0.03, "output": 2.50},
+    "gemini-2.5-flash-lite": {"input": 0.10, "cached_input": 0.01, "output": 0.40},
+}
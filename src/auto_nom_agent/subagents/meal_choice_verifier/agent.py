@@ -7,6 +7,7 @@ from src.auto_nom_agent.configs import retry_options, model
 from google.adk.models.google_llm import Gemini
 from google.adk.agents.callback_context import CallbackContext
 
+from src.utils.agent_metrics import timed_agent_callback
 from src.utils.state import is_valid_transition
 
 
@@ -73,6 +74,7 @@ def update_meal_choice_verification_message(meal_choice_verification_message: st
     }
 
 
+@timed_agent_callback("MealChoiceVerifier", "before_agent")
 def on_before_meal_verifier_agent_call(callback_context: CallbackContext) -> None:
     current_state = callback_context.state["workflow_status"]
     new_state = "MEAL_PLANNING_COMPLETE"
@@ -83,6 +85,7 @@ def on_before_meal_verifier_agent_call(callback_context: CallbackContext) -> Non
     return None
 
 
+@timed_agent_callback("MealChoiceVerifier", "after_agent")
 def on_after_meal_verifier_agent_call(callback_context: CallbackContext) -> None:
     current_state = callback_context.state["workflow_status"]
     new_state = "AWAITING_USER_APPROVAL"
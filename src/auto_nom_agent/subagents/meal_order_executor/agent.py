@@ -15,6 +15,7 @@ from rich.table import Table
 from rich.console import Console
 from google.adk.agents.callback_context import CallbackContext
 
+from src.utils.agent_metrics import timed_agent_callback
 from src.utils.state import is_valid_transition
 
 console = Console()
@@ -112,6 +113,7 @@ def update_order_confirmation_message(order_confirmation_message: dict[str, Any]
     }
 
 
+@timed_agent_callback("MealOrderExecutor", "before_agent")
 def on_before_meal_order_executor_agent_call(callback_context: CallbackContext) -> None:
     current_state = callback_context.state["workflow_status"]
     new_state = "PLACING_ORDER"
@@ -122,6 +124,7 @@ def on_before_meal_order_executor_agent_call(callback_context: CallbackContext)
     return None
 
 
+@timed_agent_callback("MealOrderExecutor", "after_agent")
 def on_after_meal_order_executor_agent_call(callback_context: CallbackContext) -> None:
     current_state = callback_context.state["workflow_status"]
     new_state = "ORDER_CONFIRMED"
@@ -9,24 +9,32 @@ from src.auto_nom_agent.tools.common_tools import get_current_day_of_week
 from src.schema.restaurant import Restaurants
 from src.schema.meals import MealOptions
 from src.utils.restaurant_utils import (
-    get_restaurant_list,
-    get_restaurant_detail,
-    get_cuisines,
-    get_restaurants_by_cuisine,
-    get_tags,
-    get_restaurants_by_tags,
-    get_menu_items,
-    get_dietary_tags,
-    get_menu_items_by_dietary_tags
+    get_restaurant_list_async,
+    get_restaurant_detail_async,
+    get_cuisines_async,
+    get_restaurants_by_cuisine_async,
+    get_tags_async,
+    get_restaurants_by_tags_async,
+    get_menu_items_async,
+    get_dietary_tags_async,
+    get_menu_items_by_dietary_tags_async,
+    search_dishes_async,
+    get_restaurants_batch_async,
+    get_menu_items_batch_async,
+    COMPACT_DISH_FIELDS,
+    COMPACT_MENU_ITEM_FIELDS,
+    COMPACT_RESTAURANT_FIELDS
 )
-from src.auto_nom_agent.configs import retry_options, model,gemini_pro
+from src.utils.token_budget import fit_to_token_budget
+from src.auto_nom_agent.configs import retry_options, model, gemini_pro, tool_output_token_budget, tool_result_limit
 from google.adk.models.google_llm import Gemini
 from google.adk.agents.callback_context import CallbackContext
 
+from src.utils.agent_metrics import timed_agent_callback
 from src.utils.state import is_valid_transition
 
 
-def get_restaurant_list_tool(tool_context: ToolContext) -> dict[str, Restaurants]:
+async def get_restaurant_list_tool(tool_context: ToolContext) -> dict[str, Restaurants]:
     """
     [EXPENSIVE] Retrieves a FULL list of all restaurants.
 
@@ -35,15 +43,15 @@ def get_restaurant_list_tool(tool_context: ToolContext) -> dict[str, Restaurants
     Prefer `get_restaurants_by_cuisine` or `get_restaurants_by_tags` for efficiency.
 
     Returns:
-        Restaurants: List of all available restaurants.
+        Restaurants: List of available restaurants (compact fields, capped in size).
     """
-    restaurant_list = get_restaurant_list()
-    return {
+    restaurant_list = await get_restaurant_list_async(fields=COMPACT_RESTAURANT_FIELDS, limit=tool_result_limit)
+    return fit_to_token_budget({
         "restaurant_list": restaurant_list
-    }
+    }, "restaurant_list", tool_output_token_budget)
 
 
-def get_available_cuisines_list(tool_context: ToolContext) -> dict[str, Any]:
+async def get_available_cuisines_list(tool_context: ToolContext) -> dict[str, Any]:
     """
     [DISCOVERY] Gets the list of unique cuisines available in the area.
 
@@ -52,13 +60,13 @@ def get_available_cuisines_list(tool_context: ToolContext) -> dict[str, Any]:
     Returns:
         dict[str, Any]: List of cuisine strings (e.g., ["Italian", "Vegan", "Thai"]).
     """
-    cuisines = get_cuisines()
+    cuisines = await get_cuisines_async()
     return {
         "cuisines": cuisines
     }
 
 
-def get_restaurant_detail_tool(tool_context: ToolContext, restaurant_id: str) -> dict[str, Any]:
+async def get_restaurant_detail_tool(tool_context: ToolContext, restaurant_id: str) -> dict[str, Any]:
     """
     Gets detailed metadata for a specific restaurant ID.
 
@@ -67,13 +75,13 @@ def get_restaurant_detail_tool(tool_context: ToolContext, restaurant_id: str) ->
     Args:
         restaurant_id (str): The unique ID (e.g., "r_101").
     """
-    restaurant = get_restaurant_detail(restaurant_id)
+    restaurant = await get_restaurant_detail_async(restaurant_id, fields=COMPACT_RESTAURANT_FIELDS)
     return {
         "restaurant": restaurant
     }
 
 
-def get_restaurants_by_cuisine_tool(tool_context: ToolContext, cuisine: str) -> dict[str, Any]:
+async def get_restaurants_by_cuisine_tool(tool_context: ToolContext, cuisine: str) -> dict[str, Any]:
     """
     [EFFICIENT] Finds restaurants matching a specific cuisine.
 
@@ -82,53 +90,55 @@ def get_restaurants_by_cuisine_tool(tool_context: ToolContext, cuisine: str) ->
     Args:
         cuisine (str): The cuisine type (e.g., "Italian"). Case-insensitive.
     """
-    result = get_restaurants_by_cuisine(cuisine)
-    return result
+    result = await get_restaurants_by_cuisine_async(cuisine, fields=COMPACT_RESTAURANT_FIELDS, limit=tool_result_limit)
+    return fit_to_token_budget(result, "restaurants", tool_output_token_budget)
 
 
-def get_tags_tool(tool_context: ToolContext) -> dict[str, Any]:
+async def get_tags_tool(tool_context: ToolContext) -> dict[str, Any]:
     """
     [DISCOVERY] Gets the list of available descriptive tags (e.g., 'Late Night', 'Cozy').
     """
-    tags = get_tags()
+    tags = await get_tags_async()
     return {
         "tags": tags
     }
 
 
-def get_restaurants_by_tags_tool(tool_context: ToolContext, tags: list[str]) -> dict[str, Any]:
+async def get_restaurants_by_tags_tool(tool_context: ToolContext, tags: list[str]) -> dict[str, Any]:
     """
     [EFFICIENT] Finds restaurants that match ALL provided tags.
 
     Args:
         tags (list[str]): List of tags. Example: ["Vegan", "Outdoor Seating"]
     """
-    result = get_restaurants_by_tags(tags)
-    return result
+    result = await get_restaurants_by_tags_async(tags, fields=COMPACT_RESTAURANT_FIELDS, limit=tool_result_limit)
+    return fit_to_token_budget(result, "restaurants", tool_output_token_budget)
 
 
-def get_menu_items_tool(tool_context: ToolContext, restaurant_id: Optional[str] = None) -> dict[str, Any]:
+async def get_menu_items_tool(tool_context: ToolContext, restaurant_id: Optional[str] = None) -> dict[str, Any]:
     """
     Retrieves the full menu. 
 
     If `restaurant_id` is provided, returns menu for that specific place.
-    If None, returns menus for ALL restaurants (Warning: Large output).
+    If None, returns menus for ALL restaurants (Warning: Large output, truncated).
+    Each item has id, name, price, calories and dietary_tags.
     """
-    result = get_menu_items(restaurant_id)
-    return result
+    limit = None if restaurant_id else tool_result_limit
+    result = await get_menu_items_async(restaurant_id, fields=COMPACT_MENU_ITEM_FIELDS, limit=limit)
+    return fit_to_token_budget(result, "menu_items", tool_output_token_budget)
 
 
-def get_dietary_tags_tool(tool_context: ToolContext) -> dict[str, Any]:
+async def get_dietary_tags_tool(tool_context: ToolContext) -> dict[str, Any]:
     """
     [DISCOVERY] Gets available dietary restrictions tags (e.g., 'Gluten-Free', 'Nut-Free').
     """
-    dietary_tags = get_dietary_tags()
+    dietary_tags = await get_dietary_tags_async()
     return {
         "dietary_tags": dietary_tags
     }
 
 
-def get_menu_items_by_dietary_tags_tool(tool_context: ToolContext, tags: list[str]) -> dict[str, Any]:
+async def get_menu_items_by_dietary_tags_tool(tool_context: ToolContext, tags: list[str]) -> dict[str, Any]:
     """
     [SEARCH] Finds specific menu items across ALL restaurants that match dietary needs.
 
@@ -137,8 +147,75 @@ def get_menu_items_by_dietary_tags_tool(tool_context: ToolContext, tags: list[st
     Args:
         tags (list[str]): Dietary tags. Example: ["Gluten-Free", "Vegan"]
     """
-    result = get_menu_items_by_dietary_tags(tags)
-    return result
+    result = await get_menu_items_by_dietary_tags_async(tags, fields=COMPACT_MENU_ITEM_FIELDS, limit=tool_result_limit)
+    return fit_to_token_budget(result, "menu_items", tool_output_token_budget)
+
+
+async def get_restaurant_details_batch_tool(tool_context: ToolContext, restaurant_ids: list[str]) -> dict[str, Any]:
+    """
+    [EFFICIENT] Gets detailed metadata for SEVERAL restaurant IDs in one call.
+
+    Use this instead of calling `get_restaurant_detail_tool` once per candidate.
+
+    Args:
+        restaurant_ids (list[str]): Restaurant IDs (e.g., ["r_101", "r_102"]). Unknown IDs are listed in `missing`.
+    """
+    result = await get_restaurants_batch_async(restaurant_ids, fields=COMPACT_RESTAURANT_FIELDS)
+    return fit_to_token_budget(result, "restaurants", tool_output_token_budget)
+
+
+async def get_menu_items_batch_tool(tool_context: ToolContext, restaurant_ids: list[str]) -> dict[str, Any]:
+    """
+    [EFFICIENT] Retrieves the menus of SEVERAL restaurants in one call.
+
+    Use this to validate all candidates at once instead of calling `get_menu_items_tool` per restaurant.
+    Each item has id, name, price, calories, dietary_tags and its restaurant_id.
+
+    Args:
+        restaurant_ids (list[str]): Restaurant IDs (e.g., ["r_101", "r_102"]). Unknown IDs are listed in `missing`.
+    """
+    result = await get_menu_items_batch_async(restaurant_ids, fields=COMPACT_MENU_ITEM_FIELDS)
+    return fit_to_token_budget(result, "menu_items", tool_output_token_budget)
+
+
+async def search_dishes_tool(tool_context: ToolContext,
+                             cuisine: Optional[str] = None,
+                             tags: Optional[list[str]] = None,
+                             dietary_tags: Optional[list[str]] = None,
+                             exclude_dietary_tags: Optional[list[str]] = None,
+                             min_rating: Optional[float] = None,
+                             max_price: Optional[float] = None,
+                             min_calories: Optional[int] = None,
+                             max_calories: Optional[int] = None,
+                             max_delivery_time: Optional[int] = None) -> dict[str, Any]:
+    """
+    [PREFERRED] Finds dishes matching ALL given constraints in a single call, ranked best first.
+
+    Combine the user's cuisine, lifestyle, diet, allergy, budget and calorie constraints here
+    instead of chaining the cuisine/tag/menu tools. Every argument is optional; leave out
+    constraints that do not apply.
+
+    Args:
+        cuisine (str): Cuisine type (e.g., "Thai"). Case-insensitive.
+        tags (list[str]): Restaurant tags that must ALL apply (e.g., ["Late Night"]).
+        dietary_tags (list[str]): Dietary tags every dish must have (e.g., ["Vegan", "Gluten-Free"]).
+        exclude_dietary_tags (list[str]): Dietary tags no dish may have, e.g. allergies (["Contains-Nuts"]).
+        min_rating (float): Minimum restaurant rating (0-5).
+        max_price (float): Maximum dish price.
+        min_calories (int): Minimum calories per dish.
+        max_calories (int): Maximum calories per dish.
+        max_delivery_time (int): Maximum delivery time in minutes.
+
+    Returns:
+        dict: `dishes` with id, name, price, calories, dietary_tags, restaurant_id, restaurant_name,
+        cuisine, rating and delivery_time_min, plus `total` matches.
+    """
+    result = await search_dishes_async(
+        fields=COMPACT_DISH_FIELDS, limit=tool_result_limit,
+        cuisine=cuisine, tags=tags, dietary_tags=dietary_tags, exclude_dietary_tags=exclude_dietary_tags,
+        min_rating=min_rating, max_price=max_price, min_calories=min_calories, max_calories=max_calories,
+        max_delivery_time=max_delivery_time)
+    return fit_to_token_budget(result, "dishes", tool_output_token_budget)
 
 
 restaurant_scout_agent = LlmAgent(
@@ -177,6 +254,9 @@ restaurant_scout_agent = LlmAgent(
     **AVAILABLE TOOLS & USE CASES:**
     You have access to the following tools. Use them strategically to narrow down options efficiently.
 
+    0. **`search_dishes_tool(cuisine, tags, dietary_tags, exclude_dietary_tags, min_rating, max_price, min_calories, max_calories, max_delivery_time)`**:
+       - *Use Case:* [PREFERRED] Apply ALL of the user's constraints at once (diet, allergies as exclusions, budget, calories, delivery time) and get ranked, already-compliant dishes in a single call.
+
     1. **`get_available_cuisines_list`**:
        - *Use Case:* Call this FIRST to see what categories (Italian, Thai, Vegan, etc.) exist in the area.
     
@@ -198,18 +278,22 @@ restaurant_scout_agent = LlmAgent(
     7. **`get_restaurant_detail_tool(restaurant_id)`**:
        - *Use Case:* Final verification of a restaurant's rating or details before adding it to your final list.
 
-    8. **`get_restaurant_list_tool`**:
+    8. **`get_menu_items_batch_tool(restaurant_ids)`** / **`get_restaurant_details_batch_tool(restaurant_ids)`**:
+       - *Use Case:* Validate or verify ALL candidates in one call instead of calling the single-restaurant tools repeatedly.
+
+    9. **`get_restaurant_list_tool`**:
        - *Use Case:* [EXPENSIVE] Use only as a last resort if targeted searches fail. Returns a large, unfiltered list.
 
     **EXECUTION ALGORITHM:**
     Follow these steps in order. Do not skip steps.
 
-    1. **Broad Search:** - Start by identifying relevant cuisines or tags based on user preferences.
-       - Use the targeted search tools (Cuisine/Tags) to get a candidate list.
+    1. **Combined Search:** - Translate the user's preferences, allergies, budget and calorie goals into `search_dishes_tool` filters.
+       - Call it once (or a few times with different cuisines for variety) to get ranked, compliant dishes.
+       - Fall back to the targeted search tools (Cuisine/Tags) only if the combined search returns too few results.
 
     2. **Filter & Verify:**
        - From your candidate list, select potential restaurants.
-       - Use `get_menu_items_tool` to ensure the restaurant serves a meal that strictly matches **Allergies** and **Dietary Preferences**.
+       - Dishes from `search_dishes_tool` already satisfy the filters you passed; use `get_menu_items_batch_tool` (one call for all candidates) only for candidates found through the other tools, to ensure the restaurant serves a meal that strictly matches **Allergies** and **Dietary Preferences**.
        - *Constraint:* Do not suggest a restaurant if you cannot find at least one compliant meal item.
 
     3. **Selection:**
@@ -254,6 +338,9 @@ restaurant_scout_agent = LlmAgent(
             get_restaurants_by_tags_tool),
         FunctionTool(get_menu_items_tool), FunctionTool(get_dietary_tags_tool),
         FunctionTool(get_menu_items_by_dietary_tags_tool),
+        FunctionTool(search_dishes_tool),
+        FunctionTool(get_restaurant_details_batch_tool),
+        FunctionTool(get_menu_items_batch_tool),
         FunctionTool(get_current_day_of_week)
     ],
 )
@@ -276,6 +363,7 @@ def update_meal_options(options: MealOptions, tool_context: ToolContext) -> dict
     }
 
 
+@timed_agent_callback("MealPlanner", "before_agent")
 def on_before_meal_planner_agent_call(callback_context: CallbackContext) -> None:
     current_state = callback_context.state["workflow_status"]
     new_state = "MEAL_PLANNING_STARTED"
@@ -286,6 +374,7 @@ def on_before_meal_planner_agent_call(callback_context: CallbackContext) -> None
     return None
 
 
+@timed_agent_callback("MealPlanner", "after_agent")
 def on_after_meal_planner_agent_call(callback_context: CallbackContext) -> None:
     current_state = callback_context.state["workflow_status"]
     new_state = "MEAL_PLANNING_COMPLETE"
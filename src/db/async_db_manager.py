@@ -0,0 +1,123 @@
+"""
+Async wrappers around db_manager.
+
+SQLite calls are blocking, so every helper here runs the matching db_manager
+function on a dedicated DB thread pool. Awaiting these from FastAPI handlers
+keeps the event loop (and every open SSE stream) free while a query runs.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from src.db import db_manager
+from src.schema.users import Session, UserProfile
+
+T = TypeVar("T")
+
+# One worker per pooled connection; more workers would only wait on the pool
+_executor = ThreadPoolExecutor(max_workers=db_manager.DB_POOL_SIZE, thread_name_prefix="autonom-db")
+
+
+async def run_in_db_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Runs a blocking db_manager function on the DB thread pool, in the caller's context (so DB spans nest under it)."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+def shutdown() -> None:
+    """Stops the DB thread pool. Call on application shutdown, before closing the pool."""
+    _executor.shutdown(wait=True)
+
+
+# --- User Helpers ---
+
+
+async def upsert_user(user_profile: UserProfile) -> None:
+    return await run_in_db_thread(db_manager.upsert_user, user_profile)
+
+
+async def get_all_users() -> List[UserProfile]:
+    return await run_in_db_thread(db_manager.get_all_users)
+
+
+async def get_user(user_id: str) -> Optional[UserProfile]:
+    return await run_in_db_thread(db_manager.get_user, user_id)
+
+
+# --- Session Helpers ---
+
+
+async def create_session(app_name: str, user_id: str, session_id: str, state: Dict[str, Any]) -> Session:
+    return await run_in_db_thread(db_manager.create_session, app_name, user_id, session_id, state)
+
+
+async def update_session_state(app_name: str, user_id: str, session_id: str, state: Dict[str, Any]) -> Optional[Session]:
+    return await run_in_db_thread(db_manager.update_session_state, app_name, user_id, session_id, state)
+
+
+async def get_session(app_name: str, user_id: str, session_id: str) -> Optional[Session]:
+    return await run_in_db_thread(db_manager.get_session, app_name, user_id, session_id)
+
+
+async def get_session_by_id(session_id: str) -> Optional[Session]:
+    return await run_in_db_thread(db_manager.get_session_by_id, session_id)
+
+
+async def get_active_session_by_id(session_id: str) -> Optional[Session]:
+    return await run_in_db_thread(db_manager.get_active_session_by_id, session_id)
+
+
+async def get_user_sessions(app_name: str, user_id: str) -> List[Session]:
+    return await run_in_db_thread(db_manager.get_user_sessions, app_name, user_id)
+
+
+async def get_user_sessions_page(app_name: str, user_id: str, limit: int, after: Optional[Tuple[str, str]] = None,
+                                 state_keys: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+    return await run_in_db_thread(db_manager.get_user_sessions_page, app_name, user_id, limit, after, state_keys)
+
+
+async def get_active_user_sessions(app_name: str, user_id: str) -> List[Session]:
+    return await run_in_db_thread(db_manager.get_active_user_sessions, app_name, user_id)
+
+
+async def get_active_user_session_ids(app_name: str, user_id: str) -> List[str]:
+    return await run_in_db_thread(db_manager.get_active_user_session_ids, app_name, user_id)
+
+
+async def get_session_state_values(session_id: str, keys: List[str]) -> Optional[Dict[str, Any]]:
+    return await run_in_db_thread(db_manager.get_session_state_values, session_id, keys)
+
+
+async def get_session_state_val(session_id: str, key: str) -> Optional[Any]:
+    return await run_in_db_thread(db_manager.get_session_state_val, session_id, key)
+
+
+async def delete_session(app_name: str, user_id: str, session_id: str) -> bool:
+    return await run_in_db_thread(db_manager.delete_session, app_name, user_id, session_id)
+
+
+async def delete_all_sessions() -> int:
+    return await run_in_db_thread(db_manager.delete_all_sessions)
+
+
+# --- LLM Usage Helpers ---
+
+
+async def record_llm_usage(rows: List[Dict[str, Any]]) -> None:
+    return await run_in_db_thread(db_manager.record_llm_usage, rows)
+
+
+async def get_session_llm_usage(session_id: str) -> Optional[Dict[str, Any]]:
+    return await run_in_db_thread(db_manager.get_session_llm_usage, session_id)
+
+
+async def get_user_llm_usage(user_id: str) -> Dict[str, Any]:
+    return await run_in_db_thread(db_manager.get_user_llm_usage, user_id)
+
+
+async def get_agent_llm_usage() -> List[Dict[str, Any]]:
+    return await run_in_db_thread(db_manager.get_agent_llm_usage)
@@ -1,21 +1,69 @@
+import functools
+import os
 import sqlite3
 import json
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 from datetime import datetime
 from utils.logger import ServiceLogger
+from utils.metrics import counter, gauge, histogram, timed
 from src.schema.users import UserProfile, Session
+from src.db.connection_pool import SQLiteConnectionPool
+from src.utils.tracing import tracer
+
+# Sessions in these workflow states are finished; everything else is active
+INACTIVE_WORKFLOW_STATUSES = ("ORDER_CONFIRMED", "NO_PLANNING_NEEDED")
+# SQL filter on the generated workflow_status column (missing status counts as active)
+ACTIVE_SESSION_FILTER = "(workflow_status IS NULL OR workflow_status NOT IN (?, ?))"
 
 CURRENT_DIR = Path(__file__).parent
 DB_PATH = CURRENT_DIR / "data/autonom.db"
+DB_POOL_SIZE = int(os.environ.get("AUTONOM_DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.environ.get("AUTONOM_DB_POOL_TIMEOUT", "30"))
+
+# Shared pool; connections are opened lazily and configured once (WAL, synchronous, mmap, ...)
+_pool = SQLiteConnectionPool(DB_PATH, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+
+DB_CALL_SECONDS = histogram("autonom_db_call_duration_seconds",
+                            "Duration of db_manager helpers, including pool checkout", ["operation"])
+DB_CALL_ERRORS = counter("autonom_db_call_errors_total", "db_manager helper calls that raised", ["operation"])
+gauge("autonom_db_pool_in_use_connections", "Pooled SQLite connections currently checked out",
+      callback=lambda: _pool.metrics()["in_use"])
+gauge("autonom_db_pool_wait_seconds_total", "Total time spent waiting for a pooled connection",
+      callback=lambda: _pool.metrics()["total_wait_ms"] / 1000)
+
+
+def _db_timed(func):
+    """Times a db_manager helper into DB_CALL_SECONDS, labelled with its name, and traces it as `db <name>`."""
+    timed_func = timed(DB_CALL_SECONDS, DB_CALL_ERRORS, name_label="operation")(func)
 
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(f"db {func.__name__}", attributes={
+                "db.system": "sqlite", "db.operation": func.__name__}):
+            return timed_func(*args, **kwargs)
+    return wrapper
+
+
+def get_connection() -> AbstractContextManager[sqlite3.Connection]:
+    """
+    Checks out a pooled connection for the duration of a `with` block.
+    The transaction is committed on success and rolled back on error.
+    """
+    return _pool.connection()
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Returns checkout, wait time and open connection metrics for the pool."""
+    return _pool.metrics()
+
+
+def close_pool() -> None:
+    """Closes all pooled connections. Call on application shutdown."""
+    _pool.close()
+    ServiceLogger.log_info("Database connection pool closed", "DB", **_pool.metrics())
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    # Enable Write-Ahead Logging. faster, and allows concurrent read/write.
-    conn.execute("PRAGMA journal_mode=WAL;")
-    return conn
 
 def get_db_path():
     return DB_PATH
@@ -80,6 +128,24 @@ def init_db(preload_test_users: bool = False) -> None:
             PRIMARY KEY (app_name, user_id, id)
         );
         """)
+        # Migration: generated workflow_status column so active-session queries
+        # can filter in SQL instead of parsing every state blob in Python
+        try:
+            conn.execute("""
+            ALTER TABLE sessions ADD COLUMN workflow_status TEXT
+            GENERATED ALWAYS AS (json_extract(state, '$.workflow_status')) VIRTUAL
+            """)
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sessions_user_workflow_status
+        ON sessions (app_name, user_id, workflow_status, update_time);
+        """)
+        # Keyset pagination index for session history (newest first)
+        conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sessions_user_update_time
+        ON sessions (app_name, user_id, update_time, id);
+        """)
         # Orders Table
         conn.execute("""
         CREATE TABLE IF NOT EXISTS orders (
@@ -89,13 +155,39 @@ def init_db(preload_test_users: bool = False) -> None:
             status TEXT
         );
         """)
+        # LLM Usage Table - one row per model response, for token / cost accounting
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS llm_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            invocation_id TEXT,
+            agent TEXT NOT NULL,
+            model TEXT NOT NULL,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            cached_tokens INTEGER NOT NULL DEFAULT 0,
+            output_tokens INTEGER NOT NULL DEFAULT 0,
+            thoughts_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            cost_usd REAL NOT NULL DEFAULT 0,
+            created_at TIMESTAMP NOT NULL
+        );
+        """)
+        conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_llm_usage_session
+        ON llm_usage (session_id, agent);
+        """)
+        conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_llm_usage_user
+        ON llm_usage (user_id, session_id);
+        """)
         
         ServiceLogger.log_panel(
             "💾 Database Setup",
             "[green]Database initialized successfully[/green]",
             "green",
             location=str(DB_PATH),
-            tables="users, orders"
+            tables="users, orders, llm_usage"
         )
         
     # Preload test users if requested
@@ -109,6 +201,7 @@ def init_db(preload_test_users: bool = False) -> None:
 # --- User Helpers ---
 
 
+@_db_timed
 def upsert_user(user_profile: UserProfile) -> None:
     """
     Creates or updates a user profile using UserProfile Pydantic model.
@@ -158,6 +251,7 @@ def upsert_user_legacy(user_id: str, name: str, preferences: Any, allergies: Any
     upsert_user(user_profile)
 
 
+@_db_timed
 def get_all_users() -> List[UserProfile]:
     try:
         with get_connection() as conn:
@@ -195,6 +289,7 @@ def get_all_users() -> List[UserProfile]:
         ServiceLogger.log_error("Database error retrieving users", "DB", error=e)
         raise
     
+@_db_timed
 def get_user(user_id: str) -> Optional[UserProfile]:
     try:
         with get_connection() as conn:
@@ -232,6 +327,45 @@ def get_user(user_id: str) -> Optional[UserProfile]:
 # --- Session Helpers ---
 
 
+def _state_key_path(key: str) -> str:
+    """Builds a JSON path for a top-level state key. Quoted so keys containing '.' or '[' are not parsed as paths."""
+    return f'$."{key}"'
+
+
+def _decode_state_value(value: Any, json_type: Optional[str]) -> Any:
+    """Converts a json_extract() result back to the Python value stored in the state."""
+    if json_type in ("object", "array"):
+        return json.loads(value)
+    if json_type == "true":
+        return True
+    if json_type == "false":
+        return False
+    # null, integer, real and text are returned as native SQLite values
+    return value
+
+
+def _state_projection(keys: List[str]) -> Tuple[str, List[Any]]:
+    """Builds the SELECT list and parameters that project the given state keys with json_extract."""
+    columns: List[str] = []
+    params: List[Any] = []
+    for key in keys:
+        columns.append("json_extract(state, ?), json_type(state, ?)")
+        params.extend([_state_key_path(key), _state_key_path(key)])
+    return ", ".join(columns), params
+
+
+def _read_state_projection(row: sqlite3.Row, offset: int, keys: List[str]) -> Dict[str, Any]:
+    """Decodes projected state columns starting at `offset`. Keys missing from state are omitted."""
+    values: Dict[str, Any] = {}
+    for index, key in enumerate(keys):
+        value, json_type = row[offset + 2 * index], row[offset + 2 * index + 1]
+        # json_type is NULL when the key does not exist in state
+        if json_type is not None:
+            values[key] = _decode_state_value(value, json_type)
+    return values
+
+
+@_db_timed
 def create_session(app_name: str, user_id: str, session_id: str, state: Dict[str, Any]) -> Session:
     """
     Creates a new session with the given app_name, user_id, session_id and state.
@@ -260,6 +394,7 @@ def create_session(app_name: str, user_id: str, session_id: str, state: Dict[str
         raise
 
 
+@_db_timed
 def update_session_state(app_name: str, user_id: str, session_id: str, state: Dict[str, Any]) -> Optional[Session]:
     """
     Updates the state of an existing session.
@@ -288,6 +423,7 @@ def update_session_state(app_name: str, user_id: str, session_id: str, state: Di
         raise
 
 
+@_db_timed
 def get_session(app_name: str, user_id: str, session_id: str) -> Optional[Session]:
     """
     Retrieves a session by app_name, user_id, and session_id.
@@ -318,6 +454,7 @@ def get_session(app_name: str, user_id: str, session_id: str) -> Optional[Sessio
         raise
 
 
+@_db_timed
 def get_session_by_id(session_id: str) -> Optional[Session]:
     """
     Retrieves a session using just the session ID.
@@ -349,6 +486,7 @@ def get_session_by_id(session_id: str) -> Optional[Session]:
         raise
 
 
+@_db_timed
 def get_active_session_by_id(session_id: str) -> Optional[Session]:
     """
     Retrieves an active session using just the session ID.
@@ -358,31 +496,29 @@ def get_active_session_by_id(session_id: str) -> Optional[Session]:
     try:
         with get_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM sessions WHERE id = ? LIMIT 1", 
-                (session_id,)
+                f"SELECT * FROM sessions WHERE id = ? AND {ACTIVE_SESSION_FILTER} LIMIT 1", 
+                (session_id, *INACTIVE_WORKFLOW_STATUSES)
             ).fetchone()
             if row:
                 session_data = dict(row)
                 # Parse the JSON state back to a dictionary
                 state: Dict[str, Any] = json.loads(session_data['state']) if session_data['state'] else {}
                 
-                # Check if session is active
-                workflow_status = state.get('workflow_status', '')
-                if workflow_status != 'ORDER_CONFIRMED' and workflow_status != 'NO_PLANNING_NEEDED':
-                    return Session(
-                        app_name=session_data['app_name'],
-                        user_id=session_data['user_id'],
-                        id=session_data['id'],
-                        state=state,
-                        create_time=datetime.fromisoformat(session_data['create_time']),
-                        update_time=datetime.fromisoformat(session_data['update_time'])
-                    )
+                return Session(
+                    app_name=session_data['app_name'],
+                    user_id=session_data['user_id'],
+                    id=session_data['id'],
+                    state=state,
+                    create_time=datetime.fromisoformat(session_data['create_time']),
+                    update_time=datetime.fromisoformat(session_data['update_time'])
+                )
             return None
     except Exception as e:
         ServiceLogger.log_error("Database error retrieving active session", "DB", error=e)
         raise
 
 
+@_db_timed
 def get_user_sessions(app_name: str, user_id: str) -> List[Session]:
     """
     Retrieves all sessions for a specific app_name and user_id.
@@ -415,17 +551,73 @@ def get_user_sessions(app_name: str, user_id: str) -> List[Session]:
         raise
 
 
+@_db_timed
+def get_user_sessions_page(app_name: str, user_id: str, limit: int, after: Optional[Tuple[str, str]] = None,
+                           state_keys: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+    """
+    Retrieves one page of sessions for app_name and user_id, newest first.
+    Uses keyset pagination on (update_time, id): pass the `next_after` value returned by the
+    previous page as `after` to continue.
+    If `state_keys` is given only those keys are projected out of the state with json_extract,
+    otherwise the full state is returned.
+    Returns (rows, next_after) where each row has id, create_time, update_time and state,
+    and next_after is None on the last page.
+    """
+    try:
+        if state_keys is None:
+            select_list = "id, create_time, update_time, state"
+            params: List[Any] = []
+        else:
+            projection, params = _state_projection(state_keys)
+            select_list = "id, create_time, update_time" + (f", {projection}" if projection else "")
+
+        where = "app_name = ? AND user_id = ?"
+        params.extend([app_name, user_id])
+        if after is not None:
+            where += " AND (update_time, id) < (?, ?)"
+            params.extend(after)
+
+        with get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {select_list} FROM sessions WHERE {where} ORDER BY update_time DESC, id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        page: List[Dict[str, Any]] = []
+        for row in rows[:limit]:
+            if state_keys is None:
+                state: Dict[str, Any] = json.loads(row['state']) if row['state'] else {}
+            else:
+                state = _read_state_projection(row, 3, state_keys)
+            page.append({
+                "id": row['id'],
+                "create_time": datetime.fromisoformat(row['create_time']),
+                "update_time": datetime.fromisoformat(row['update_time']),
+                "state": state
+            })
+
+        next_after: Optional[Tuple[str, str]] = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_after = (last['update_time'], last['id'])
+        return page, next_after
+    except Exception as e:
+        ServiceLogger.log_error("Database error retrieving sessions page", "DB", error=e)
+        raise
+
+
+@_db_timed
 def get_active_user_sessions(app_name: str, user_id: str) -> List[Session]:
     """
     Retrieves all active sessions for a specific app_name and user_id.
-    An active session is one where state.workflow_status is not 'ORDER_CONFIRMED'.
+    An active session is one where state.workflow_status is not 'ORDER_CONFIRMED' or 'NO_PLANNING_NEEDED'.
     Returns a list of Session objects.
     """
     try:
         with get_connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM sessions WHERE app_name = ? AND user_id = ? ORDER BY update_time DESC", 
-                (app_name, user_id)
+                f"SELECT * FROM sessions WHERE app_name = ? AND user_id = ? AND {ACTIVE_SESSION_FILTER} ORDER BY update_time DESC", 
+                (app_name, user_id, *INACTIVE_WORKFLOW_STATUSES)
             ).fetchall()
             active_sessions: List[Session] = []
             for row in rows:
@@ -433,46 +625,76 @@ def get_active_user_sessions(app_name: str, user_id: str) -> List[Session]:
                 # Parse the JSON state back to a dictionary
                 state: Dict[str, Any] = json.loads(session_data['state']) if session_data['state'] else {}
                 
-                # Check if session is active (workflow_status is not ORDER_CONFIRMED)
-                workflow_status = state.get('workflow_status', '')
-                if workflow_status != 'ORDER_CONFIRMED' and workflow_status != 'NO_PLANNING_NEEDED':
-                    session = Session(
-                        app_name=session_data['app_name'],
-                        user_id=session_data['user_id'],
-                        id=session_data['id'],
-                        state=state,
-                        create_time=datetime.fromisoformat(session_data['create_time']),
-                        update_time=datetime.fromisoformat(session_data['update_time'])
-                    )
-                    active_sessions.append(session)
+                session = Session(
+                    app_name=session_data['app_name'],
+                    user_id=session_data['user_id'],
+                    id=session_data['id'],
+                    state=state,
+                    create_time=datetime.fromisoformat(session_data['create_time']),
+                    update_time=datetime.fromisoformat(session_data['update_time'])
+                )
+                active_sessions.append(session)
             return active_sessions
     except Exception as e:
         ServiceLogger.log_error("Database error retrieving users", "DB", error=e)
         raise
 
 
-def get_session_state_val(session_id: str, key: str) -> Optional[Any]:
+@_db_timed
+def get_active_user_session_ids(app_name: str, user_id: str) -> List[str]:
     """
-    Retrieves a specific state value from a session using session_id and key.
-    Returns None if session not found or key doesn't exist in state.
+    Retrieves the IDs of all active sessions for a specific app_name and user_id.
+    Answered from the indexed workflow_status column without loading any state.
     """
     try:
+        with get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT id FROM sessions WHERE app_name = ? AND user_id = ? AND {ACTIVE_SESSION_FILTER} ORDER BY update_time DESC", 
+                (app_name, user_id, *INACTIVE_WORKFLOW_STATUSES)
+            ).fetchall()
+            return [row['id'] for row in rows]
+    except Exception as e:
+        ServiceLogger.log_error("Database error retrieving active session ids", "DB", error=e)
+        raise
+
+
+@_db_timed
+def get_session_state_values(session_id: str, keys: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves several state values from a session in one query.
+    The lookup is pushed into SQLite with json_extract, so only the requested keys are
+    decoded regardless of how large the state blob is.
+    Returns None if session not found, otherwise a dict containing only the keys present in state.
+    """
+    try:
+        projection, params = _state_projection(keys)
+
         with get_connection() as conn:
             row = conn.execute(
-                "SELECT state FROM sessions WHERE id = ? LIMIT 1", 
-                (session_id,)
+                f"SELECT 1, {projection} FROM sessions WHERE id = ? LIMIT 1" if keys else
+                "SELECT 1 FROM sessions WHERE id = ? LIMIT 1", 
+                (*params, session_id)
             ).fetchone()
-            if row:
-                state_json = row['state']
-                if state_json:
-                    state = json.loads(state_json)
-                    return state.get(key)
-            return None
+            if row is None:
+                return None
+            return _read_state_projection(row, 1, keys)
     except Exception as e:
         ServiceLogger.log_error("Database error retrieving session state", "DB", error=e)
         raise
 
 
+def get_session_state_val(session_id: str, key: str) -> Optional[Any]:
+    """
+    Retrieves a specific state value from a session using session_id and key.
+    Returns None if session not found or key doesn't exist in state.
+    """
+    values = get_session_state_values(session_id, [key])
+    if values:
+        return values.get(key)
+    return None
+
+
+@_db_timed
 def delete_session(app_name: str, user_id: str, session_id: str) -> bool:
     """
     Deletes a session by app_name, user_id, and session_id.
@@ -484,12 +706,15 @@ def delete_session(app_name: str, user_id: str, session_id: str) -> bool:
                 "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", 
                 (app_name, user_id, session_id)
             )
+            if cursor.rowcount > 0:
+                conn.execute("DELETE FROM llm_usage WHERE session_id = ?", (session_id,))
             return cursor.rowcount > 0
     except Exception as e:
         ServiceLogger.log_error(f"Database error deleting session {session_id[:8]}...", "DB", error=e)
         raise
 
 
+@_db_timed
 def delete_all_sessions() -> int:
     """
     Deletes all sessions from the sessions table.
@@ -499,6 +724,7 @@ def delete_all_sessions() -> int:
         with get_connection() as conn:
             cursor = conn.execute("DELETE FROM sessions")
             deleted_count = cursor.rowcount
+            conn.execute("DELETE FROM llm_usage")
             ServiceLogger.log_success(f"Deleted {deleted_count} sessions from database", "DB")
             return deleted_count
     except Exception as e:
@@ -506,5 +732,105 @@ def delete_all_sessions() -> int:
         raise
 
 
+
+# --- LLM Usage Helpers ---
+
+LLM_USAGE_COLUMNS = ("session_id", "user_id", "invocation_id", "agent", "model", "prompt_tokens", "cached_tokens",
+                     "output_tokens", "thoughts_tokens", "total_tokens", "cost_usd", "created_at")
+
+# Aggregates shared by every usage breakdown
+_LLM_USAGE_TOTALS = """
+    COUNT(*) AS calls,
+    COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens,
+    COALESCE(SUM(cached_tokens), 0) AS cached_tokens,
+    COALESCE(SUM(output_tokens), 0) AS output_tokens,
+    COALESCE(SUM(thoughts_tokens), 0) AS thoughts_tokens,
+    COALESCE(SUM(total_tokens), 0) AS total_tokens,
+    ROUND(COALESCE(SUM(cost_usd), 0), 6) AS cost_usd,
+    CAST(ROUND(COALESCE(AVG(prompt_tokens), 0)) AS INTEGER) AS avg_prompt_tokens,
+    COALESCE(MAX(prompt_tokens), 0) AS max_prompt_tokens
+"""
+
+
+def _llm_usage_breakdown(conn: sqlite3.Connection, where: str, params: Tuple[Any, ...],
+                         group_by: Optional[str] = None) -> List[Dict[str, Any]]:
+    if group_by is None:
+        rows = conn.execute(f"SELECT {_LLM_USAGE_TOTALS} FROM llm_usage WHERE {where}", params).fetchall()
+    else:
+        rows = conn.execute(
+            f"SELECT {group_by}, {_LLM_USAGE_TOTALS} FROM llm_usage WHERE {where} "
+            f"GROUP BY {group_by} ORDER BY SUM(total_tokens) DESC",
+            params
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+@_db_timed
+def record_llm_usage(rows: List[Dict[str, Any]]) -> None:
+    """
+    Inserts one llm_usage row per model response, in a single transaction.
+    """
+    try:
+        with get_connection() as conn:
+            conn.executemany(
+                f"INSERT INTO llm_usage ({', '.join(LLM_USAGE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in LLM_USAGE_COLUMNS)})",
+                [tuple(row.get(column) for column in LLM_USAGE_COLUMNS) for row in rows]
+            )
+    except Exception as e:
+        ServiceLogger.log_error("Database error recording LLM usage", "DB", error=e)
+        raise
+
+
+@_db_timed
+def get_session_llm_usage(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Token and cost totals for a session, overall and per agent / model.
+    Returns None if no model usage was recorded for the session.
+    """
+    try:
+        with get_connection() as conn:
+            totals = _llm_usage_breakdown(conn, "session_id = ?", (session_id,))[0]
+            if totals["calls"] == 0:
+                return None
+            return {
+                "totals": totals,
+                "by_agent": _llm_usage_breakdown(conn, "session_id = ?", (session_id,), "agent, model"),
+            }
+    except Exception as e:
+        ServiceLogger.log_error("Database error retrieving session LLM usage", "DB", error=e)
+        raise
+
+
+@_db_timed
+def get_user_llm_usage(user_id: str) -> Dict[str, Any]:
+    """
+    Token and cost totals across all of a user's sessions, overall, per agent / model and per session.
+    """
+    try:
+        with get_connection() as conn:
+            return {
+                "totals": _llm_usage_breakdown(conn, "user_id = ?", (user_id,))[0],
+                "by_agent": _llm_usage_breakdown(conn, "user_id = ?", (user_id,), "agent, model"),
+                "by_session": _llm_usage_breakdown(conn, "user_id = ?", (user_id,), "session_id"),
+            }
+    except Exception as e:
+        ServiceLogger.log_error("Database error retrieving user LLM usage", "DB", error=e)
+        raise
+
+
+@_db_timed
+def get_agent_llm_usage() -> List[Dict[str, Any]]:
+    """
+    Token and cost totals per agent / model across all sessions, largest consumers first.
+    """
+    try:
+        with get_connection() as conn:
+            return _llm_usage_breakdown(conn, "1 = 1", (), "agent, model")
+    except Exception as e:
+        ServiceLogger.log_error("Database error retrieving agent LLM usage", "DB", error=e)
+        raise
+
+
 if __name__ == "__main__":
     init_db(preload_test_users=True)
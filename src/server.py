@@ -1,21 +1,40 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from typing import Any
 from datetime import datetime
 from contextlib import asynccontextmanager
 import asyncio
+import base64
+import json
+import time
 
 # Local Imports
 from src.agentic_workflows.auto_nom import AutoNom
-from src.db import db_manager
+from src.agentic_workflows.runtime import AgentRuntime
+from src.db import db_manager, async_db_manager
 from src.schema.users import ResumeRequest, UserProfile
+from src.utils.session_events import session_event_hub, user_channel, RESYNC
+from src.utils import restaurant_utils
+from src.utils.tracing import get_session_trace, setup_tracing, shutdown_tracing
 from utils.logger import ServiceLogger
-from rich.console import Console
-from rich.table import Table
-from rich import box
-
-console = Console()
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, histogram, render_prometheus
+
+# Session history pagination
+SESSION_PAGE_DEFAULT_LIMIT = 20
+SESSION_PAGE_MAX_LIMIT = 100
+# Idle interval after which the session event stream sends a keep-alive comment
+SESSION_EVENTS_KEEPALIVE_SECONDS = 15
+# Flat state keys needed to render a session history entry (`fields=summary`);
+# the verification message and choices let the history list reopen a pending approval
+SESSION_SUMMARY_STATE_KEYS = [
+    "workflow_status",
+    "planning_meal_type",
+    "verification_message",
+    "verification_choices",
+    "verification_user_choice",
+    "ordering_confirmation",
+]
 
 # Lifespan context manager
 
@@ -23,17 +42,46 @@ console = Console()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    setup_tracing()
     db_manager.init_db(preload_test_users=True)
+    # Shared ADK session service + runner cache for every AutoNom request
+    app.state.agent_runtime = AgentRuntime()
     ServiceLogger.startup_message("Auto-Nom API", port=8000)
     ServiceLogger.log_success("Database initialized successfully")
 
     yield
 
     # Shutdown
+    await app.state.agent_runtime.close()
+    await restaurant_utils.close_clients()
+    async_db_manager.shutdown()
+    db_manager.close_pool()
+    shutdown_tracing()
     ServiceLogger.shutdown_message("Auto-Nom API")
 
 app = FastAPI(title="Auto-Nom API", version="1.0.0", lifespan=lifespan)
 
+HTTP_REQUEST_SECONDS = histogram(
+    "autonom_http_request_duration_seconds",
+    "API handler latency until response headers are sent (for SSE endpoints: time to first byte)",
+    ["method", "route", "status"])
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Times every API route; static files (no matched route) are not recorded."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        if route is not None:
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                         route=route.path, status=str(status))
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="./src/static"), name="static")
 
@@ -44,6 +92,36 @@ async def root():
     ServiceLogger.health_check()
     return {"message": "Hello Auto Nom", "status": "healthy", "timestamp": datetime.now().isoformat()}
 
+
+@app.get("/api/db/pool")
+async def get_db_pool_metrics() -> dict[str, Any]:
+    """
+    Get usage metrics for the SQLite connection pool (checkouts, wait time, open connections).
+    """
+    return {
+        "pool": db_manager.get_pool_metrics(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/dashdoor/cache")
+async def get_dashdoor_cache_stats() -> dict[str, Any]:
+    """
+    Get DashDoor response cache statistics (hits, misses, coalesced fetches, size).
+    """
+    return {
+        "cache": restaurant_utils.get_cache_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Prometheus metrics: handler, DB helper, DashDoor request, runner loop and agent callback latencies.
+    """
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # --- User APIs ---
 
 
@@ -52,26 +130,16 @@ async def list_users():
     try:
         ServiceLogger.api_called_panel("GET", "/api/users")
         ServiceLogger.log_info("Fetching all users from database...", "API")
-        users = db_manager.get_all_users()
+        users = await async_db_manager.get_all_users()
         
         # Display users in a formatted table
-        table = Table(title="Users Retrieved", box=box.MINIMAL)
-        table.add_column("ID", style="cyan")
-        table.add_column("Name", style="magenta")
-        table.add_column("Preferences", style="green")
-        table.add_column("Allergies", style="red")
-        
-        for user in users:
-            preferences_str = ", ".join(user.preferences)
-            allergies_str = ", ".join(user.allergies)
-            table.add_row(
-                user.id,
-                user.name,
-                preferences_str or "None",
-                allergies_str or "None"
+        if ServiceLogger.is_enabled("INFO"):
+            ServiceLogger.log_table(
+                "Users Retrieved",
+                ["ID", "Name", "Preferences", "Allergies"],
+                [[user.id, user.name, ", ".join(user.preferences) or "None", ", ".join(user.allergies) or "None"]
+                 for user in users]
             )
-        
-        console.print(table)
         ServiceLogger.log_success(f"Successfully retrieved {len(users)} users")
         return users
     except Exception as e:
@@ -102,7 +170,7 @@ async def create_user(user: UserProfile) -> UserProfile:
             "blue"
         )
 
-        db_manager.upsert_user(user)
+        await async_db_manager.upsert_user(user)
 
         ServiceLogger.log_success(f"User '{user.name}' (ID: {user.id}) created/updated successfully!", "USER")
         # Return the full user profile instead of just a status message
@@ -135,11 +203,12 @@ async def trigger_workflow(user_id: str, meal_type: str, streaming: bool = False
         )
         # step 1: Read preferences, allergies & special_instructions from database
         ServiceLogger.log_info("Step 1: Get User Details")
-        current_user = db_manager.get_user(user_id=user_id)
+        current_user = await async_db_manager.get_user(user_id=user_id)
         if current_user:
             ServiceLogger.log_debug(
                 f"Found user: {current_user.id}",
                 "USER_DETAILS",
+                site="server.user_profile",
                 **current_user.model_dump()
             )
         else:
@@ -148,7 +217,7 @@ async def trigger_workflow(user_id: str, meal_type: str, streaming: bool = False
             raise HTTPException(status_code=404, detail="User not found")
 
         # TODO: Add a logic to save the started session from preventing multiple runs
-        auto_nom = AutoNom(current_user, meal_type=meal_type, mock_day=mock_day)
+        auto_nom = AutoNom(current_user, app.state.agent_runtime, meal_type=meal_type, mock_day=mock_day)
         user_input = f"Plan a {meal_type} for {current_user.name}"
 
         # Return based on streaming flag
@@ -194,7 +263,7 @@ async def resume_workflow(session_id: str, req: ResumeRequest, streaming: bool =
         )
         
         # step 1: Get the user_id for the given session_id
-        session = db_manager.get_session_by_id(session_id=session_id)
+        session = await async_db_manager.get_session_by_id(session_id=session_id)
         
         if not session:
             ServiceLogger.log_error(f"Cannot fine session for {session_id}", "RESUME_WORKFLOW")
@@ -203,11 +272,12 @@ async def resume_workflow(session_id: str, req: ResumeRequest, streaming: bool =
         user_id = session.user_id
         
         # step 2: Load user preferences from user id
-        current_user = db_manager.get_user(user_id=user_id)
+        current_user = await async_db_manager.get_user(user_id=user_id)
         if current_user:
             ServiceLogger.log_debug(
                 f"Found user: {current_user.id}",
                 "USER_DETAILS",
+                site="server.user_profile",
                 **current_user.model_dump()
             )
         else:
@@ -218,8 +288,8 @@ async def resume_workflow(session_id: str, req: ResumeRequest, streaming: bool =
         # step 3: trigger the agent with user input
         # TODO: Add a logic to save the started session from preventing multiple runs
         # Get mock_day from session state if it exists
-        mock_day = db_manager.get_session_state_val(session_id, "mock_day")
-        auto_nom = AutoNom(current_user, session_id=session_id, mock_day=mock_day)
+        mock_day = await async_db_manager.get_session_state_val(session_id, "mock_day")
+        auto_nom = AutoNom(current_user, app.state.agent_runtime, session_id=session_id, mock_day=mock_day)
         user_input = f"{req.choice}"
 
         # Return based on streaming flag
@@ -239,7 +309,7 @@ async def resume_workflow(session_id: str, req: ResumeRequest, streaming: bool =
             asyncio.create_task(run_workflow())
             
             # Get current workflow status
-            workflow_status = db_manager.get_session_state_val(session_id, "workflow_status")
+            workflow_status = await async_db_manager.get_session_state_val(session_id, "workflow_status")
             
             # Return immediately with session info
             return {
@@ -313,6 +383,55 @@ def transform_state_to_client_format(flat_state: dict[str, Any]) -> dict[str, An
     return client_state
 
 
+def encode_session_cursor(after: tuple[str, str]) -> str:
+    """Encodes a (update_time, session_id) keyset position as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(after)).encode()).decode()
+
+
+def decode_session_cursor(cursor: str) -> tuple[str, str]:
+    """Decodes a cursor produced by encode_session_cursor. Raises ValueError if malformed."""
+    try:
+        update_time, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(update_time), str(session_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_session_fields(fields: str | None) -> tuple[set[str], list[str] | None]:
+    """
+    Parses the `fields` projection for the session history API.
+    Returns the top-level fields to include and the flat state keys to project
+    (None means the full state).
+    """
+    if not fields:
+        return {"state", "create_time", "update_time"}, None
+
+    include_fields: set[str] = set()
+    state_keys: list[str] = []
+    full_state = False
+    for field in (f.strip() for f in fields.split(",")):
+        if not field or field == "session_id":
+            continue
+        if field == "summary":
+            include_fields.update({"state", "create_time", "update_time"})
+            state_keys.extend(SESSION_SUMMARY_STATE_KEYS)
+        elif field == "state":
+            include_fields.add("state")
+            full_state = True
+        elif field.startswith("state."):
+            include_fields.add("state")
+            state_keys.append(field.replace("state.", "", 1))
+        elif field in ("create_time", "update_time"):
+            include_fields.add(field)
+        else:
+            raise ValueError(f"Unknown field '{field}'")
+
+    if full_state or "state" not in include_fields:
+        return include_fields, None if full_state else []
+    # de-duplicate while keeping order
+    return include_fields, list(dict.fromkeys(state_keys))
+
+
 @app.get("/api/sessions/{session_id}/state/{state_key}")
 async def get_session_state_value(session_id: str, state_key: str) -> dict[str, Any]:
     """
@@ -325,17 +444,17 @@ async def get_session_state_value(session_id: str, state_key: str) -> dict[str,
             params={"session_id": session_id, "state_key": state_key}
         )
         
-        state_value = db_manager.get_session_state_val(session_id, state_key)
+        # Single projection query: tells us whether the session exists and returns only the requested key
+        state_values = await async_db_manager.get_session_state_values(session_id, [state_key])
+        
+        if state_values is None:
+            ServiceLogger.log_error(f"Session not found: {session_id}", "GET_SESSION_STATE")
+            raise HTTPException(status_code=404, detail="Session not found")
         
+        state_value = state_values.get(state_key)
         if state_value is None:
-            # Check if session exists at all
-            session = db_manager.get_session_by_id(session_id)
-            if not session:
-                ServiceLogger.log_error(f"Session not found: {session_id}", "GET_SESSION_STATE")
-                raise HTTPException(status_code=404, detail="Session not found")
-            else:
-                ServiceLogger.log_error(f"State key '{state_key}' not found in session {session_id}", "GET_SESSION_STATE")
-                raise HTTPException(status_code=404, detail=f"State key '{state_key}' not found")
+            ServiceLogger.log_error(f"State key '{state_key}' not found in session {session_id}", "GET_SESSION_STATE")
+            raise HTTPException(status_code=404, detail=f"State key '{state_key}' not found")
         
         ServiceLogger.log_info(f"Retrieved state value for key '{state_key}' from session {session_id}", "GET_SESSION_STATE")
         return {
@@ -355,47 +474,165 @@ async def get_session_state_value(session_id: str, state_key: str) -> dict[str,
         )
 
 
+@app.get("/api/sessions/{session_id}/trace")
+async def get_session_trace_spans(session_id: str) -> dict[str, Any]:
+    """
+    Get the recorded trace of a session's workflow runs: agent, LLM, tool, DashDoor and DB spans
+    with timings and token counts, plus a per-agent summary. Traces are kept in memory by this process.
+    """
+    try:
+        ServiceLogger.api_called_panel("GET", f"/api/sessions/{session_id}/trace", params={"session_id": session_id})
+
+        session_trace = get_session_trace(session_id)
+        if session_trace is None:
+            ServiceLogger.log_error(f"No trace recorded for session: {session_id}", "GET_SESSION_TRACE")
+            raise HTTPException(status_code=404, detail="No trace recorded for this session")
+
+        ServiceLogger.log_info(f"Retrieved {session_trace['span_count']} spans for session {session_id}", "GET_SESSION_TRACE")
+        return {**session_trace, "timestamp": datetime.now().isoformat()}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        ServiceLogger.log_error(f"Failed to get trace for session {session_id}: {str(e)}", "GET_SESSION_TRACE")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve session trace: {str(e)}"
+        )
+
+
+@app.get("/api/sessions/{session_id}/llm-usage")
+async def get_session_llm_usage(session_id: str) -> dict[str, Any]:
+    """
+    Get the LLM token usage and estimated cost of a session, in total and per agent / model.
+    """
+    try:
+        ServiceLogger.api_called_panel("GET", f"/api/sessions/{session_id}/llm-usage", params={"session_id": session_id})
+
+        usage = await async_db_manager.get_session_llm_usage(session_id)
+        if usage is None:
+            ServiceLogger.log_error(f"No LLM usage recorded for session: {session_id}", "GET_SESSION_LLM_USAGE")
+            raise HTTPException(status_code=404, detail="No LLM usage recorded for this session")
+
+        ServiceLogger.log_info(f"Retrieved LLM usage for session {session_id}", "GET_SESSION_LLM_USAGE",
+                               calls=usage["totals"]["calls"], total_tokens=usage["totals"]["total_tokens"])
+        return {"session_id": session_id, **usage, "timestamp": datetime.now().isoformat()}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        ServiceLogger.log_error(f"Failed to get LLM usage for session {session_id}: {str(e)}", "GET_SESSION_LLM_USAGE")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve LLM usage: {str(e)}"
+        )
+
+
+@app.get("/api/users/{user_id}/llm-usage")
+async def get_user_llm_usage(user_id: str) -> dict[str, Any]:
+    """
+    Get the LLM token usage and estimated cost across a user's sessions, in total, per agent / model and per session.
+    """
+    try:
+        ServiceLogger.api_called_panel("GET", f"/api/users/{user_id}/llm-usage", params={"user_id": user_id})
+
+        user = await async_db_manager.get_user(user_id=user_id)
+        if not user:
+            ServiceLogger.log_error(f"User not found: {user_id}", "GET_USER_LLM_USAGE")
+            raise HTTPException(status_code=404, detail="User not found")
+
+        usage = await async_db_manager.get_user_llm_usage(user_id)
+
+        ServiceLogger.log_info(f"Retrieved LLM usage for user {user_id}", "GET_USER_LLM_USAGE",
+                               calls=usage["totals"]["calls"], total_tokens=usage["totals"]["total_tokens"])
+        return {"user_id": user_id, **usage, "timestamp": datetime.now().isoformat()}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        ServiceLogger.log_error(f"Failed to get LLM usage for user {user_id}: {str(e)}", "GET_USER_LLM_USAGE")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve LLM usage: {str(e)}"
+        )
+
+
+@app.get("/api/llm-usage/agents")
+async def get_agent_llm_usage() -> dict[str, Any]:
+    """
+    Get LLM token usage and estimated cost per agent / model across all sessions, largest consumers first.
+    `avg_prompt_tokens` / `max_prompt_tokens` point at the agents with the most prompt bloat.
+    """
+    try:
+        ServiceLogger.api_called_panel("GET", "/api/llm-usage/agents")
+
+        agents = await async_db_manager.get_agent_llm_usage()
+
+        ServiceLogger.log_info(f"Retrieved LLM usage for {len(agents)} agent / model pairs", "GET_AGENT_LLM_USAGE")
+        return {"agents": agents, "timestamp": datetime.now().isoformat()}
+
+    except Exception as e:
+        ServiceLogger.log_error(f"Failed to get agent LLM usage: {str(e)}", "GET_AGENT_LLM_USAGE")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve LLM usage: {str(e)}"
+        )
+
+
 @app.get("/api/users/{user_id}/sessions")
-async def get_user_sessions(user_id: str) -> dict[str, Any]:
+async def get_user_sessions(user_id: str, limit: int = Query(default=SESSION_PAGE_DEFAULT_LIMIT, ge=1, le=SESSION_PAGE_MAX_LIMIT),
+                            cursor: str | None = None, fields: str | None = None) -> dict[str, Any]:
     """
-    Get all sessions for a given user_id.
-    Returns all sessions (both active and completed) for the specified user.
+    Get one page of sessions for a given user_id, newest first.
+    Returns sessions (both active and completed) for the specified user.
+    Pass the returned `next_cursor` as `cursor` to fetch the next page.
+    `fields` is a comma-separated projection, e.g. `fields=summary` or
+    `fields=update_time,state.workflow_status`; by default the full state is returned.
     """
     try:
         ServiceLogger.api_called_panel(
             "GET",
             f"/api/users/{user_id}/sessions",
-            params={"user_id": user_id}
+            params={"user_id": user_id, "limit": limit, "cursor": cursor, "fields": fields}
         )
         
+        try:
+            after = decode_session_cursor(cursor) if cursor else None
+            include_fields, state_keys = parse_session_fields(fields)
+        except ValueError as e:
+            ServiceLogger.log_error(f"Invalid session page request: {str(e)}", "GET_USER_SESSIONS")
+            raise HTTPException(status_code=400, detail=str(e))
+        
         # Check if user exists
-        user = db_manager.get_user(user_id=user_id)
+        user = await async_db_manager.get_user(user_id=user_id)
         if not user:
             ServiceLogger.log_error(f"User not found: {user_id}", "GET_USER_SESSIONS")
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Get all sessions for the user
-        all_sessions: list[Any] = db_manager.get_user_sessions("auto_nom_agent", user_id)
+        # Get one page of sessions for the user (state projected in SQL when `fields` asks for specific keys)
+        page, next_after = await async_db_manager.get_user_sessions_page(
+            "auto_nom_agent", user_id, limit=limit, after=after, state_keys=state_keys)
         
         # Format the response with session states (transformed to client format)
         sessions_data: list[dict[str, Any]] = []
-        for session in all_sessions:
-            # treat session as dynamic Any for typing purposes
-            s: Any = session
-            # Transform the flat state to client format
-            client_state = transform_state_to_client_format(s.state)
-            sessions_data.append({
-                "session_id": s.id,
-                "state": client_state,
-                "create_time": s.create_time.isoformat(),
-                "update_time": s.update_time.isoformat()
-            })
-        
-        ServiceLogger.log_info(f"Retrieved {len(all_sessions)} sessions for user {user_id}", "GET_USER_SESSIONS")
+        for row in page:
+            session_data: dict[str, Any] = {"session_id": row["id"]}
+            if "state" in include_fields:
+                # Transform the flat state to client format
+                session_data["state"] = transform_state_to_client_format(row["state"])
+            if "create_time" in include_fields:
+                session_data["create_time"] = row["create_time"].isoformat()
+            if "update_time" in include_fields:
+                session_data["update_time"] = row["update_time"].isoformat()
+            sessions_data.append(session_data)
+        
+        ServiceLogger.log_info(f"Retrieved {len(page)} sessions for user {user_id}", "GET_USER_SESSIONS")
         return {
             "user_id": user_id,
-            "sessions_count": len(all_sessions),
+            "sessions_count": len(page),
             "sessions": sessions_data,
+            "next_cursor": encode_session_cursor(next_after) if next_after else None,
+            "has_more": next_after is not None,
             "timestamp": datetime.now().isoformat()
         }
         
@@ -424,25 +661,18 @@ async def get_user_active_sessions(user_id: str) -> dict[str, Any]:
         )
         
         # Check if user exists
-        user = db_manager.get_user(user_id=user_id)
+        user = await async_db_manager.get_user(user_id=user_id)
         if not user:
             ServiceLogger.log_error(f"User not found: {user_id}", "GET_ACTIVE_SESSIONS")
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Get active sessions for the user
-        active_sessions: list[Any] = db_manager.get_active_user_sessions("auto_nom_agent", user_id)
-        
-        # Extract only session IDs
-        session_ids: list[str] = []
-        for session in active_sessions:
-            # treat session as dynamic Any for typing purposes
-            s: Any = session
-            session_ids.append(s.id)
+        # Get active session IDs for the user (filtered in SQL on the indexed workflow_status column)
+        session_ids: list[str] = await async_db_manager.get_active_user_session_ids("auto_nom_agent", user_id)
         
-        ServiceLogger.log_info(f"Retrieved {len(active_sessions)} active sessions for user {user_id}", "GET_ACTIVE_SESSIONS")
+        ServiceLogger.log_info(f"Retrieved {len(session_ids)} active sessions for user {user_id}", "GET_ACTIVE_SESSIONS")
         return {
             "user_id": user_id,
-            "active_sessions_count": len(active_sessions),
+            "active_sessions_count": len(session_ids),
             "session_ids": session_ids,
             "timestamp": datetime.now().isoformat()
         }
@@ -472,13 +702,13 @@ async def get_user_active_session_state(user_id: str, session_id: str) -> dict[s
         # )
         
         # Check if user exists
-        user = db_manager.get_user(user_id=user_id)
+        user = await async_db_manager.get_user(user_id=user_id)
         if not user:
             ServiceLogger.log_error(f"User not found: {user_id}", "GET_ACTIVE_SESSION_STATE")
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get the specific session
-        session = db_manager.get_session_by_id(session_id=session_id)
+        session = await async_db_manager.get_session_by_id(session_id=session_id)
         if not session:
             ServiceLogger.log_error(f"Session not found: {session_id}", "GET_ACTIVE_SESSION_STATE")
             raise HTTPException(status_code=404, detail="Session not found")
@@ -511,6 +741,125 @@ async def get_user_active_session_state(user_id: str, session_id: str) -> dict[s
         )
 
 
+def transform_state_delta_to_client_format(state_delta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Transform a flat state delta to the nested client format.
+    Unlike transform_state_to_client_format, keys that did not change are not defaulted,
+    so the result can be deep-merged into the client's current state.
+    """
+    client_delta = transform_state_to_client_format(state_delta)
+    if "workflow_status" not in state_delta:
+        del client_delta["workflow_status"]
+    return client_delta
+
+
+@app.get("/api/users/{user_id}/events")
+async def stream_user_session_changes(user_id: str) -> StreamingResponse:
+    """
+    Server-Sent Events stream of changes to a user's session list.
+    Sends a `session` event whenever one of the user's sessions is created or changes
+    workflow_status, and `resync` if the client fell behind, so the session history
+    can be refreshed on demand instead of polled.
+    """
+    ServiceLogger.api_called_panel("GET", f"/api/users/{user_id}/events", params={"user_id": user_id})
+
+    user = await async_db_manager.get_user(user_id=user_id)
+    if not user:
+        ServiceLogger.log_error(f"User not found: {user_id}", "USER_EVENTS")
+        raise HTTPException(status_code=404, detail="User not found")
+
+    async def event_stream():
+        async with session_event_hub.subscription(user_channel(user_id)) as queue:
+            while True:
+                try:
+                    change = await asyncio.wait_for(queue.get(), timeout=SESSION_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # SSE comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if change is RESYNC:
+                    yield f"event: resync\ndata: {json.dumps({'user_id': user_id})}\n\n"
+                    continue
+                yield f"event: session\ndata: {json.dumps({**change, 'timestamp': datetime.now().isoformat()})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@app.get("/api/users/{user_id}/sessions/{session_id}/events")
+async def stream_session_state(user_id: str, session_id: str) -> StreamingResponse:
+    """
+    Server-Sent Events stream of a session's state.
+    Sends a `snapshot` event with the full client-format state, then a `delta` event
+    each time the AutoNom run loop changes the state. Replaces client-side polling.
+    """
+    ServiceLogger.api_called_panel(
+        "GET",
+        f"/api/users/{user_id}/sessions/{session_id}/events",
+        params={"user_id": user_id, "session_id": session_id}
+    )
+
+    session = await async_db_manager.get_session_by_id(session_id=session_id)
+    if not session:
+        ServiceLogger.log_error(f"Session not found: {session_id}", "SESSION_EVENTS")
+        raise HTTPException(status_code=404, detail="Session not found")
+    if session.user_id != user_id:
+        ServiceLogger.log_error(f"Session {session_id} does not belong to user {user_id}", "SESSION_EVENTS")
+        raise HTTPException(status_code=403, detail="Session does not belong to user")
+
+    def format_sse(event: str, data: dict[str, Any]) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def snapshot_event(current: Any) -> str:
+        return format_sse("snapshot", {
+            "user_id": user_id,
+            "session_id": session_id,
+            "state": transform_state_to_client_format(current.state),
+            "create_time": current.create_time.isoformat(),
+            "update_time": current.update_time.isoformat(),
+            "timestamp": datetime.now().isoformat()
+        })
+
+    async def event_stream():
+        # subscribe, then read the snapshot, so no delta is missed in between; a delta published
+        # between the two is in both, and re-applying it is harmless
+        async with session_event_hub.subscription(session_id) as queue:
+            current = await async_db_manager.get_session_by_id(session_id=session_id)
+            if not current:
+                return
+            yield snapshot_event(current)
+            while True:
+                try:
+                    state_delta = await asyncio.wait_for(queue.get(), timeout=SESSION_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # SSE comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if state_delta is RESYNC:
+                    current = await async_db_manager.get_session_by_id(session_id=session_id)
+                    if current:
+                        yield snapshot_event(current)
+                    continue
+
+                yield format_sse("delta", {
+                    "session_id": session_id,
+                    "state": transform_state_delta_to_client_format(state_delta),
+                    "changed_keys": list(state_delta.keys()),
+                    "timestamp": datetime.now().isoformat()
+                })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.post("/api/sessions/{session_id}/status", response_model=None)
 async def check_order_status(session_id: str, streaming: bool = False, message: str | None = None) -> dict[str, Any] | StreamingResponse:
     """
@@ -526,7 +875,7 @@ async def check_order_status(session_id: str, streaming: bool = False, message:
         )
         
         # Step 1: Get the session to find the user_id
-        session = db_manager.get_session_by_id(session_id=session_id)
+        session = await async_db_manager.get_session_by_id(session_id=session_id)
         
         if not session:
             ServiceLogger.log_error(f"Cannot find session for {session_id}", "CHECK_ORDER_STATUS")
@@ -535,7 +884,7 @@ async def check_order_status(session_id: str, streaming: bool = False, message:
         user_id = session.user_id
         
         # Step 2: Load user preferences from user id
-        current_user = db_manager.get_user(user_id=user_id)
+        current_user = await async_db_manager.get_user(user_id=user_id)
         if not current_user:
             ServiceLogger.log_error(f"Cannot find user with ID {user_id}", "CHECK_ORDER_STATUS")
             raise HTTPException(status_code=404, detail="User not found")
@@ -543,11 +892,12 @@ async def check_order_status(session_id: str, streaming: bool = False, message:
         ServiceLogger.log_debug(
             f"Found user: {current_user.id}",
             "CHECK_ORDER_STATUS",
+            site="server.user_profile",
             **current_user.model_dump()
         )
         
         # Step 3: Initialize the agent with the existing session
-        auto_nom = AutoNom(current_user, session_id=session_id)
+        auto_nom = AutoNom(current_user, app.state.agent_runtime, session_id=session_id)
         
         # Ask the agent specifically about the order status
         # Use custom message if provided, otherwise use default status check message
@@ -569,7 +919,7 @@ async def check_order_status(session_id: str, streaming: bool = False, message:
             asyncio.create_task(run_status_check())
             
             # Get current workflow status
-            workflow_status = db_manager.get_session_state_val(session_id, "workflow_status")
+            workflow_status = await async_db_manager.get_session_state_val(session_id, "workflow_status")
             
             # Return immediately with session info
             return {
@@ -611,7 +961,7 @@ async def delete_all_sessions() -> dict[str, Any]:
         )
         
         # Delete all sessions
-        deleted_count = db_manager.delete_all_sessions()
+        deleted_count = await async_db_manager.delete_all_sessions()
         
         ServiceLogger.log_success(f"Successfully deleted {deleted_count} sessions", "DELETE_SESSIONS")
         return {
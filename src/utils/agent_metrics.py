@@ -0,0 +1,53 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+
+from utils.metrics import counter, histogram
+
+AGENT_CALLBACK_SECONDS = histogram("autonom_agent_callback_duration_seconds",
+                                   "Duration of sub-agent before/after callbacks", ["agent", "callback"])
+AGENT_CALLBACK_ERRORS = counter("autonom_agent_callback_errors_total",
+                                "Sub-agent callbacks that raised", ["agent", "callback"])
+AGENT_RUN_SECONDS = histogram("autonom_agent_run_duration_seconds",
+                              "Time from a sub-agent's before_agent_callback to its after_agent_callback", ["agent"])
+
+# (invocation_id, agent) -> perf_counter at before_agent_callback; runs that fail before their
+# after callback never pop their entry, so only the most recent ones are kept
+_agent_starts: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+_MAX_PENDING_RUNS = 1000
+_lock = threading.Lock()
+
+
+def timed_agent_callback(agent: str, callback: str) -> Callable:
+    """
+    Decorates a before/after agent callback: times the callback itself and, paired by
+    invocation id, the agent run between the two ("before_agent" starts, "after_agent" ends).
+    """
+    def decorator(func: Callable[[CallbackContext], Any]) -> Callable[[CallbackContext], Any]:
+        @functools.wraps(func)
+        def wrapper(callback_context: CallbackContext) -> Any:
+            key = (callback_context.invocation_id, agent)
+            start = time.perf_counter()
+            if callback == "before_agent":
+                with _lock:
+                    _agent_starts[key] = start
+                    while len(_agent_starts) > _MAX_PENDING_RUNS:
+                        _agent_starts.popitem(last=False)
+            elif callback == "after_agent":
+                with _lock:
+                    agent_start = _agent_starts.pop(key, None)
+                if agent_start is not None:
+                    AGENT_RUN_SECONDS.observe(start - agent_start, agent=agent)
+            try:
+                return func(callback_context)
+            except Exception:
+                AGENT_CALLBACK_ERRORS.inc(agent=agent, callback=callback)
+                raise
+            finally:
+                AGENT_CALLBACK_SECONDS.observe(time.perf_counter() - start, agent=agent, callback=callback)
+        return wrapper
+    return decorator
@@ -0,0 +1,133 @@
+"""
+LLM token and cost accounting.
+
+`LlmUsagePlugin` is registered on every Runner (see AgentRuntime), so it sees the
+response of every model call made by every agent, including agents run as tools.
+Each call's usage metadata becomes one `llm_usage` row attributed to the AutoNom
+session, user and agent. Rows are buffered for the duration of `AutoNom.run`
+(see `usage_scope`) and written in one batch when the run ends.
+"""
+
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+from src.auto_nom_agent.configs import llm_pricing
+from src.db import async_db_manager
+from utils.logger import ServiceLogger
+from utils.metrics import counter
+
+LLM_CALLS = counter("autonom_llm_calls_total", "Model responses with usage metadata", ["agent", "model"])
+LLM_TOKENS = counter("autonom_llm_tokens_total", "Tokens used by model calls", ["agent", "model", "type"])
+LLM_COST_USD = counter("autonom_llm_cost_usd_total", "Estimated model cost in USD (see configs.llm_pricing)",
+                       ["agent", "model"])
+
+
+class UsageScope():
+    """The AutoNom session a run's model calls are billed to, and the rows recorded so far."""
+
+    def __init__(self, session_id: str, user_id: str):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.rows: List[Dict[str, Any]] = []
+
+    async def flush(self) -> None:
+        """Persists the buffered rows; failures are logged, never raised into the workflow."""
+        rows, self.rows = self.rows, []
+        if not rows:
+            return
+        try:
+            await async_db_manager.record_llm_usage(rows)
+        except Exception as e:
+            ServiceLogger.log_error(f"Failed to record LLM usage for session {self.session_id}", "LLM_USAGE",
+                                    error=e, calls=len(rows))
+
+
+# Set by AutoNom.run. Agents run as tools get their own in-memory ADK session,
+# so the AutoNom session id comes from here rather than from the callback context.
+_current_scope: ContextVar[Optional[UsageScope]] = ContextVar("llm_usage_scope", default=None)
+
+
+def usage_scope(session_id: str, user_id: str) -> UsageScope:
+    """Starts buffering model usage for the current run; call `flush()` on the result when the run ends."""
+    scope = UsageScope(session_id, user_id)
+    _current_scope.set(scope)
+    return scope
+
+
+def _pricing_for(model: str) -> Optional[Dict[str, float]]:
+    matches = [name for name in llm_pricing if model.startswith(name)]
+    return llm_pricing[max(matches, key=len)] if matches else None
+
+
+def llm_cost_usd(model: str, prompt_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+    """Estimated cost of one call; 0 for models missing from configs.llm_pricing."""
+    pricing = _pricing_for(model)
+    if pricing is None:
+        return 0.0
+    return ((prompt_tokens - cached_tokens) * pricing["input"] + cached_tokens * pricing["cached_input"]
+            + output_tokens * pricing["output"]) / 1_000_000
+
+
+def _model_name(callback_context: CallbackContext, llm_response: LlmResponse) -> str:
+    if llm_response.model_version:
+        return llm_response.model_version
+    agent = callback_context._invocation_context.agent
+    model = getattr(agent, "model", "")
+    return model if isinstance(model, str) else getattr(model, "model", "unknown")
+
+
+class LlmUsagePlugin(BasePlugin):
+    """Records token usage and estimated cost of every model response."""
+
+    def __init__(self):
+        super().__init__(name="llm_usage")
+
+    async def after_model_callback(self, *, callback_context: CallbackContext,
+                                   llm_response: LlmResponse) -> Optional[LlmResponse]:
+        usage = llm_response.usage_metadata
+        if usage is None or llm_response.partial:
+            return None
+
+        agent = callback_context.agent_name
+        model = _model_name(callback_context, llm_response)
+        # tool-use prompt tokens are billed as input, thinking tokens as output
+        prompt_tokens = (usage.prompt_token_count or 0) + (usage.tool_use_prompt_token_count or 0)
+        cached_tokens = usage.cached_content_token_count or 0
+        output_tokens = usage.candidates_token_count or 0
+        thoughts_tokens = usage.thoughts_token_count or 0
+        cost = llm_cost_usd(model, prompt_tokens, cached_tokens, output_tokens + thoughts_tokens)
+
+        LLM_CALLS.inc(agent=agent, model=model)
+        LLM_TOKENS.inc(prompt_tokens, agent=agent, model=model, type="prompt")
+        LLM_TOKENS.inc(cached_tokens, agent=agent, model=model, type="cached")
+        LLM_TOKENS.inc(output_tokens, agent=agent, model=model, type="output")
+        LLM_TOKENS.inc(thoughts_tokens, agent=agent, model=model, type="thoughts")
+        LLM_COST_USD.inc(cost, agent=agent, model=model)
+
+        scope = _current_scope.get()
+        # outside AutoNom.run the call is billed to the ADK session and written right away
+        unbuffered = scope is None
+        if unbuffered:
+            scope = UsageScope(callback_context._invocation_context.session.id, callback_context.user_id)
+        scope.rows.append({
+            "session_id": scope.session_id,
+            "user_id": scope.user_id,
+            "invocation_id": callback_context.invocation_id,
+            "agent": agent,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "output_tokens": output_tokens,
+            "thoughts_tokens": thoughts_tokens,
+            "total_tokens": usage.total_token_count or 0,
+            "cost_usd": cost,
+            "created_at": datetime.now().isoformat(),
+        })
+        if unbuffered:
+            await scope.flush()
+        return None
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+# Returned by a fetch when the origin answered 304 Not Modified for the stale entry's validator
+NOT_MODIFIED = object()
+
+
+class CacheEntry():
+    __slots__ = ("value", "size", "expires_at", "etag")
+
+    def __init__(self, value: Any, size: int, expires_at: float, etag: Optional[str] = None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+
+
+class ResponseCache():
+    """
+    TTL + LRU cache for decoded HTTP responses, bounded by total body bytes.
+
+    `get_or_fetch` is single-flight: concurrent misses for the same key share one
+    in-flight fetch instead of each going upstream. Cached values are shared
+    between callers and must be treated as read-only.
+
+    Expired entries that carry an ETag are kept (until LRU-evicted) so the next
+    fetch can revalidate them with If-None-Match and reuse the body on a 304.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.revalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value), counting the lookup as a hit or a miss."""
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found, value
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value) and refreshes the entry's LRU position on a hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires_at <= time.monotonic():
+                if entry.etag is None:
+                    self._remove(key)
+                    self.expirations += 1
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.value
+
+    def get_etag(self, key: Hashable) -> Optional[str]:
+        """Validator of the (possibly expired) entry for `key`, used for If-None-Match."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.etag if entry is not None else None
+
+    def revalidate(self, key: Hashable, ttl: float) -> Tuple[bool, Any]:
+        """Marks a stale entry fresh again after a 304 and returns (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            entry.expires_at = time.monotonic() + ttl
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+            return True, entry.value
+
+    def put(self, key: Hashable, value: Any, size: int, ttl: float, etag: Optional[str] = None) -> None:
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, etag)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    async def get_or_fetch(self, key: Hashable, ttl: float,
+                           fetch: Callable[[Optional[str]], Awaitable[Tuple[Any, int, Optional[str]]]]) -> Any:
+        """
+        Returns the cached value for `key`, or awaits `fetch(etag)` -> (value, size, etag) and caches it.
+
+        `fetch` receives the stale entry's ETag (or None) and may return NOT_MODIFIED as the
+        value to reuse the stale body. Exceptions propagate to every waiter and nothing is cached.
+        The fetch runs as its own task that every caller shields, so a cancelled caller (e.g. a
+        disconnected client) never aborts the fetch the other waiters share.
+        """
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            inflight = asyncio.get_running_loop().create_task(self._fetch(key, ttl, fetch))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._fetch_done(key, task))
+        return await asyncio.shield(inflight)
+
+    async def _fetch(self, key: Hashable, ttl: float,
+                     fetch: Callable[[Optional[str]], Awaitable[Tuple[Any, int, Optional[str]]]]) -> Any:
+        value, size, etag = await fetch(self.get_etag(key))
+        if value is NOT_MODIFIED:
+            found, value = self.revalidate(key, ttl)
+            if not found:
+                # the stale entry was evicted while the request was in flight; fetch unconditionally
+                value, size, etag = await fetch(None)
+                self.put(key, value, size, ttl, etag)
+        else:
+            self.put(key, value, size, ttl, etag)
+        return value
+
+    def _fetch_done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # mark retrieved so a failure nobody awaited does not log "exception was never retrieved"
+            task.exception()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+            cached_bytes = self._bytes
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": entries,
+            "bytes": cached_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "revalidations": self.revalidations,
+            "inflight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+def make_cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """Builds a hashable key from a request path and its query params (order-insensitive)."""
+    return path, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
@@ -1,127 +1,519 @@
+import json
 import os
+import time
 import requests
-from typing import Any, List, Dict, Optional
+from typing import Any, AsyncIterator, List, Dict, Optional
 import httpx
 
 from src.schema.restaurant import Restaurants
+from src.utils.response_cache import NOT_MODIFIED, ResponseCache, make_cache_key
+from src.utils.tracing import tracer
 from utils.logger import ServiceLogger
+from utils.metrics import histogram
 
 DOORDASH_API_URL: str = os.environ.get("DOORDASH_API_URL", "http://dashdoor:8001")
 
+# Connection pool / timeout settings shared by the long-lived DashDoor clients
+DASHDOOR_MAX_CONNECTIONS = int(os.environ.get("DASHDOOR_MAX_CONNECTIONS", "20"))
+DASHDOOR_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("DASHDOOR_MAX_KEEPALIVE_CONNECTIONS", "10"))
+DASHDOOR_KEEPALIVE_EXPIRY = float(os.environ.get("DASHDOOR_KEEPALIVE_EXPIRY", "30"))
+DASHDOOR_TIMEOUT = float(os.environ.get("DASHDOOR_TIMEOUT", "10"))
+DASHDOOR_CONNECT_TIMEOUT = float(os.environ.get("DASHDOOR_CONNECT_TIMEOUT", "3"))
+DASHDOOR_HTTP2 = os.environ.get("DASHDOOR_HTTP2", "false").lower() == "true"
 
-def get_health_status() -> Dict[str, Any]:
-    """Get DashDoor API health status"""
+# Response cache for catalog reads; the catalog only changes when DashDoor reloads it.
+# Expired entries are revalidated with If-None-Match against DashDoor's catalog ETag.
+DASHDOOR_CACHE_ENABLED = os.environ.get("DASHDOOR_CACHE_ENABLED", "true").lower() == "true"
+DASHDOOR_CACHE_MAX_BYTES = int(os.environ.get("DASHDOOR_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Seconds each endpoint's responses stay fresh; discovery facets change least often
+DASHDOOR_CACHE_TTLS: Dict[str, float] = {
+    "cuisines": 300,
+    "tags": 300,
+    "dietary_tags": 300,
+    "restaurants_by_cuisine": 120,
+    "restaurants_by_tags": 120,
+    "menu_items_by_dietary_tags": 120,
+    "search_dishes": 120,
+    "restaurant_detail": 60,
+    "menu_items": 60,
+    "restaurant_list": 60,
+}
+
+# Compact projections for LLM-facing callers: drop descriptions and other long text
+COMPACT_MENU_ITEM_FIELDS = ["id", "name", "price", "calories", "dietary_tags", "restaurant_id", "restaurant_name"]
+COMPACT_DISH_FIELDS = COMPACT_MENU_ITEM_FIELDS + ["cuisine", "rating", "delivery_time_min"]
+COMPACT_RESTAURANT_FIELDS = ["id", "name", "cuisine", "rating", "delivery_time_min", "tags",
+                             "menu.id", "menu.name", "menu.price", "menu.calories", "menu.dietary_tags"]
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+DASHDOOR_REQUEST_SECONDS = histogram(
+    "autonom_dashdoor_request_duration_seconds",
+    "Duration of HTTP requests to DashDoor (cache hits are not counted); status is 'error' on transport failures",
+    ["method", "endpoint", "status"])
+
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+response_cache = ResponseCache(max_bytes=DASHDOOR_CACHE_MAX_BYTES)
+
+
+# --- HTTP Clients ---
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1 without it."""
+    if not DASHDOOR_HTTP2:
+        return False
     try:
-        response = httpx.get(f'{DOORDASH_API_URL}/')
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        ServiceLogger.log_warning("DASHDOOR_HTTP2 is set but the 'h2' package is not installed, using HTTP/1.1", "DASHDOOR_API_CALL")
+        return False
+
+
+def _accept_encoding() -> str:
+    """Advertises brotli only when a decoder is installed; httpx decompresses responses transparently."""
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+            return "br, gzip"
+        except ImportError:
+            continue
+    return "gzip"
+
+
+def _client_settings() -> Dict[str, Any]:
+    return {
+        "headers": {"Accept-Encoding": _accept_encoding()},
+        "base_url": DOORDASH_API_URL,
+        "limits": httpx.Limits(
+            max_connections=DASHDOOR_MAX_CONNECTIONS,
+            max_keepalive_connections=DASHDOOR_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=DASHDOOR_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(DASHDOOR_TIMEOUT, connect=DASHDOOR_CONNECT_TIMEOUT),
+        "http2": _http2_enabled(),
+    }
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Returns the shared, keep-alive AsyncClient for DashDoor, creating it on first use."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(**_client_settings())
+    return _async_client
+
+
+def get_sync_client() -> httpx.Client:
+    """Returns the shared, keep-alive Client used by the synchronous helpers."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(**_client_settings())
+    return _sync_client
+
+
+async def close_clients() -> None:
+    """Closes the shared DashDoor clients. Call on application shutdown."""
+    global _async_client, _sync_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/coalesced counters and size of the DashDoor response cache."""
+    return {"enabled": DASHDOOR_CACHE_ENABLED, **response_cache.stats()}
+
+
+def _endpoint_label(path: str) -> str:
+    """Route template for metrics labels, so restaurant ids do not become label values."""
+    prefix = "/api/v1/restaurants/"
+    if path.startswith(prefix) and path[len(prefix):] not in ("by-cuisine", "by-tags"):
+        return prefix + "{restaurant_id}"
+    return path
+
+
+class _RequestTimer():
+    """
+    Times one DashDoor request into DASHDOOR_REQUEST_SECONDS and traces it as a
+    `dashdoor <METHOD> <endpoint>` span; call `record(response)` once the response arrives.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.status: Any = "error"
+        self.response: Any = None
+
+    def record(self, response: Any) -> None:
+        self.status = response.status_code
+        self.response = response
+
+    def __enter__(self) -> "_RequestTimer":
+        self._endpoint = _endpoint_label(self.path)
+        self._span_scope = tracer.start_as_current_span(f"dashdoor {self.method} {self._endpoint}", attributes={
+            "http.request.method": self.method, "url.path": self.path})
+        self._span = self._span_scope.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        DASHDOOR_REQUEST_SECONDS.observe(time.perf_counter() - self._start, method=self.method,
+                                         endpoint=self._endpoint, status=str(self.status))
+        if self.response is not None:
+            self._span.set_attribute("http.response.status_code", self.response.status_code)
+            # bytes on the wire (compressed); streamed bodies are counted once fully read
+            self._span.set_attribute("http.response.body.size", self.response.num_bytes_downloaded)
+        self._span_scope.__exit__(exc_type, exc, tb)
+
+
+def _projection_params(fields: Optional[List[str]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Query params for DashDoor's `fields=` / `limit=` support."""
+    params: Dict[str, Any] = {}
+    if fields:
+        params["fields"] = ",".join(fields)
+    if limit is not None:
+        params["limit"] = limit
+    return params
+
+
+def _search_params(cuisine: Optional[str] = None, tags: Optional[List[str]] = None,
+                   dietary_tags: Optional[List[str]] = None, exclude_dietary_tags: Optional[List[str]] = None,
+                   min_rating: Optional[float] = None, max_price: Optional[float] = None,
+                   min_calories: Optional[int] = None, max_calories: Optional[int] = None,
+                   max_delivery_time: Optional[int] = None) -> Dict[str, Any]:
+    """Query params for DashDoor's /api/v1/search; unset filters are omitted."""
+    params: Dict[str, Any] = {
+        "cuisine": cuisine,
+        "tags": ",".join(tags) if tags else None,
+        "dietary_tags": ",".join(dietary_tags) if dietary_tags else None,
+        "exclude_dietary_tags": ",".join(exclude_dietary_tags) if exclude_dietary_tags else None,
+        "min_rating": min_rating,
+        "max_price": max_price,
+        "min_calories": min_calories,
+        "max_calories": max_calories,
+        "max_delivery_time": max_delivery_time,
+    }
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def _get_json(path: str, error_message: str, default: Any, params: Optional[Dict[str, Any]] = None,
+              cache_ttl: float = 0) -> Any:
+    use_cache = DASHDOOR_CACHE_ENABLED and cache_ttl > 0
+    key = make_cache_key(path, params)
+    headers: Dict[str, str] = {}
+    if use_cache:
+        found, value = response_cache.get(key)
+        if found:
+            return value
+        etag = response_cache.get_etag(key)
+        if etag:
+            headers["If-None-Match"] = etag
+    try:
+        with _RequestTimer("GET", path) as timer:
+            response = get_sync_client().get(path, params=params, headers=headers)
+            timer.record(response)
+        if response.status_code == 304:
+            found, value = response_cache.revalidate(key, cache_ttl)
+            if found:
+                return value
+            with _RequestTimer("GET", path) as timer:
+                response = get_sync_client().get(path, params=params)
+                timer.record(response)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        if use_cache:
+            response_cache.put(key, data, len(response.content), cache_ttl, response.headers.get("etag"))
+        return data
     except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error("Error querying health status from dashdoor", "DASHDOOR_API_CALL", e)
-        return {}
+        ServiceLogger.log_error(error_message, "DASHDOOR_API_CALL", e)
+        return default
 
 
-def get_restaurant_list() -> Restaurants:
-    """Fetch restaurant list from DashDoor API"""
-    restaurants = Restaurants()
+async def _fetch_json_async(path: str, params: Optional[Dict[str, Any]],
+                            etag: Optional[str] = None) -> tuple[Any, int, Optional[str]]:
+    headers = {"If-None-Match": etag} if etag else {}
+    with _RequestTimer("GET", path) as timer:
+        response = await get_async_client().get(path, params=params, headers=headers)
+        timer.record(response)
+    if etag and response.status_code == 304:
+        return NOT_MODIFIED, 0, etag
+    response.raise_for_status()
+    return response.json(), len(response.content), response.headers.get("etag")
+
+
+async def _get_json_async(path: str, error_message: str, default: Any, params: Optional[Dict[str, Any]] = None,
+                          cache_ttl: float = 0) -> Any:
     try:
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/restaurants')
+        if DASHDOOR_CACHE_ENABLED and cache_ttl > 0:
+            # single-flight: concurrent callers for the same request share one upstream fetch
+            return await response_cache.get_or_fetch(
+                make_cache_key(path, params), cache_ttl, lambda etag: _fetch_json_async(path, params, etag))
+        data, _, _ = await _fetch_json_async(path, params)
+        return data
+    except httpx.HTTPError as e:
+        ServiceLogger.log_error(error_message, "DASHDOOR_API_CALL", e)
+        return default
+
+
+def _post_json(path: str, body: Dict[str, Any], error_message: str, default: Any,
+               params: Optional[Dict[str, Any]] = None) -> Any:
+    try:
+        with _RequestTimer("POST", path) as timer:
+            response = get_sync_client().post(path, json=body, params=params)
+            timer.record(response)
         response.raise_for_status()
-        restaurants = response.json()
-        return restaurants
+        return response.json()
     except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error("Error querying restaurant list from dashdoor", "DASHDOOR_API_CALL", e)
-        return restaurants
+        ServiceLogger.log_error(error_message, "DASHDOOR_API_CALL", e)
+        return default
 
 
-def get_restaurant_detail(restaurant_id: str) -> Dict[str, Any]:
-    """Get details for a specific restaurant by ID"""
+async def _post_json_async(path: str, body: Dict[str, Any], error_message: str, default: Any,
+                           params: Optional[Dict[str, Any]] = None) -> Any:
     try:
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/restaurants/{restaurant_id}')
+        with _RequestTimer("POST", path) as timer:
+            response = await get_async_client().post(path, json=body, params=params)
+            timer.record(response)
         response.raise_for_status()
         return response.json()
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error(f"Error querying restaurant detail for {restaurant_id} from dashdoor", "DASHDOOR_API_CALL", e)
-        return {}
+    except httpx.HTTPError as e:
+        ServiceLogger.log_error(error_message, "DASHDOOR_API_CALL", e)
+        return default
+
+
+async def _stream_ndjson_async(path: str, error_message: str,
+                               params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields records from a DashDoor NDJSON stream one at a time as lines arrive,
+    so memory stays flat no matter how large the catalog is. On error the stream
+    is logged and simply ends. The request is timed until the stream is fully read.
+    """
+    try:
+        with _RequestTimer("GET", path) as timer:
+            async with get_async_client().stream("GET", path, params=params,
+                                                 headers={"Accept": NDJSON_MEDIA_TYPE}) as response:
+                timer.record(response)
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line:
+                        yield json.loads(line)
+    except httpx.HTTPError as e:
+        ServiceLogger.log_error(error_message, "DASHDOOR_API_CALL", e)
+
+
+# --- DashDoor Helpers ---
+
+
+def get_health_status() -> Dict[str, Any]:
+    """Get DashDoor API health status"""
+    return _get_json("/", "Error querying health status from dashdoor", {})
+
+
+async def get_health_status_async() -> Dict[str, Any]:
+    """Get DashDoor API health status"""
+    return await _get_json_async("/", "Error querying health status from dashdoor", {})
+
+
+def get_restaurant_list(fields: Optional[List[str]] = None, limit: Optional[int] = None) -> Restaurants:
+    """Fetch restaurant list from DashDoor API"""
+    return _get_json("/api/v1/restaurants", "Error querying restaurant list from dashdoor", Restaurants(),
+                     params=_projection_params(fields, limit), cache_ttl=DASHDOOR_CACHE_TTLS["restaurant_list"])
+
+
+async def get_restaurant_list_async(fields: Optional[List[str]] = None, limit: Optional[int] = None) -> Restaurants:
+    """Fetch restaurant list from DashDoor API"""
+    return await _get_json_async("/api/v1/restaurants", "Error querying restaurant list from dashdoor", Restaurants(),
+                                 params=_projection_params(fields, limit), cache_ttl=DASHDOOR_CACHE_TTLS["restaurant_list"])
+
+
+def get_restaurant_detail(restaurant_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get details for a specific restaurant by ID"""
+    return _get_json(f"/api/v1/restaurants/{restaurant_id}",
+                     f"Error querying restaurant detail for {restaurant_id} from dashdoor", {},
+                     params=_projection_params(fields), cache_ttl=DASHDOOR_CACHE_TTLS["restaurant_detail"])
+
+
+async def get_restaurant_detail_async(restaurant_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get details for a specific restaurant by ID"""
+    return await _get_json_async(f"/api/v1/restaurants/{restaurant_id}",
+                                 f"Error querying restaurant detail for {restaurant_id} from dashdoor", {},
+                                 params=_projection_params(fields), cache_ttl=DASHDOOR_CACHE_TTLS["restaurant_detail"])
 
 
 def get_cuisines() -> List[str]:
     """Get list of unique cuisines available"""
-    try:
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/cuisines')
-        response.raise_for_status()
-        data = response.json()
-        return data.get("cuisines", [])
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error("Error querying cuisines from dashdoor", "DASHDOOR_API_CALL", e)
-        return []
+    data = _get_json("/api/v1/cuisines", "Error querying cuisines from dashdoor", {}, cache_ttl=DASHDOOR_CACHE_TTLS["cuisines"])
+    return data.get("cuisines", [])
 
 
-def get_restaurants_by_cuisine(cuisine: str) -> Dict[str, Any]:
+async def get_cuisines_async() -> List[str]:
+    """Get list of unique cuisines available"""
+    data = await _get_json_async("/api/v1/cuisines", "Error querying cuisines from dashdoor", {}, cache_ttl=DASHDOOR_CACHE_TTLS["cuisines"])
+    return data.get("cuisines", [])
+
+
+def get_restaurants_by_cuisine(cuisine: str, fields: Optional[List[str]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
     """Get restaurants filtered by cuisine type"""
-    try:
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/restaurants/by-cuisine', params={"cuisine": cuisine})
-        response.raise_for_status()
-        return response.json()
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error(f"Error querying restaurants by cuisine '{cuisine}' from dashdoor", "DASHDOOR_API_CALL", e)
-        return {"cuisine": cuisine, "count": 0, "restaurants": []}
+    return _get_json("/api/v1/restaurants/by-cuisine",
+                     f"Error querying restaurants by cuisine '{cuisine}' from dashdoor",
+                     {"cuisine": cuisine, "count": 0, "restaurants": []},
+                     params={"cuisine": cuisine, **_projection_params(fields, limit)},
+                     cache_ttl=DASHDOOR_CACHE_TTLS["restaurants_by_cuisine"])
+
+
+async def get_restaurants_by_cuisine_async(cuisine: str, fields: Optional[List[str]] = None,
+                                           limit: Optional[int] = None) -> Dict[str, Any]:
+    """Get restaurants filtered by cuisine type"""
+    return await _get_json_async("/api/v1/restaurants/by-cuisine",
+                                 f"Error querying restaurants by cuisine '{cuisine}' from dashdoor",
+                                 {"cuisine": cuisine, "count": 0, "restaurants": []},
+                                 params={"cuisine": cuisine, **_projection_params(fields, limit)},
+                                 cache_ttl=DASHDOOR_CACHE_TTLS["restaurants_by_cuisine"])
 
 
 def get_tags() -> List[str]:
     """Get list of unique restaurant tags"""
-    try:
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/tags')
-        response.raise_for_status()
-        data = response.json()
-        return data.get("tags", [])
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error("Error querying tags from dashdoor", "DASHDOOR_API_CALL", e)
-        return []
+    data = _get_json("/api/v1/tags", "Error querying tags from dashdoor", {}, cache_ttl=DASHDOOR_CACHE_TTLS["tags"])
+    return data.get("tags", [])
 
 
-def get_restaurants_by_tags(tags: List[str]) -> Dict[str, Any]:
+async def get_tags_async() -> List[str]:
+    """Get list of unique restaurant tags"""
+    data = await _get_json_async("/api/v1/tags", "Error querying tags from dashdoor", {}, cache_ttl=DASHDOOR_CACHE_TTLS["tags"])
+    return data.get("tags", [])
+
+
+def get_restaurants_by_tags(tags: List[str], fields: Optional[List[str]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
     """Get restaurants filtered by tags (accepts list of tags)"""
-    try:
-        tags_param = ",".join(tags)
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/restaurants/by-tags', params={"tags": tags_param})
-        response.raise_for_status()
-        return response.json()
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error(f"Error querying restaurants by tags '{tags}' from dashdoor", "DASHDOOR_API_CALL", e)
-        return {"tags": tags, "count": 0, "restaurants": []}
+    return _get_json("/api/v1/restaurants/by-tags",
+                     f"Error querying restaurants by tags '{tags}' from dashdoor",
+                     {"tags": tags, "count": 0, "restaurants": []},
+                     params={"tags": ",".join(tags), **_projection_params(fields, limit)},
+                     cache_ttl=DASHDOOR_CACHE_TTLS["restaurants_by_tags"])
+
+
+async def get_restaurants_by_tags_async(tags: List[str], fields: Optional[List[str]] = None,
+                                        limit: Optional[int] = None) -> Dict[str, Any]:
+    """Get restaurants filtered by tags (accepts list of tags)"""
+    return await _get_json_async("/api/v1/restaurants/by-tags",
+                                 f"Error querying restaurants by tags '{tags}' from dashdoor",
+                                 {"tags": tags, "count": 0, "restaurants": []},
+                                 params={"tags": ",".join(tags), **_projection_params(fields, limit)},
+                                 cache_ttl=DASHDOOR_CACHE_TTLS["restaurants_by_tags"])
 
 
-def get_menu_items(restaurant_id: Optional[str] = None) -> Dict[str, Any]:
+def get_menu_items(restaurant_id: Optional[str] = None, fields: Optional[List[str]] = None,
+                   limit: Optional[int] = None) -> Dict[str, Any]:
     """Get menu items, optionally filtered by restaurant_id"""
-    try:
-        params = {"restaurant_id": restaurant_id} if restaurant_id else {}
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/menu-items', params=params)
-        response.raise_for_status()
-        return response.json()
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error("Error querying menu items from dashdoor", "DASHDOOR_API_CALL", e)
-        return {"count": 0, "menu_items": []}
+    params = {"restaurant_id": restaurant_id} if restaurant_id else {}
+    return _get_json("/api/v1/menu-items", "Error querying menu items from dashdoor",
+                     {"count": 0, "menu_items": []}, params={**params, **_projection_params(fields, limit)},
+                     cache_ttl=DASHDOOR_CACHE_TTLS["menu_items"])
+
+
+async def get_menu_items_async(restaurant_id: Optional[str] = None, fields: Optional[List[str]] = None,
+                               limit: Optional[int] = None) -> Dict[str, Any]:
+    """Get menu items, optionally filtered by restaurant_id"""
+    params = {"restaurant_id": restaurant_id} if restaurant_id else {}
+    return await _get_json_async("/api/v1/menu-items", "Error querying menu items from dashdoor",
+                                 {"count": 0, "menu_items": []}, params={**params, **_projection_params(fields, limit)},
+                                 cache_ttl=DASHDOOR_CACHE_TTLS["menu_items"])
 
 
 def get_dietary_tags() -> List[str]:
     """Get list of unique dietary tags from all menu items"""
-    try:
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/dietary-tags')
-        response.raise_for_status()
-        data = response.json()
-        return data.get("dietary_tags", [])
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error("Error querying dietary tags from dashdoor", "DASHDOOR_API_CALL", e)
-        return []
+    data = _get_json("/api/v1/dietary-tags", "Error querying dietary tags from dashdoor", {}, cache_ttl=DASHDOOR_CACHE_TTLS["dietary_tags"])
+    return data.get("dietary_tags", [])
 
 
-def get_menu_items_by_dietary_tags(tags: List[str]) -> Dict[str, Any]:
+async def get_dietary_tags_async() -> List[str]:
+    """Get list of unique dietary tags from all menu items"""
+    data = await _get_json_async("/api/v1/dietary-tags", "Error querying dietary tags from dashdoor", {}, cache_ttl=DASHDOOR_CACHE_TTLS["dietary_tags"])
+    return data.get("dietary_tags", [])
+
+
+def get_menu_items_by_dietary_tags(tags: List[str], fields: Optional[List[str]] = None,
+                                   limit: Optional[int] = None) -> Dict[str, Any]:
     """Get menu items filtered by dietary tags (accepts list of tags)"""
-    try:
-        tags_param = ",".join(tags)
-        response = httpx.get(f'{DOORDASH_API_URL}/api/v1/menu-items/by-dietary-tags', params={"tags": tags_param})
-        response.raise_for_status()
-        return response.json()
-    except (requests.exceptions.RequestException, httpx.HTTPError) as e:
-        ServiceLogger.log_error(f"Error querying menu items by dietary tags '{tags}' from dashdoor", "DASHDOOR_API_CALL", e)
-        return {"dietary_tags": tags, "count": 0, "menu_items": []}
\ No newline at end of file
+    return _get_json("/api/v1/menu-items/by-dietary-tags",
+                     f"Error querying menu items by dietary tags '{tags}' from dashdoor",
+                     {"dietary_tags": tags, "count": 0, "menu_items": []},
+                     params={"tags": ",".join(tags), **_projection_params(fields, limit)},
+                     cache_ttl=DASHDOOR_CACHE_TTLS["menu_items_by_dietary_tags"])
+
+
+async def get_menu_items_by_dietary_tags_async(tags: List[str], fields: Optional[List[str]] = None,
+                                               limit: Optional[int] = None) -> Dict[str, Any]:
+    """Get menu items filtered by dietary tags (accepts list of tags)"""
+    return await _get_json_async("/api/v1/menu-items/by-dietary-tags",
+                                 f"Error querying menu items by dietary tags '{tags}' from dashdoor",
+                                 {"dietary_tags": tags, "count": 0, "menu_items": []},
+                                 params={"tags": ",".join(tags), **_projection_params(fields, limit)},
+                                 cache_ttl=DASHDOOR_CACHE_TTLS["menu_items_by_dietary_tags"])
+
+
+def search_dishes(fields: Optional[List[str]] = None, limit: Optional[int] = None, **filters: Any) -> Dict[str, Any]:
+    """Search dishes across the catalog with combined restaurant and dish filters (see `_search_params`)"""
+    return _get_json("/api/v1/search", f"Error searching dishes with filters {filters} from dashdoor",
+                     {"filters": filters, "count": 0, "dishes": []},
+                     params={**_search_params(**filters), **_projection_params(fields, limit)},
+                     cache_ttl=DASHDOOR_CACHE_TTLS["search_dishes"])
+
+
+async def search_dishes_async(fields: Optional[List[str]] = None, limit: Optional[int] = None, **filters: Any) -> Dict[str, Any]:
+    """Search dishes across the catalog with combined restaurant and dish filters (see `_search_params`)"""
+    return await _get_json_async("/api/v1/search", f"Error searching dishes with filters {filters} from dashdoor",
+                                 {"filters": filters, "count": 0, "dishes": []},
+                                 params={**_search_params(**filters), **_projection_params(fields, limit)},
+                                 cache_ttl=DASHDOOR_CACHE_TTLS["search_dishes"])
+
+
+def get_restaurants_batch(restaurant_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get several restaurants by ID in one request"""
+    return _post_json("/api/v1/restaurants:batch", {"ids": restaurant_ids},
+                      f"Error querying restaurant batch {restaurant_ids} from dashdoor",
+                      {"count": 0, "restaurants": [], "missing": restaurant_ids},
+                      params=_projection_params(fields))
+
+
+async def get_restaurants_batch_async(restaurant_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get several restaurants by ID in one request"""
+    return await _post_json_async("/api/v1/restaurants:batch", {"ids": restaurant_ids},
+                                  f"Error querying restaurant batch {restaurant_ids} from dashdoor",
+                                  {"count": 0, "restaurants": [], "missing": restaurant_ids},
+                                  params=_projection_params(fields))
+
+
+def get_menu_items_batch(restaurant_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get the menus of several restaurants in one request (flat list tagged with restaurant_id)"""
+    return _post_json("/api/v1/menu-items:batch", {"ids": restaurant_ids},
+                      f"Error querying menu item batch for {restaurant_ids} from dashdoor",
+                      {"restaurant_ids": restaurant_ids, "count": 0, "menu_items": [], "missing": restaurant_ids},
+                      params=_projection_params(fields))
+
+
+async def get_menu_items_batch_async(restaurant_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get the menus of several restaurants in one request (flat list tagged with restaurant_id)"""
+    return await _post_json_async("/api/v1/menu-items:batch", {"ids": restaurant_ids},
+                                  f"Error querying menu item batch for {restaurant_ids} from dashdoor",
+                                  {"restaurant_ids": restaurant_ids, "count": 0, "menu_items": [], "missing": restaurant_ids},
+                                  params=_projection_params(fields))
+
+
+def stream_restaurants_async(fields: Optional[List[str]] = None, limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the full restaurant list from DashDoor as individual records"""
+    return _stream_ndjson_async("/api/v1/restaurants", "Error streaming restaurant list from dashdoor",
+                                params=_projection_params(fields, limit))
+
+
+def stream_menu_items_async(restaurant_id: Optional[str] = None, fields: Optional[List[str]] = None,
+                            limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream menu items (optionally for one restaurant) from DashDoor as individual records"""
+    params = {"restaurant_id": restaurant_id} if restaurant_id else {}
+    return _stream_ndjson_async("/api/v1/menu-items", "Error streaming menu items from dashdoor",
+                                params={**params, **_projection_params(fields, limit)})
@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Set
+
+from utils.logger import ServiceLogger
+
+# Per-subscriber buffer; a slow client is re-synced from a snapshot instead of growing memory
+SUBSCRIBER_QUEUE_SIZE = 100
+# Queued in place of pending deltas when a subscriber falls behind
+RESYNC: Dict[str, Any] = {"_resync": True}
+
+
+class SessionEventHub:
+    """
+    In-process pub/sub hub for session state changes.
+
+    The AutoNom run loop publishes every state delta for a session, and each
+    subscriber (e.g. an SSE connection) gets its own bounded queue, so one
+    publish fans out to any number of clients without touching the database.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set["asyncio.Queue[Dict[str, Any]]"]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, session_id: str) -> "asyncio.Queue[Dict[str, Any]]":
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[session_id]
+
+    @asynccontextmanager
+    async def subscription(self, session_id: str) -> AsyncIterator["asyncio.Queue[Dict[str, Any]]"]:
+        """Subscribes for the duration of the block and always unsubscribes afterwards."""
+        queue = self.subscribe(session_id)
+        try:
+            yield queue
+        finally:
+            self.unsubscribe(session_id, queue)
+
+    def publish(self, session_id: str, state_delta: Dict[str, Any]) -> None:
+        """Fans a state delta out to every subscriber of the session."""
+        subscribers = self._subscribers.get(session_id)
+        if not subscribers or not state_delta:
+            return
+        self.published += 1
+        for queue in subscribers:
+            if queue.full():
+                # drop everything pending and ask the subscriber to re-sync from a fresh snapshot,
+                # which already contains this delta (ADK persists events before yielding them)
+                while not queue.empty():
+                    queue.get_nowait()
+                    self.dropped += 1
+                queue.put_nowait(RESYNC)
+                ServiceLogger.log_warning(f"Subscriber fell behind on session {session_id[:8]}..., forcing re-sync", "SESSION_EVENTS")
+                continue
+            queue.put_nowait(dict(state_delta))
+
+    def subscriber_count(self, session_id: str | None = None) -> int:
+        if session_id is not None:
+            return len(self._subscribers.get(session_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def user_channel(user_id: str) -> str:
+    """Hub key for changes to a user's session list (a session was created or its workflow_status changed)."""
+    return f"user:{user_id}"
+
+
+# Process-wide hub shared by the AutoNom run loop and the SSE endpoints
+session_event_hub = SessionEventHub()
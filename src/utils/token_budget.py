@@ -0,0 +1,39 @@
+import json
+from typing import Any, Dict
+
+from utils.logger import ServiceLogger
+
+# Rough chars-per-token ratio for JSON payloads; only needs to be conservative, not exact
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(value: Any) -> int:
+    """Cheap token estimate of a tool result from its compact JSON length."""
+    return len(json.dumps(value, separators=(",", ":"), default=str)) // CHARS_PER_TOKEN + 1
+
+
+def fit_to_token_budget(result: Dict[str, Any], list_key: str, max_tokens: int) -> Dict[str, Any]:
+    """
+    Trims `result[list_key]` from the end until the whole result fits in `max_tokens`.
+
+    Returns the result unchanged when it already fits; otherwise a shallow copy with the
+    shortened list plus `truncated: True` and `omitted: <n>` so the model knows to narrow
+    its query instead of assuming it saw everything.
+    """
+    items = result.get(list_key)
+    if not isinstance(items, list) or estimate_tokens(result) <= max_tokens:
+        return result
+
+    overhead = estimate_tokens({**result, list_key: [], "truncated": True, "omitted": len(items)})
+    budget = max_tokens - overhead
+    kept = 0
+    for item in items:
+        cost = estimate_tokens(item)
+        if cost > budget:
+            break
+        budget -= cost
+        kept += 1
+
+    ServiceLogger.log_warning(
+        f"Trimmed '{list_key}' from {len(items)} to {kept} records to fit {max_tokens} token budget", "TOOL_OUTPUT")
+    return {**result, list_key: items[:kept], "truncated": True, "omitted": len(items) - kept}
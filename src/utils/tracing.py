@@ -0,0 +1,219 @@
+"""
+OpenTelemetry tracing for AutoNom workflows.
+
+Every `AutoNom.run` opens an `autonom.run` root span; ADK adds its own child spans
+(`invocation`, `invoke_agent <agent>`, `call_llm` with token counts, `execute_tool <tool>`)
+and our code adds DashDoor HTTP and DB spans. Finished spans are kept in memory per
+session (bounded) for GET /api/sessions/{session_id}/trace, and optionally appended as
+JSON lines to AUTONOM_TRACE_FILE.
+
+Large payload attributes (LLM requests/responses, tool arguments/responses) are
+replaced by their size in bytes, so traces stay small.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from utils.logger import ServiceLogger
+
+TRACING_ENABLED = os.environ.get("AUTONOM_TRACING_ENABLED", "true").lower() == "true"
+# Optional JSON-lines file receiving every finished span
+TRACE_FILE = os.environ.get("AUTONOM_TRACE_FILE")
+# Sessions whose traces are kept in memory (least recently traced are dropped first)
+TRACE_MAX_SESSIONS = int(os.environ.get("AUTONOM_TRACE_MAX_SESSIONS", "200"))
+# Spans kept per session; later spans are counted but not stored
+TRACE_MAX_SPANS_PER_SESSION = int(os.environ.get("AUTONOM_TRACE_MAX_SPANS_PER_SESSION", "5000"))
+# String attributes longer than this are stored as "<name>.bytes" instead of their value
+TRACE_MAX_ATTRIBUTE_CHARS = 256
+
+SESSION_ID_ATTRIBUTE = "autonom.session_id"
+
+tracer = trace.get_tracer("autonom")
+
+_provider: Optional[TracerProvider] = None
+
+
+def _compact_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    compact: Dict[str, Any] = {}
+    for key, value in attributes.items():
+        if isinstance(value, str) and len(value) > TRACE_MAX_ATTRIBUTE_CHARS:
+            compact[f"{key}.bytes"] = len(value.encode("utf-8"))
+        elif isinstance(value, tuple):
+            compact[key] = list(value)
+        else:
+            compact[key] = value
+    return compact
+
+
+def compact_span(span: ReadableSpan) -> Dict[str, Any]:
+    """A finished span as a small JSON-friendly dict."""
+    context = span.get_span_context()
+    return {
+        "trace_id": format(context.trace_id, "032x"),
+        "span_id": format(context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "name": span.name,
+        "start_time_ns": span.start_time,
+        "duration_ms": round((span.end_time - span.start_time) / 1e6, 3) if span.end_time else None,
+        "status": span.status.status_code.name,
+        "attributes": _compact_attributes(dict(span.attributes or {})),
+    }
+
+
+class SessionSpanStore(SpanProcessor):
+    """
+    Groups finished spans by AutoNom session. A root span carrying `autonom.session_id`
+    binds its trace to the session when it starts, so every descendant span (ADK agent,
+    LLM and tool spans, HTTP and DB spans) lands in that session's trace.
+    """
+
+    def __init__(self, max_sessions: int = TRACE_MAX_SESSIONS, max_spans: int = TRACE_MAX_SPANS_PER_SESSION):
+        self.max_sessions = max_sessions
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._session_by_trace: Dict[int, str] = {}
+        # session_id -> {"spans": [...], "dropped_spans": n}
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def on_start(self, span: Span, parent_context=None) -> None:
+        if span.parent is None and span.attributes and SESSION_ID_ATTRIBUTE in span.attributes:
+            with self._lock:
+                self._session_by_trace[span.get_span_context().trace_id] = str(span.attributes[SESSION_ID_ATTRIBUTE])
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.get_span_context().trace_id
+        with self._lock:
+            session_id = self._session_by_trace.get(trace_id)
+            if session_id is not None and span.parent is None:
+                del self._session_by_trace[trace_id]
+        if session_id is None:
+            return
+        compact = compact_span(span)
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = self._sessions[session_id] = {"spans": [], "dropped_spans": 0}
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            if len(entry["spans"]) >= self.max_spans:
+                entry["dropped_spans"] += 1
+            else:
+                entry["spans"].append(compact)
+
+    def get_session_spans(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            return {"spans": list(entry["spans"]), "dropped_spans": entry["dropped_spans"]}
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends compact spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(compact_span(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            return SpanExportResult.SUCCESS
+        except OSError as e:
+            ServiceLogger.log_error(f"Failed to write {len(spans)} spans to {self.path}", "TRACING", error=e)
+            return SpanExportResult.FAILURE
+
+
+span_store = SessionSpanStore()
+
+
+def setup_tracing() -> None:
+    """Installs the SDK tracer provider. Call once at startup, before any run starts."""
+    global _provider
+    if not TRACING_ENABLED or _provider is not None:
+        return
+    _provider = TracerProvider(resource=Resource.create({"service.name": "autonom"}))
+    _provider.add_span_processor(span_store)
+    if TRACE_FILE:
+        _provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(TRACE_FILE)))
+    trace.set_tracer_provider(_provider)
+    ServiceLogger.log_info("Tracing enabled", "TRACING", trace_file=TRACE_FILE or "None")
+
+
+def shutdown_tracing() -> None:
+    """Flushes pending file exports. Call on application shutdown."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def _agent_of(span: Dict[str, Any], spans_by_id: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Nearest `invoke_agent` ancestor's agent name (the span itself included)."""
+    current: Optional[Dict[str, Any]] = span
+    while current is not None:
+        agent = current["attributes"].get("gen_ai.agent.name")
+        if agent:
+            return agent
+        current = spans_by_id.get(current["parent_id"]) if current["parent_id"] else None
+    return None
+
+
+def get_session_trace(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Spans recorded for a session, grouped by run (trace) in start order, each tagged with
+    its agent, plus a per-agent breakdown of LLM calls, tokens, tool calls and time.
+    """
+    recorded = span_store.get_session_spans(session_id)
+    if recorded is None:
+        return None
+    spans = sorted(recorded["spans"], key=lambda s: s["start_time_ns"])
+    spans_by_id = {s["span_id"]: s for s in spans}
+
+    traces: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    by_agent: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        span = {**span, "agent": _agent_of(span, spans_by_id)}
+        traces.setdefault(span["trace_id"], []).append(span)
+
+        agent = span["agent"] or "(none)"
+        summary = by_agent.setdefault(agent, {"llm_calls": 0, "llm_ms": 0.0, "input_tokens": 0, "output_tokens": 0,
+                                              "tool_calls": 0, "tool_ms": 0.0, "http_calls": 0, "db_calls": 0})
+        attributes = span["attributes"]
+        duration = span["duration_ms"] or 0.0
+        if span["name"] == "call_llm":
+            summary["llm_calls"] += 1
+            summary["llm_ms"] = round(summary["llm_ms"] + duration, 3)
+            summary["input_tokens"] += attributes.get("gen_ai.usage.input_tokens") or 0
+            summary["output_tokens"] += attributes.get("gen_ai.usage.output_tokens") or 0
+        elif span["name"].startswith("execute_tool"):
+            summary["tool_calls"] += 1
+            summary["tool_ms"] = round(summary["tool_ms"] + duration, 3)
+        elif span["name"].startswith("dashdoor "):
+            summary["http_calls"] += 1
+        elif span["name"].startswith("db "):
+            summary["db_calls"] += 1
+
+    return {
+        "session_id": session_id,
+        "traces": [{"trace_id": trace_id, "spans": trace_spans} for trace_id, trace_spans in traces.items()],
+        "by_agent": by_agent,
+        "span_count": len(spans),
+        "dropped_spans": recorded["dropped_spans"],
+    }
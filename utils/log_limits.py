@@ -0,0 +1,111 @@
+"""
+Per-call-site sampling, truncation and rate limiting for ServiceLogger.
+
+High-frequency log sites pass `site="<name>"`; each named site gets a policy:
+
+    sample_rate  fraction of records kept (1.0 = all)
+    rate         sustained records per second (token bucket; None = unlimited)
+    burst        bucket capacity, i.e. records allowed in a burst
+    max_chars    longest rendered payload value before it is truncated (None = no limit)
+
+Defaults live in DEFAULT_SITE_POLICIES and can be overridden per site with the
+LOG_SITE_POLICIES environment variable, a JSON object such as
+    {"auto_nom.tool_response": {"sample_rate": 0.25, "max_chars": 500}}
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_SITE_POLICIES: Dict[str, Dict[str, Any]] = {
+    # one panel per tool call an agent makes
+    "auto_nom.tool_call": {"rate": 10, "burst": 20, "max_chars": 1000},
+    # tool responses can be entire restaurant menus
+    "auto_nom.tool_response": {"rate": 5, "burst": 10, "max_chars": 2000},
+    # full user profiles logged when a workflow starts or resumes
+    "server.user_profile": {"rate": 2, "burst": 5, "max_chars": 200},
+}
+
+
+class SitePolicy():
+    __slots__ = ("sample_rate", "rate", "burst", "max_chars")
+
+    def __init__(self, sample_rate: float = 1.0, rate: Optional[float] = None, burst: Optional[float] = None,
+                 max_chars: Optional[int] = None):
+        self.sample_rate = sample_rate
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.max_chars = max_chars
+
+
+class SiteLimiter():
+    """Sampling + token bucket for one log site, with counters of what it let through."""
+
+    def __init__(self, policy: SitePolicy):
+        self.policy = policy
+        self._tokens = policy.burst or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self.truncated = 0
+        # records dropped since the last one that got through, reported on that next record
+        self.suppressed_since_last = 0
+
+    def allow(self) -> bool:
+        policy = self.policy
+        if policy.sample_rate < 1.0 and random.random() >= policy.sample_rate:
+            with self._lock:
+                self.sampled_out += 1
+                self.suppressed_since_last += 1
+            return False
+        with self._lock:
+            if policy.rate is not None:
+                now = time.monotonic()
+                self._tokens = min(policy.burst, self._tokens + (now - self._updated) * policy.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    self.rate_limited += 1
+                    self.suppressed_since_last += 1
+                    return False
+                self._tokens -= 1
+            self.emitted += 1
+            return True
+
+    def take_suppressed(self) -> int:
+        with self._lock:
+            suppressed, self.suppressed_since_last = self.suppressed_since_last, 0
+            return suppressed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "emitted": self.emitted,
+            "sampled_out": self.sampled_out,
+            "rate_limited": self.rate_limited,
+            "truncated": self.truncated,
+            "sample_rate": self.policy.sample_rate,
+            "rate": self.policy.rate,
+            "burst": self.policy.burst,
+            "max_chars": self.policy.max_chars,
+        }
+
+
+def load_site_policies() -> Dict[str, SitePolicy]:
+    """DEFAULT_SITE_POLICIES merged with the LOG_SITE_POLICIES environment override."""
+    policies = {site: dict(policy) for site, policy in DEFAULT_SITE_POLICIES.items()}
+    raw = os.environ.get("LOG_SITE_POLICIES")
+    if raw:
+        for site, overrides in json.loads(raw).items():
+            policies.setdefault(site, {}).update(overrides)
+    return {site: SitePolicy(**policy) for site, policy in policies.items()}
+
+
+def truncate(text: str, max_chars: Optional[int]) -> tuple[str, bool]:
+    """Cuts `text` to `max_chars`, noting how much was dropped; returns (text, was_truncated)."""
+    if max_chars is None or len(text) <= max_chars:
+        return text, False
+    return f"{text[:max_chars]}… [+{len(text) - max_chars} chars]", True
@@ -1,183 +1,390 @@
 """
 Shared utilities package for all services.
 Provides attractive console output for various operations.
+
+Log calls only check the level and enqueue a small record; a background writer
+thread does all formatting and terminal / stdout I/O, so request handlers never
+block on Rich rendering. Configure with:
+
+    LOG_LEVEL   DEBUG | INFO | SUCCESS | WARNING | ERROR   (default DEBUG)
+    LOG_FORMAT  rich (pretty console, development) | json (one object per line, production)
+    LOG_QUEUE_SIZE  max pending records; records are dropped (and counted) when full
+
+High-frequency call sites pass `site=` to get sampling, truncation and rate
+limiting (see utils/log_limits.py).
 """
 
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
 from rich.console import Console
+from rich.errors import MarkupError
+from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 from rich import box
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+from utils.log_limits import SiteLimiter, SitePolicy, load_site_policies, truncate
+
+LEVELS: Dict[str, int] = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "DEBUG").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "rich").lower()
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
 # Initialize Rich Console
 console = Console()
 
+# (color, icon) for the one-line message records
+_MESSAGE_STYLES: Dict[str, tuple[str, str]] = {
+    "DEBUG": ("dim", "🔍"),
+    "INFO": ("blue", "ℹ️"),
+    "SUCCESS": ("green", "✅"),
+    "WARNING": ("yellow", "⚠️"),
+    "ERROR": ("red", "❌"),
+}
+
+
+class LogRecord():
+    """A log call captured as data; formatted later by the writer thread."""
+    __slots__ = ("kind", "level", "created", "data", "limiter")
+
+    def __init__(self, kind: str, level: str, data: Dict[str, Any], limiter: Optional[SiteLimiter] = None):
+        self.kind = kind
+        self.level = level
+        self.created = time.time()
+        self.data = data
+        self.limiter = limiter
+
+    def apply_truncation(self) -> None:
+        """Truncates payload values to the site's max_chars (runs on the writer thread)."""
+        max_chars = self.limiter.policy.max_chars if self.limiter else None
+        if max_chars is None:
+            return
+        truncated = False
+        content = self.data.get("content")
+        if isinstance(content, str):
+            self.data["content"], truncated = truncate(content, max_chars)
+        for key in ("fields", "params"):
+            if not self.data.get(key):
+                continue
+            # copy: `params` may be a dict the caller still holds
+            values = self.data[key] = dict(self.data[key])
+            for name, value in values.items():
+                text, was_truncated = truncate(value if isinstance(value, str) else str(value), max_chars)
+                if was_truncated:
+                    values[name] = text
+                    truncated = True
+        if truncated:
+            self.limiter.truncated += 1
+
+
+class RichSink():
+    """Pretty console output for development."""
+
+    def __init__(self, target: Console):
+        self.console = target
+
+    def write(self, record: LogRecord) -> None:
+        getattr(self, f"_write_{record.kind}")(record)
+        if record.data.get("suppressed"):
+            self.console.print(f"[dim]  └─ ({record.data['suppressed']} earlier records from this site suppressed)[/dim]")
+
+    def _write_message(self, record: LogRecord) -> None:
+        data = record.data
+        color, icon = _MESSAGE_STYLES[record.level]
+        context = f"[{data['context']}] " if data.get("context") else ""
+        self.console.print(f"[{color}]{icon} {context}{data['message']}[/{color}]")
+        if data.get("error") is not None:
+            self.console.print(f"[{color}]  └─ Error Details: {data['error']}[/{color}]")
+        for key, value in data["fields"].items():
+            self.console.print(f"[{color}]  └─ {key}: {value}[/{color}]")
+
+    def _write_panel(self, record: LogRecord) -> None:
+        data = record.data
+        content = data["content"]
+        if data["fields"]:
+            content += "\n" + "\n".join([f"[cyan]{key}:[/cyan] {value}" for key, value in data["fields"].items()])
+        self.console.print(Panel(
+            Markdown(content) if data["markdown"] else content,
+            title=data["title"],
+            border_style=data["style"]
+        ))
+
+    def _write_table(self, record: LogRecord) -> None:
+        data = record.data
+        table = Table(title=data["title"], box=getattr(box, data["style"].upper(), box.MINIMAL))
+        for header in data["headers"]:
+            table.add_column(header, style="cyan")
+        for row in data["rows"]:
+            table.add_row(*[str(cell) for cell in row])
+        self.console.print(table)
+
+    def _write_api_request(self, record: LogRecord) -> None:
+        data = record.data
+        self.console.print(f"🌐 [bold cyan]{data['method']}[/bold cyan] {data['endpoint']}")
+        if data["params"]:
+            self.console.print("[cyan]Parameters:[/cyan]")
+        for key, value in {**(data["params"] or {}), **data["fields"]}.items():
+            self.console.print(f"[cyan]  └─ {key}: {value}[/cyan]")
+
+    def _write_api_response(self, record: LogRecord) -> None:
+        data = record.data
+        status_code = data["status_code"]
+        if status_code >= 200 and status_code < 300:
+            color, icon = "green", "✅"
+        elif status_code >= 400:
+            color, icon = "red", "❌"
+        else:
+            color, icon = "yellow", "⚠️"
+        response_info = f"[{color}]{icon} Response: {status_code}[/{color}]"
+        if data["message"]:
+            response_info += f" - {data['message']}"
+        if data["duration"]:
+            response_info += f" [dim]({data['duration']:.2f}ms)[/dim]"
+        self.console.print(response_info)
+        for key, value in data["fields"].items():
+            self.console.print(f"[{color}]  └─ {key}: {value}[/{color}]")
+
+    def _write_api_call(self, record: LogRecord) -> None:
+        data = record.data
+        content_lines = [f"[bold cyan]API Call: {data['method'].upper()} {data['endpoint']}[/bold cyan]"]
+        content_lines.append(f"[yellow]Timestamp:[/yellow] {datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')}")
+        if data["user_id"]:
+            content_lines.append(f"[yellow]User ID:[/yellow] {data['user_id']}")
+        if data["request_id"]:
+            content_lines.append(f"[yellow]Request ID:[/yellow] {data['request_id']}")
+        if data["params"]:
+            content_lines.append("[yellow]Parameters:[/yellow]")
+            for key, value in data["params"].items():
+                display_value = str(value)
+                if len(display_value) > 100:
+                    display_value = display_value[:97] + "..."
+                content_lines.append(f"  [cyan]└─ {key}:[/cyan] {display_value}")
+        self.console.print(Panel(
+            "\n".join(content_lines),
+            title="🌐 API Call",
+            border_style="blue"
+        ))
+
+
+def _plain(markup: str) -> str:
+    """Strips the Rich markup that panels carry for the console."""
+    try:
+        return Text.from_markup(markup).plain
+    except MarkupError:
+        return markup
+
+
+class JsonSink():
+    """One JSON object per line on stdout, for log collectors in production."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write(self, record: LogRecord) -> None:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.level,
+            "type": record.kind,
+        }
+        for key, value in record.data.items():
+            if key == "fields":
+                continue
+            if key in ("title", "content") and isinstance(value, str) and not record.data.get("markdown"):
+                value = _plain(value)
+            if value is not None and value != {}:
+                entry[key] = value
+        for key, value in (record.data.get("fields") or {}).items():
+            entry.setdefault(key, value)
+        self.stream.write(json.dumps(entry, default=str) + "\n")
+        self.stream.flush()
+
+
+class LogBackend():
+    """Bounded queue drained by a daemon writer thread; started on first use."""
+
+    def __init__(self, sink, max_queue_size: int):
+        self.sink = sink
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def enqueue(self, record: LogRecord) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if isinstance(item, threading.Event):
+                    item.set()
+                else:
+                    item.apply_truncation()
+                    self.sink.write(item)
+            except Exception as e:
+                # never let a bad record kill the writer
+                sys.stderr.write(f"log writer failed to write a {getattr(item, 'kind', '?')} record: {e}\n")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Blocks until every record enqueued so far is written (or the timeout expires)."""
+        if self._thread is None:
+            return True
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+
+_backend = LogBackend(JsonSink() if LOG_FORMAT == "json" else RichSink(console), LOG_QUEUE_SIZE)
+_min_level = LEVELS.get(LOG_LEVEL, LEVELS["DEBUG"])
+# drain pending records so the last messages before exit are not lost
+atexit.register(_backend.flush)
+
+
+_site_policies = load_site_policies()
+_site_limiters: Dict[str, SiteLimiter] = {}
+_site_lock = threading.Lock()
+
+
+def _enabled(level: str) -> bool:
+    return LEVELS[level] >= _min_level
+
+
+def _site_limiter(site: str) -> SiteLimiter:
+    limiter = _site_limiters.get(site)
+    if limiter is None:
+        with _site_lock:
+            limiter = _site_limiters.setdefault(site, SiteLimiter(_site_policies.get(site) or SitePolicy()))
+    return limiter
+
+
+def _emit(kind: str, level: str, site: Optional[str] = None, **data: Any) -> None:
+    limiter = None
+    if site is not None:
+        limiter = _site_limiter(site)
+        if not limiter.allow():
+            return
+        data["site"] = site
+        suppressed = limiter.take_suppressed()
+        if suppressed:
+            data["suppressed"] = suppressed
+    _backend.enqueue(LogRecord(kind, level, data, limiter))
+
+
 class ServiceLogger:
     """Logger class with rich formatting for service operations."""
-    
+
+    # --- BACKEND CONTROL ---
+
+    @staticmethod
+    def is_enabled(level: str) -> bool:
+        """True when records at `level` are written; use to skip building expensive log payloads."""
+        return _enabled(level.upper())
+
+    @staticmethod
+    def flush(timeout: float = 5.0) -> bool:
+        """Waits until all pending log records have been written."""
+        return _backend.flush(timeout)
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """Logging backend counters."""
+        return {"level": LOG_LEVEL, "format": LOG_FORMAT, "pending": _backend._queue.qsize(),
+                "dropped": _backend.dropped,
+                "sites": {site: limiter.stats() for site, limiter in list(_site_limiters.items())}}
+
     # --- GENERIC LOGGING METHODS ---
-    
+
     @staticmethod
-    def log_debug(message: str, context: str | None = None, **kwargs: Any):
+    def log_debug(message: str, context: str | None = None, site: str | None = None, **kwargs: Any):
         """Log debug information."""
-        if context:
-            console.print(f"[dim]🔍 [{context}] {message}[/dim]")
-        else:
-            console.print(f"[dim]🔍 {message}[/dim]")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[dim]  └─ {key}: {value}[/dim]")
-    
-    @staticmethod
-    def log_info(message: str, context: str | None = None, **kwargs: Any):
+        if _enabled("DEBUG"):
+            _emit("message", "DEBUG", site, message=message, context=context, fields=kwargs)
+
+    @staticmethod
+    def log_info(message: str, context: str | None = None, site: str | None = None, **kwargs: Any):
         """Log general information."""
-        if context:
-            console.print(f"[blue]ℹ️ [{context}] {message}[/blue]")
-        else:
-            console.print(f"[blue]ℹ️ {message}[/blue]")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[blue]  └─ {key}: {value}[/blue]")
-    
-    @staticmethod
-    def log_success(message: str, context: str | None = None, **kwargs: Any):
+        if _enabled("INFO"):
+            _emit("message", "INFO", site, message=message, context=context, fields=kwargs)
+
+    @staticmethod
+    def log_success(message: str, context: str | None = None, site: str | None = None, **kwargs: Any):
         """Log success messages."""
-        if context:
-            console.print(f"[green]✅ [{context}] {message}[/green]")
-        else:
-            console.print(f"[green]✅ {message}[/green]")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[green]  └─ {key}: {value}[/green]")
-    
-    @staticmethod
-    def log_warning(message: str, context: str | None = None, **kwargs: Any):
+        if _enabled("SUCCESS"):
+            _emit("message", "SUCCESS", site, message=message, context=context, fields=kwargs)
+
+    @staticmethod
+    def log_warning(message: str, context: str | None = None, site: str | None = None, **kwargs: Any):
         """Log warning messages."""
-        if context:
-            console.print(f"[yellow]⚠️ [{context}] {message}[/yellow]")
-        else:
-            console.print(f"[yellow]⚠️ {message}[/yellow]")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[yellow]  └─ {key}: {value}[/yellow]")
-    
-    @staticmethod
-    def log_error(message: str, context: str | None = None, error: Exception | None = None, **kwargs: Any):
+        if _enabled("WARNING"):
+            _emit("message", "WARNING", site, message=message, context=context, fields=kwargs)
+
+    @staticmethod
+    def log_error(message: str, context: str | None = None, error: Exception | None = None, site: str | None = None,
+                  **kwargs: Any):
         """Log error messages."""
-        if context:
-            console.print(f"[red]❌ [{context}] {message}[/red]")
-        else:
-            console.print(f"[red]❌ {message}[/red]")
-        
-        if error:
-            console.print(f"[red]  └─ Error Details: {str(error)}[/red]")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[red]  └─ {key}: {value}[/red]")
-    
-    @staticmethod
-    def log_panel(title: str, content: str, style: str = "blue", **kwargs: Any):
-        """Log a message in a panel format."""
-        panel_content = content
-        if kwargs:
-            panel_content += "\n" + "\n".join([f"[cyan]{key}:[/cyan] {value}" for key, value in kwargs.items()])
-        
-        console.print(Panel(
-            panel_content,
-            title=title,
-            border_style=style
-        ))
-    
+        if _enabled("ERROR"):
+            _emit("message", "ERROR", site, message=message, context=context,
+                  error=str(error) if error else None, fields=kwargs)
+
+    @staticmethod
+    def log_panel(title: str, content: str, style: str = "blue", level: str = "INFO", markdown: bool = False,
+                  site: str | None = None, **kwargs: Any):
+        """Log a message in a panel format (`markdown` renders the content as Markdown)."""
+        if _enabled(level):
+            _emit("panel", level, site, title=title, content=content, style=style, markdown=markdown, fields=kwargs)
+
     @staticmethod
     def log_table(title: str, headers: List[str], rows: List[List[str]], style: str = "minimal"):
         """Log data in a table format."""
-        table = Table(title=title, box=getattr(box, style.upper(), box.MINIMAL))
-        
-        for header in headers:
-            table.add_column(header, style="cyan")
-        
-        for row in rows:
-            table.add_row(*[str(cell) for cell in row])
-        
-        console.print(table)
-    
+        if _enabled("INFO"):
+            _emit("table", "INFO", title=title, headers=headers, rows=rows, style=style)
+
     @staticmethod
     def log_api_request(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any):
         """Log API request information."""
-        request_info = f"[bold cyan]{method}[/bold cyan] {endpoint}"
-        
-        console.print(f"🌐 {request_info}")
-        
-        if params:
-            console.print("[cyan]Parameters:[/cyan]")
-            for key, value in params.items():
-                console.print(f"[cyan]  └─ {key}: {value}[/cyan]")
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[cyan]  └─ {key}: {value}[/cyan]")
-    
+        if _enabled("INFO"):
+            _emit("api_request", "INFO", method=method, endpoint=endpoint, params=params, fields=kwargs)
+
     @staticmethod
     def log_api_response(status_code: int, message: str | None = None, duration: float | None = None, **kwargs: Any):
         """Log API response information."""
-        if status_code >= 200 and status_code < 300:
-            color = "green"
-            icon = "✅"
-        elif status_code >= 400:
-            color = "red"
-            icon = "❌"
-        else:
-            color = "yellow"
-            icon = "⚠️"
-        
-        response_info = f"[{color}]{icon} Response: {status_code}[/{color}]"
-        if message:
-            response_info += f" - {message}"
-        if duration:
-            response_info += f" [dim]({duration:.2f}ms)[/dim]"
-        
-        console.print(response_info)
-        
-        if kwargs:
-            for key, value in kwargs.items():
-                console.print(f"[{color}]  └─ {key}: {value}[/{color}]")
-    
-    @staticmethod
-    def api_called_panel(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, 
-                        user_id: Optional[str] = None, request_id: Optional[str] = None):
+        level = "ERROR" if status_code >= 400 else "INFO"
+        if _enabled(level):
+            _emit("api_response", level, status_code=status_code, message=message, duration=duration, fields=kwargs)
+
+    @staticmethod
+    def api_called_panel(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                        user_id: Optional[str] = None, request_id: Optional[str] = None, site: Optional[str] = None):
         """Display a generic API call panel for logging method and parameters."""
-        content_lines = [f"[bold cyan]API Call: {method.upper()} {endpoint}[/bold cyan]"]
-        
-        content_lines.append(f"[yellow]Timestamp:[/yellow] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        if user_id:
-            content_lines.append(f"[yellow]User ID:[/yellow] {user_id}")
-        
-        if request_id:
-            content_lines.append(f"[yellow]Request ID:[/yellow] {request_id}")
-        
-        if params:
-            content_lines.append("[yellow]Parameters:[/yellow]")
-            for key, value in params.items():
-                display_value = str(value)
-                if len(display_value) > 100:
-                    display_value = display_value[:97] + "..."
-                content_lines.append(f"  [cyan]└─ {key}:[/cyan] {display_value}")
-        
-        content = "\n".join(content_lines)
-        
-        console.print(Panel(
-            content,
-            title="🌐 API Call",
-            border_style="blue"
-        ))
-    
+        if _enabled("INFO"):
+            _emit("api_call", "INFO", site, method=method, endpoint=endpoint, params=params,
+                  user_id=user_id, request_id=request_id)
+
     @staticmethod
     def startup_message(service_name: str, port: int = 8000, docs_path: str = "/docs"):
         """Display service startup message."""
@@ -189,7 +396,7 @@ class ServiceLogger:
         ServiceLogger.log_success("Service initialized successfully")
         ServiceLogger.log_info("Server ready to accept requests", "🚀")
         ServiceLogger.log_info(f"API Documentation: http://localhost:{port}{docs_path}", "📍")
-    
+
     @staticmethod
     def shutdown_message(service_name: str):
         """Display service shutdown message."""
@@ -199,7 +406,8 @@ class ServiceLogger:
             "red"
         )
         ServiceLogger.log_warning("Cleanup completed", "🔄")
-    
+        ServiceLogger.flush()
+
     @staticmethod
     def health_check():
         """Log health check access."""
@@ -209,7 +417,7 @@ class ServiceLogger:
 # Convenience functions for quick access to common logging patterns
 class Logger:
     """Convenience wrapper for common logging operations."""
-    
+
     # Direct access to ServiceLogger methods
     debug = ServiceLogger.log_debug
     info = ServiceLogger.log_info
@@ -220,12 +428,12 @@ class Logger:
     table = ServiceLogger.log_table
     api_request = ServiceLogger.log_api_request
     api_response = ServiceLogger.log_api_response
-    
+
     @staticmethod
     def function_entry(func_name: str, **kwargs: Any):
         """Log function entry with parameters."""
         ServiceLogger.log_debug(f"Entering function: {func_name}", "FUNC", **kwargs)
-    
+
     @staticmethod
     def function_exit(func_name: str, result: Any = None, duration: float | None = None):
         """Log function exit with result and duration."""
@@ -234,9 +442,9 @@ class Logger:
             extras["result"] = str(result)[:100]  # Truncate long results
         if duration is not None:
             extras["duration_ms"] = f"{duration:.2f}"
-        
+
         ServiceLogger.log_debug(f"Exiting function: {func_name}", "FUNC", **extras)
-    
+
     @staticmethod
     def performance(operation: str, duration: float, **kwargs: Any):
         """Log performance metrics."""
@@ -0,0 +1,265 @@
+"""
+Minimal in-process metrics: counters, gauges and histograms rendered in the
+Prometheus text exposition format, plus `timed` for decorating or wrapping hot paths.
+
+Each service process has one REGISTRY; expose it with `render_prometheus()` on a
+`/metrics` endpoint. Updates take a per-metric lock and never do I/O.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.logger import Logger
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Operations slower than this are also reported through Logger.performance
+METRICS_SLOW_MS = float(os.environ.get("METRICS_SLOW_MS", "500"))
+
+# Seconds; covers sub-millisecond index lookups up to multi-second LLM turns
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                                      1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric():
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. requests or errors."""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Point-in-time value; either set explicitly or read from `callback` at scrape time."""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> Iterable[str]:
+        if self.callback is not None:
+            yield f"{self.name} {_format_value(self.callback())}"
+            return
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Latency / size distribution with cumulative buckets, a sum and a count per label set."""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2])) for key, series in self._series.items())
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class Registry():
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = (),
+          callback: Optional[Callable[[], float]] = None) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames, callback))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render_prometheus() -> str:
+    """All registered metrics in the Prometheus text format."""
+    return REGISTRY.render()
+
+
+class timed():
+    """
+    Records the duration of a block or function into `histogram` (in seconds).
+
+    Works as a context manager (`with timed(H, route="/x"):`) or as a decorator on sync
+    and async functions. With `name_label`, that label is filled with the decorated
+    function's name. Failures also increment `errors` (same labels) when given, and
+    slow operations are reported through Logger.performance.
+    """
+
+    def __init__(self, histogram: Histogram, errors: Optional[Counter] = None, name_label: Optional[str] = None,
+                 **labels: Any):
+        self.histogram = histogram
+        self.errors = errors
+        self.name_label = name_label
+        self.labels = labels
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _record(self.histogram, self.errors, self.labels, time.perf_counter() - self._start, exc_type is not None)
+
+    def __call__(self, func: Callable) -> Callable:
+        labels = dict(self.labels)
+        if self.name_label:
+            labels[self.name_label] = func.__name__
+        histogram, errors = self.histogram, self.errors
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    _record(histogram, errors, labels, time.perf_counter() - start, failed)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _record(histogram, errors, labels, time.perf_counter() - start, failed)
+        return wrapper
+
+
+def _record(histogram: Histogram, errors: Optional[Counter], labels: Dict[str, Any], seconds: float,
+            failed: bool) -> None:
+    histogram.observe(seconds, **labels)
+    if failed and errors is not None:
+        errors.inc(**labels)
+    if seconds * 1000 >= METRICS_SLOW_MS:
+        operation = histogram.name + "".join(f" {key}={value}" for key, value in labels.items())
+        Logger.performance(operation, seconds * 1000)